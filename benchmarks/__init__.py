@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""
+PySWMM benchmarks.
+
+bench_network holds the airspeed velocity (asv) suite, run on synthetic
+networks of 10^2 to 10^5 elements (see network.py). asv.conf.json at the
+repository root keeps one result file per commit and machine under
+benchmarks/results, so runs of successive releases can be compared:
+
+    asv machine --yes
+    asv run v1.0.0..master --steps 10    # fill the history
+    asv continuous master HEAD           # a branch against master
+    asv compare v1.0.0 master
+    asv publish && asv preview           # plots of the history
+
+The bench_*.py scripts with a main() are standalone before/after
+comparisons of single changes.
+"""
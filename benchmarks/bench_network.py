@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""
+asv benchmarks of PySWMM on synthetic networks of 10^2 to 10^5 elements.
+
+Every size has as many junctions, conduits and subcatchments (see
+network.py). Per-element benchmarks loop over all elements, so their time
+divided by the size is the cost of one call, and a lookup that turns
+linear in the network size shows up as quadratic growth.
+
+Smoke run without asv: python -m benchmarks.bench_network [max_size]
+"""
+
+# Standard library imports
+from timeit import default_timer as timer
+import importlib
+import os
+import sys
+
+# Local imports
+from pyswmm import Links, Nodes, Simulation, Subcatchments
+from pyswmm.toolkitapi import (NodeResults, ObjectType, SMO_elementType,
+                               SMO_nodeAttribute)
+
+from .network import write_network
+
+SIZES = [100, 1000, 10000, 100000]
+
+# Routing steps timed per benchmark call
+STEPS = 50
+
+
+def _since(module, *names):
+    """
+    Names of a pyswmm module that older releases may not have.
+
+    They are imported when a benchmark is set up, so on a release without
+    them asv skips just those benchmarks (setup raises NotImplementedError)
+    and the rest of the suite still runs.
+
+    :param str module: Module path, e.g. 'pyswmm.graph'
+    :param names: Names to import from it
+    :return: The objects, in the order of names
+    :rtype: list
+    """
+    try:
+        imported = importlib.import_module(module)
+        return [getattr(imported, name) for name in names]
+    except (ImportError, AttributeError) as error:
+        raise NotImplementedError(str(error))
+
+
+class _Networks(object):
+    """Benchmarks on one DYNWAVE network per size, written once."""
+
+    params = SIZES
+    param_names = ['elements']
+    timeout = 600
+
+    def setup_cache(self):
+        paths = {}
+        for size in SIZES:
+            path = os.path.abspath('network_{0}.inp'.format(size))
+            paths[size] = write_network(path, size)
+        return paths
+
+
+class _Running(_Networks):
+    """A started simulation of each size, a few steps into the storm."""
+
+    def setup(self, paths, size):
+        self.sim = Simulation(paths[size])
+        self.sim.start()
+        self.steps = iter(self.sim)
+        for _ in range(STEPS):
+            next(self.steps)
+
+    def teardown(self, paths, size):
+        self.sim.close()
+
+
+class Open(_Networks):
+    """Parsing the .inp and opening the project."""
+
+    def time_open(self, paths, size):
+        Simulation(paths[size]).close()
+
+    def peakmem_open(self, paths, size):
+        Simulation(paths[size]).close()
+
+
+class Step(_Running):
+    """Routing step throughput."""
+
+    number = 1
+    repeat = 10
+
+    def time_steps(self, paths, size):
+        steps = self.steps
+        for _ in range(STEPS):
+            next(steps)
+
+    def track_steps_per_second(self, paths, size):
+        steps = self.steps
+        start = timer()
+        for _ in range(STEPS):
+            next(steps)
+        return STEPS / (timer() - start)
+
+    track_steps_per_second.unit = 'steps/s'
+
+
+class _Elements(_Running):
+    """A running simulation with its element objects built once."""
+
+    def setup(self, paths, size):
+        _Running.setup(self, paths, size)
+        self.nodes = list(Nodes(self.sim))
+        self.links = list(Links(self.sim))
+        self.subcatchments = list(Subcatchments(self.sim))
+
+
+class ElementAccess(_Elements):
+    """Getters and setters called once per element."""
+
+    def time_node_depth(self, paths, size):
+        for node in self.nodes:
+            node.depth
+
+    def time_node_depth_bulk(self, paths, size):
+        self.sim._model.getNodeResults(NodeResults.newDepth.value)
+
+    def time_node_depth_three_reads(self, paths, size):
+        for node in self.nodes:
+            node.depth
+            node.depth
+            node.depth
+
+    def time_node_depth_three_reads_cached(self, paths, size):
+        model = self.sim._model
+        model.enable_result_cache()
+        # A fresh step's worth of cache misses on every call
+        model._invalidate_results()
+        for node in self.nodes:
+            node.depth
+            node.depth
+            node.depth
+        model.disable_result_cache()
+
+    def time_node_generated_inflow(self, paths, size):
+        for node in self.nodes:
+            node.generated_inflow(0.1)
+
+    def time_link_flow(self, paths, size):
+        for link in self.links:
+            link.flow
+
+    def time_link_target_setting(self, paths, size):
+        for link in self.links:
+            link.target_setting = 1.0
+
+    def time_subcatchment_runoff(self, paths, size):
+        for subcatchment in self.subcatchments:
+            subcatchment.runoff
+
+
+class Iteration(_Running):
+    """Walking the element collections."""
+
+    def time_nodes(self, paths, size):
+        for node in Nodes(self.sim):
+            node.nodeid
+
+    def time_links(self, paths, size):
+        for link in Links(self.sim):
+            link.linkid
+
+    def time_subcatchments(self, paths, size):
+        for subcatchment in Subcatchments(self.sim):
+            subcatchment.subcatchmentid
+
+
+class Handles(_Running):
+    """Building and looking up the element objects of a large model."""
+
+    def setup(self, paths, size):
+        _Running.setup(self, paths, size)
+        self.nodeids = self.sim._model.getObjectIDList(
+            ObjectType.NODE.value)
+
+    def time_node_lookup(self, paths, size):
+        nodes = Nodes(self.sim)
+        for nodeid in self.nodeids:
+            nodes[nodeid]
+
+    def peakmem_nodes(self, paths, size):
+        list(Nodes(self.sim))
+
+    def track_node_bytes(self, paths, size):
+        # Memory of the node objects, per node, on first iteration
+        import tracemalloc
+        tracemalloc.start()
+        try:
+            nodes = list(Nodes(self.sim))
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return current / float(len(nodes))
+
+    track_node_bytes.unit = 'bytes'
+
+
+class Calibration(_Elements):
+    """Changing one parameter of every node."""
+
+    def setup(self, paths, size):
+        NetworkTable, = _since('pyswmm', 'NetworkTable')
+        _Elements.setup(self, paths, size)
+        self.table = NetworkTable(self.sim)
+
+    def time_properties(self, paths, size):
+        for node in self.nodes:
+            node.invert_elevation = node.invert_elevation + 0.01
+
+    def time_table_load(self, paths, size):
+        self.table.reload()
+
+    def time_table_commit(self, paths, size):
+        self.table.nodes['invertElev'] += 0.01
+        self.table.commit()
+
+
+class Topology(_Running):
+    """Network graph queries, per link and on the prebuilt graph."""
+
+    def setup(self, paths, size):
+        self.Network, self.Drainage = _since('pyswmm.graph', 'Network',
+                                             'Drainage')
+        _Running.setup(self, paths, size)
+        self.links = list(Links(self.sim))
+        self.subcatchments = list(Subcatchments(self.sim))
+        self.network = self.Network(self.sim)
+        self.network.topological_order()
+        self.drainage = self.Drainage(self.sim)
+        self.inflow = self.sim._model.getNodeResults(
+            NodeResults.newLatFlow.value)
+
+    def time_link_connections(self, paths, size):
+        for link in self.links:
+            link.connections
+
+    def time_graph_build(self, paths, size):
+        self.Network(self.sim)
+
+    def time_upstream_of_outfall(self, paths, size):
+        self.network.upstream('O1')
+
+    def time_accumulate(self, paths, size):
+        self.network.accumulate(self.inflow)
+
+    def time_subcatchment_connections(self, paths, size):
+        for subcatchment in self.subcatchments:
+            subcatchment.connection
+
+    def time_drainage_build(self, paths, size):
+        self.Drainage(self.sim)
+
+    def time_node_loads(self, paths, size):
+        self.drainage.node_loads()
+
+
+class Statistics(_Elements):
+    """Cumulative statistics of every element."""
+
+    def time_node_statistics(self, paths, size):
+        for node in self.nodes:
+            node.statistics
+
+    def time_conduit_statistics(self, paths, size):
+        for link in self.links:
+            link.conduit_statistics
+
+    def time_subcatchment_statistics(self, paths, size):
+        for subcatchment in self.subcatchments:
+            subcatchment.statistics
+
+
+class OutputReading(object):
+    """Reading results back from the binary output file."""
+
+    params = SIZES
+    param_names = ['elements']
+    timeout = 1200
+
+    def setup_cache(self):
+        # One hour of KINWAVE routing per size, keeping the .out
+        paths = {}
+        for size in SIZES:
+            inp = os.path.abspath('output_{0}.inp'.format(size))
+            write_network(inp, size, routing='KINWAVE', hours=1)
+            with Simulation(inp) as sim:
+                for _ in sim:
+                    pass
+            paths[size] = os.path.splitext(inp)[0] + '.out'
+        return paths
+
+    def setup(self, paths, size):
+        self.OutputMap, = _since('pyswmm.output', 'OutputMap')
+        self.out = self.OutputMap(paths[size])
+        self.last_node = self.out.nodes[-1]
+
+    def teardown(self, paths, size):
+        self.out.close()
+
+    def time_open(self, paths, size):
+        self.OutputMap(paths[size]).close()
+
+    def time_node_series(self, paths, size):
+        self.out.series(SMO_elementType.SM_node, self.last_node,
+                        SMO_nodeAttribute.invert_depth)
+
+    def time_node_matrix(self, paths, size):
+        self.out.matrix(SMO_elementType.SM_node,
+                        SMO_nodeAttribute.invert_depth)
+
+
+def main(max_size=1000):
+    """Runs every benchmark once per size up to max_size, without asv."""
+    import shutil
+    import tempfile
+
+    global SIZES
+    SIZES = [size for size in SIZES if size <= max_size]
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    try:
+        caches = {}
+        for cls in (Open, Step, ElementAccess, Iteration, Handles,
+                    Calibration, Topology, Statistics, OutputReading):
+            # Inherited setup_cache methods share one cache, as in asv
+            key = getattr(cls.setup_cache, '__func__', cls.setup_cache)
+            if key not in caches:
+                caches[key] = cls().setup_cache()
+            paths = caches[key]
+            names = [name for name in dir(cls)
+                     if name.startswith(('time_', 'track_', 'peakmem_'))]
+            for size in SIZES:
+                for name in names:
+                    # A fresh setup per benchmark, as in asv
+                    bench = cls()
+                    try:
+                        if hasattr(bench, 'setup'):
+                            bench.setup(paths, size)
+                    except NotImplementedError:
+                        print('{0:<48} {1:>7}    skipped'.format(
+                            cls.__name__ + '.' + name, size))
+                        continue
+                    try:
+                        start = timer()
+                        value = getattr(bench, name)(paths, size)
+                        print('{0:<48} {1:>7} {2:>10.4f} s{3}'.format(
+                            cls.__name__ + '.' + name, size,
+                            timer() - start,
+                            '' if value is None else '  ({0:.1f})'.format(
+                                value)))
+                    finally:
+                        if hasattr(bench, 'teardown'):
+                            bench.teardown(paths, size)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""
+Cost of striding through a whole simulation.
+
+"before" is the stride loop as it used to be written: an unprototyped
+swmm_step handle, a new c_double per step and the stride start kept in a
+separate attribute. "after" is PySWMM.swmm_stride and
+PySWMM.swmm_stride_to. All three run the same model with the same stride,
+so they take the same number of routing steps.
+
+Usage: python benchmarks/bench_stride.py [stride_seconds] [repeat]
+"""
+
+# Standard library imports
+import ctypes
+import sys
+import time
+
+# Local imports
+from pyswmm.lib import DLL_SELECTION
+from pyswmm.swmm5 import PySWMM
+from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
+
+
+class _LegacyStride(object):
+    """swmm_stride as written before the prebound stride loop."""
+
+    def __init__(self, libobj):
+        self.libobj = libobj
+        self.curSimTime = 0.0
+
+    def __call__(self, advanceSeconds):
+        ctime = self.curSimTime
+        secPday = 3600.0 * 24.0
+        advanceDays = advanceSeconds / secPday
+        eps = advanceDays * 0.00001
+        while self.curSimTime <= ctime + advanceDays - eps:
+            elapsed_time = ctypes.c_double()
+            self.libobj.swmm_step(ctypes.byref(elapsed_time))
+            if elapsed_time.value == 0:
+                return 0.0
+            self.curSimTime = elapsed_time.value
+        return elapsed_time.value
+
+
+def _run(model, advance):
+    """Runs the model through advance(); returns (seconds, strides)."""
+    model.swmm_open()
+    model.swmm_start()
+    strides = 0
+    tic = time.perf_counter()
+    while advance() > 0.0:
+        strides += 1
+    toc = time.perf_counter()
+    model.swmm_end()
+    model.swmm_close()
+    return toc - tic, strides
+
+
+def main(stride=900, repeat=3):
+    model = PySWMM(MODEL_WEIR_SETTING_PATH)
+    # A separate handle without prototypes drives the same engine state
+    legacy_lib = ctypes.CDLL(DLL_SELECTION())
+
+    def before():
+        legacy = _LegacyStride(legacy_lib)
+        return lambda: legacy(stride)
+
+    def after():
+        return lambda: model.swmm_stride(stride)
+
+    def after_to():
+        targets = iter(range(stride, 10**9, stride))
+        return lambda: model.swmm_stride_to(next(targets))
+
+    print("{0:<16}{1:>10}{2:>12}".format('stride loop', 'strides',
+                                        'seconds'))
+    for name, make in (('before', before), ('swmm_stride', after),
+                       ('swmm_stride_to', after_to)):
+        results = [_run(model, make()) for _ in range(repeat)]
+        seconds = min(result[0] for result in results)
+        print("{0:<16}{1:>10}{2:>12.4f}".format(name, results[0][1],
+                                               seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""
+Per-call overhead of the SWMM toolkit wrappers.
+
+"before" calls an unprototyped library the way the wrappers used to
+(fresh ctypes objects on every call); "after" calls the PySWMM wrappers,
+which use the prototyped library and reused output buffers. The
+getNodeResults row compares one getter call per node with the bulk
+getter, which fills its output array in place.
+
+Usage: python benchmarks/bench_toolkit_calls.py [number]
+"""
+
+# Standard library imports
+import ctypes
+import sys
+import timeit
+
+# Local imports
+from pyswmm.lib import DLL_SELECTION
+from pyswmm.swmm5 import PySWMM
+from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
+import pyswmm.toolkitapi as tka
+
+
+def _legacy_calls(libobj):
+    """Wrapper bodies as written before the prototype table."""
+
+    def swmm_step():
+        elapsed_time = ctypes.c_double()
+        libobj.swmm_step(ctypes.byref(elapsed_time))
+        return elapsed_time.value
+
+    def get_node_result(index, resultType):
+        result = ctypes.c_double()
+        libobj.swmm_getNodeResult(index, resultType, ctypes.byref(result))
+        return result.value
+
+    def set_link_setting(index, targetSetting):
+        libobj.swmm_setLinkSetting(index, ctypes.c_double(targetSetting))
+
+    return swmm_step, get_node_result, set_link_setting
+
+
+def _time_calls(model, step, get_result, set_setting, number,
+                get_results=None):
+    """
+    Times each call on a started model; returns us per call.
+
+    get_results(resultType, indices) reads one result of many nodes; its
+    time is per node read. By default it calls get_result once per node.
+    """
+    model.swmm_open()
+    model.swmm_start()
+    node = tka.NodeResults.newDepth.value
+    link = model.getObjectIDIndex(tka.ObjectType.LINK.value, 'C3')
+    # Every node, repeated to 1000 reads so the per-read cost dominates
+    nodes = model.getProjectSize(tka.ObjectType.NODE.value)
+    indices = list(range(nodes)) * (1000 // nodes)
+    if get_results is None:
+
+        def get_results(resultType, indices):
+            return [get_result(index, resultType) for index in indices]
+
+    timings = {}
+    # Most of the simulation is left for the stepping benchmark
+    timings['swmm_step'] = timeit.timeit(step, number=number)
+    timings['swmm_getNodeResult'] = min(timeit.repeat(
+        lambda: get_result(0, node), number=number, repeat=5))
+    timings['swmm_setLinkSetting'] = min(timeit.repeat(
+        lambda: set_setting(link, 0.5), number=number, repeat=5))
+    timings['getNodeResults/node'] = min(timeit.repeat(
+        lambda: get_results(node, indices), number=number // 100,
+        repeat=5)) * 100 / len(indices)
+    model.swmm_end()
+    model.swmm_close()
+    return dict((name, 1e6 * seconds / number)
+                for name, seconds in timings.items())
+
+
+def main(number=20000):
+    model = PySWMM(MODEL_WEIR_SETTING_PATH)
+
+    # A separate handle without prototypes drives the same engine state
+    legacy = _legacy_calls(ctypes.CDLL(DLL_SELECTION()))
+    before = _time_calls(model, number=number, *legacy)
+    after = _time_calls(model, model.swmm_step, model.getNodeResultByIndex,
+                        model.setLinkSettingByIndex, number,
+                        model.getNodeResults)
+
+    print("{0:<22}{1:>12}{2:>12}{3:>10}".format('call', 'before (us)',
+                                               'after (us)', 'speedup'))
+    for name in ('swmm_step', 'swmm_getNodeResult', 'swmm_setLinkSetting',
+                 'getNodeResults/node'):
+        print("{0:<22}{1:>12.3f}{2:>12.3f}{3:>9.2f}x".format(
+            name, before[name], after[name], before[name] / after[name]))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
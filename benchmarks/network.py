@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""
+Synthetic SWMM networks of any size for the benchmarks.
+
+The network is a binary tree of junctions draining to one outfall: node
+J<i> drains to J<(i - 1) // 2> through conduit C<i>, and J0 drains to the
+outfall. Every junction gets one subcatchment under a single rain gage,
+so nodes, links and subcatchments all scale with N. Inverts fall by
+0.5 ft per tree level and pipes grow towards the outfall, which keeps
+the model stable at any size.
+
+Usage: python benchmarks/network.py model.inp [nodes] [routing] [hours]
+"""
+
+# Standard library imports
+from datetime import datetime, timedelta
+import math
+import sys
+
+OPTIONS = """\
+[TITLE]
+Synthetic benchmark network with {nodes} junctions
+
+[OPTIONS]
+FLOW_UNITS           CFS
+INFILTRATION         HORTON
+FLOW_ROUTING         {routing}
+START_DATE           {start:%m/%d/%Y}
+START_TIME           {start:%H:%M:%S}
+REPORT_START_DATE    {start:%m/%d/%Y}
+REPORT_START_TIME    {start:%H:%M:%S}
+END_DATE             {end:%m/%d/%Y}
+END_TIME             {end:%H:%M:%S}
+DRY_DAYS             0
+REPORT_STEP          00:15:00
+WET_STEP             00:05:00
+DRY_STEP             01:00:00
+ROUTING_STEP         {routing_step}
+ALLOW_PONDING        NO
+INERTIAL_DAMPING     PARTIAL
+VARIABLE_STEP        0.75
+LENGTHENING_STEP     0
+MIN_SURFAREA         12.557
+NORMAL_FLOW_LIMITED  BOTH
+SKIP_STEADY_STATE    NO
+LINK_OFFSETS         DEPTH
+MIN_SLOPE            0
+MAX_TRIALS           8
+HEAD_TOLERANCE       0.005
+SYS_FLOW_TOL         5
+LAT_FLOW_TOL         5
+THREADS              1
+
+[EVAPORATION]
+CONSTANT     0.0
+DRY_ONLY     NO
+
+[RAINGAGES]
+G1               INTENSITY 0:15     1.0      TIMESERIES DESIGN
+
+[TIMESERIES]
+DESIGN           0:00       0.0
+DESIGN           0:30       0.5
+DESIGN           1:00       1.5
+DESIGN           1:30       0.5
+DESIGN           2:00       0.0
+
+[REPORT]
+INPUT      NO
+CONTROLS   NO
+SUBCATCHMENTS ALL
+NODES ALL
+LINKS ALL
+"""
+
+# Seconds per routing step by routing method
+ROUTING_STEPS = {'DYNWAVE': 5, 'KINWAVE': 30, 'STEADY': 30}
+
+
+def _level(index):
+    """Depth of a junction in the binary tree (J0 is level 0)."""
+    return int(math.log(index + 1, 2))
+
+
+def network_sections(nodes):
+    """
+    Yields the element sections of an N junction network, line by line.
+
+    :param int nodes: Number of junctions (= conduits = subcatchments)
+    """
+    levels = _level(nodes - 1)
+
+    def invert(index):
+        return 1.0 + 0.5 * _level(index)
+
+    yield '[SUBCATCHMENTS]'
+    for i in range(nodes):
+        yield 'S{0} G1 J{0} 1 50 200 0.5 0'.format(i)
+    yield ''
+    yield '[SUBAREAS]'
+    for i in range(nodes):
+        yield 'S{0} 0.01 0.1 0.05 0.05 25 OUTLET'.format(i)
+    yield ''
+    yield '[INFILTRATION]'
+    for i in range(nodes):
+        yield 'S{0} 3 0.5 4 7 0'.format(i)
+    yield ''
+    yield '[JUNCTIONS]'
+    for i in range(nodes):
+        yield 'J{0} {1:.2f} 12 0 0 0'.format(i, invert(i))
+    yield ''
+    yield '[OUTFALLS]'
+    yield 'O1 0 FREE NO'
+    yield ''
+    yield '[CONDUITS]'
+    for i in range(nodes):
+        outlet = 'J{0}'.format((i - 1) // 2) if i else 'O1'
+        yield 'C{0} J{0} {1} 100 0.013 0 0 0 0'.format(i, outlet)
+    yield ''
+    yield '[XSECTIONS]'
+    for i in range(nodes):
+        diameter = 1.0 + 0.5 * (levels - _level(i))
+        yield 'C{0} CIRCULAR {1:.1f} 0 0 0 1'.format(i, diameter)
+    yield ''
+
+
+def write_network(path,
+                  nodes,
+                  routing='DYNWAVE',
+                  hours=6,
+                  start=datetime(2020, 1, 1)):
+    """
+    Writes a valid SWMM input file with N junctions, conduits and
+    subcatchments.
+
+    :param str path: Input file to write
+    :param int nodes: Number of junctions (at least 1)
+    :param str routing: DYNWAVE, KINWAVE or STEADY (default DYNWAVE)
+    :param float hours: Simulation duration (default 6)
+    :param datetime start: Simulation start (default 2020-01-01)
+    :return: path
+    """
+    if nodes < 1:
+        raise ValueError("A network needs at least one junction")
+    end = start + timedelta(hours=hours)
+    with open(path, 'w') as f:
+        f.write(OPTIONS.format(
+            nodes=nodes,
+            routing=routing,
+            routing_step=ROUTING_STEPS[routing],
+            start=start,
+            end=end))
+        f.write('\n')
+        for line in network_sections(nodes):
+            f.write(line)
+            f.write('\n')
+    return path
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args:
+        sys.exit(__doc__)
+    write_network(args[0],
+                  int(args[1]) if len(args) > 1 else 1000,
+                  args[2] if len(args) > 2 else 'DYNWAVE',
+                  float(args[3]) if len(args) > 3 else 6)
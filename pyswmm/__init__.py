@@ -7,8 +7,12 @@
 # -----------------------------------------------------------------------------
 """Python Wrapper for Stormwater Management Model (SWMM5)."""
 
+# Standard library imports
+import sys
+
 # Local imports
 from pyswmm.links import Link, Links
+from pyswmm.network import NetworkTable
 from pyswmm.nodes import Node, Nodes
 from pyswmm.simulation import Simulation
 from pyswmm.subcatchments import Subcatchment, Subcatchments
@@ -21,6 +25,10 @@ __author__ = 'Bryant E. McDonnell (EmNet LLC) - bemcdonnell@gmail.com'
 __copyright__ = 'Copyright (c) 2016 Bryant E. McDonnell (See AUTHORS)'
 __licence__ = 'BSD2'
 __all__ = [
-    Link, Links, Node, Nodes, Subcatchment, Subcatchments, Simulation,
-    SystemStats
+    Link, Links, NetworkTable, Node, Nodes, Subcatchment, Subcatchments,
+    Simulation, SystemStats
 ]
+
+if sys.version_info >= (3, 5):
+    from pyswmm.simulation_async import AsyncSimulation
+    __all__.append(AsyncSimulation)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Copy-on-write branching of a running simulation with os.fork()."""
+
+# Standard library imports
+import os
+import pickle
+import sys
+import traceback
+
+# Third party imports
+import six
+
+# Local imports
+from pyswmm.swmm5 import PYSWMMException
+
+# Open file descriptors of this process, with the file they point to
+_FD_DIR = '/proc/self/fd'
+
+
+def _detach_files(paths):
+    """
+    Points the descriptors of the given files to the null device.
+
+    A forked child shares the open file descriptions (and their offsets)
+    of the parent, so anything the engine writes to its report or binary
+    output file in the child would corrupt the parent's files.
+    """
+    paths = set(os.path.realpath(path) for path in paths if path)
+    null_fd = os.open(os.devnull, os.O_RDWR)
+    try:
+        for name in os.listdir(_FD_DIR):
+            fd = int(name)
+            try:
+                target = os.readlink(os.path.join(_FD_DIR, name))
+            except OSError:
+                continue
+            if fd != null_fd and target in paths:
+                os.dup2(null_fd, fd)
+    finally:
+        os.close(null_fd)
+
+
+def _apply_policy(sim, policy):
+    """Applies a policy given as callable or {link ID: setting} dict."""
+    if isinstance(policy, dict):
+        for ID, setting in six.iteritems(policy):
+            sim._model.setLinkSetting(ID, setting)
+    elif policy is not None:
+        policy(sim)
+
+
+def _run_branch(sim, policy, horizon, summary):
+    """
+    Runs one branch in the child and returns its summary.
+
+    The child starts without the parent's callbacks, so a controller
+    subscribed to the parent cannot branch again from inside a branch.
+    """
+    model = sim._model
+    _detach_files([model.rptfile, model.binfile])
+    sim._callbacks = dict((event, []) for event in sim._callbacks)
+    _apply_policy(sim, policy)
+    if horizon is not None:
+        target = model.curSimTime * 86400.0 + horizon
+        for _ in sim:
+            if model.curSimTime * 86400.0 >= target - 1e-3:
+                break
+    if summary is None:
+        return None
+    return summary(sim)
+
+
+def _child(sim, policy, horizon, summary, write_fd):
+    """Child process body; never returns."""
+    status = 1
+    try:
+        try:
+            payload = (True, _run_branch(sim, policy, horizon, summary))
+        except BaseException:
+            payload = (False, traceback.format_exc())
+        with os.fdopen(write_fd, 'wb') as pipe:
+            pickle.dump(payload, pipe, pickle.HIGHEST_PROTOCOL)
+        status = 0
+    finally:
+        # Skip atexit handlers and finalizers: the parent still owns the
+        # library copy, scratch files and open engine state
+        os._exit(status)
+
+
+def branch(sim, policies, horizon=None, summary=None):
+    """
+    Forks one child per policy from the current engine state.
+
+    See Simulation.branch().
+    """
+    if not hasattr(os, 'fork') or not os.path.isdir(_FD_DIR):
+        raise PYSWMMException("Branching requires Linux (os.fork and /proc)")
+    if horizon is not None and horizon <= 0:
+        raise PYSWMMException("horizon must be positive")
+    policies = list(policies)
+
+    # Unflushed output would otherwise be written once per child
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    children = []
+    try:
+        for policy in policies:
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                _child(sim, policy, horizon, summary, write_fd)
+            os.close(write_fd)
+            children.append((pid, read_fd))
+    except OSError:
+        for pid, read_fd in children:
+            os.close(read_fd)
+            os.waitpid(pid, 0)
+        raise
+
+    results = []
+    errors = []
+    for branch_index, (pid, read_fd) in enumerate(children):
+        # Each child has its own pipe, so reading them in turn cannot
+        # deadlock even when a payload is larger than the pipe buffer
+        with os.fdopen(read_fd, 'rb') as pipe:
+            data = pipe.read()
+        os.waitpid(pid, 0)
+        if not data:
+            errors.append("Branch {0} exited without a result".format(
+                branch_index))
+            results.append(None)
+            continue
+        ok, value = pickle.loads(data)
+        if not ok:
+            errors.append("Branch {0} failed:\n{1}".format(
+                branch_index, value))
+            value = None
+        results.append(value)
+    if errors:
+        raise PYSWMMException('\n'.join(errors))
+    return results
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Process-pool ensemble runner for scenario sweeps."""
+
+# Standard library imports
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import shutil
+import tempfile
+import traceback
+
+# Third party imports
+import six
+
+# Local imports
+from pyswmm.simulation import Simulation
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.toolkitapi import LinkParams, NodeParams, SubcParams
+
+# Scratch directory of the current pool process (see _worker_dir)
+_WORKER_DIR = None
+
+# Override section: (parameter enum, PySWMM setter name)
+_OVERRIDE_SECTIONS = {
+    'nodes': (NodeParams, 'setNodeParam'),
+    'links': (LinkParams, 'setLinkParam'),
+    'subcatchments': (SubcParams, 'setSubcatchParam'),
+}
+
+MemberResult = namedtuple('MemberResult',
+                          ['member', 'overrides', 'stats', 'error'])
+MemberResult.__doc__ = """
+Result of one ensemble member.
+
+:param int member: Member position in the ensemble
+:param dict overrides: Parameter overrides applied to the member
+:param dict stats: Summary statistics (None if the member failed)
+:param str error: Traceback of the failure (None if the member succeeded)
+"""
+
+
+def _parameter_value(param_enum, parameter):
+    """Resolves a parameter given as enum member, name or int."""
+    if isinstance(parameter, param_enum):
+        return parameter.value
+    if isinstance(parameter, six.string_types):
+        try:
+            return param_enum[parameter].value
+        except KeyError:
+            raise PYSWMMException("Unknown {0} parameter '{1}'".format(
+                param_enum.__name__, parameter))
+    return int(parameter)
+
+
+def _apply_overrides(model, overrides):
+    """
+    Applies parameter overrides to an open model.
+
+    :param object model: Open PySWMM instance
+    :param dict overrides: {'nodes'|'links'|'subcatchments':
+                            {ID: {parameter: value}}}
+    """
+    for section, elements in six.iteritems(overrides):
+        if section not in _OVERRIDE_SECTIONS:
+            raise PYSWMMException(
+                "Unknown override section '{0}'".format(section))
+        param_enum, setter_name = _OVERRIDE_SECTIONS[section]
+        setter = getattr(model, setter_name)
+        for ID, params in six.iteritems(elements):
+            for parameter, value in six.iteritems(params):
+                setter(ID, _parameter_value(param_enum, parameter), value)
+
+
+def _worker_dir(rootdir):
+    """Returns the scratch directory of this pool process."""
+    global _WORKER_DIR
+    if _WORKER_DIR is None or not _WORKER_DIR.startswith(rootdir):
+        _WORKER_DIR = tempfile.mkdtemp(
+            prefix='worker_{0}_'.format(os.getpid()), dir=rootdir)
+    return _WORKER_DIR
+
+
+def _run_member(inputfile, member, overrides, rootdir, swmm_lib_path,
+                summary_func, keep_files):
+    """
+    Runs one ensemble member inside a pool process.
+
+    Every exception is caught and returned so one failing member never
+    takes down the rest of the ensemble.
+    """
+    if keep_files:
+        workdir = _worker_dir(rootdir)
+        basename = 'member_{0}'.format(member)
+        reportfile = os.path.join(workdir, basename + '.rpt')
+        outputfile = os.path.join(workdir, basename + '.out')
+        output_mode = "keep"
+    else:
+        # Statistics come from the engine, so nothing needs to be written
+        reportfile = outputfile = None
+        output_mode = "none"
+    try:
+        with Simulation(inputfile, reportfile, outputfile, swmm_lib_path,
+                        output_mode=output_mode) as sim:
+            _apply_overrides(sim._model, overrides)
+            for _ in sim:
+                pass
+            model = sim._model
+            stats = {
+                'routing': model.flow_routing_stats(),
+                'runoff': model.runoff_routing_stats(),
+            }
+            runoff_error, flow_error, quality_error = \
+                model.swmm_getMassBalErr()
+            stats['runoff_error'] = runoff_error
+            stats['flow_routing_error'] = flow_error
+            stats['quality_error'] = quality_error
+            if summary_func is not None:
+                stats['summary'] = summary_func(sim)
+        result = MemberResult(member, overrides, stats, None)
+    except Exception:
+        result = MemberResult(member, overrides, None, traceback.format_exc())
+    return result
+
+
+class EnsembleRunner(object):
+    """
+    Runs many variants of one SWMM model over a process pool.
+
+    The SWMM engine keeps its state in library globals, so only one model
+    can run per process. Each member is run in a pool process with its
+    own parameter overrides. Members run with output_mode "none" (see
+    Simulation), so nothing is written to workdir unless keep_files is
+    set, in which case report and output files are written to a directory
+    per worker.
+
+    :param str inputfile: Name of SWMM input file
+    :param list members: Parameter override dicts, one per member
+    :param int max_workers: Number of pool processes (default CPU count)
+    :param str workdir: Parent directory for kept files (default system
+                        temp directory)
+    :param str swmm_lib_path: User-specified SWMM library path
+                              (default None)
+    :param func summary_func: Picklable function called with the
+                              Simulation at the end of each member; its
+                              return value is stored as stats['summary']
+    :param bool keep_files: Keep .rpt/.out files of each member
+                            (default False)
+
+    Overrides map a section to element IDs and parameters, where a
+    parameter is a toolkitapi member, its name or its int value:
+
+    >>> {'nodes': {'J1': {'invertElev': 10.0}},
+    ...  'links': {'C1': {LinkParams.offset1: 0.5}},
+    ...  'subcatchments': {'S1': {'width': 120.0}}}
+
+    Examples:
+
+    >>> from pyswmm.ensemble import EnsembleRunner
+    >>>
+    >>> members = [{'subcatchments': {'S1': {'width': width}}}
+    ...            for width in range(50, 500, 10)]
+    >>> runner = EnsembleRunner('tests/data/model_weir_setting.inp',
+    ...                         members, max_workers=4)
+    >>> for result in runner:
+    ...     if result.error is None:
+    ...         print(result.member, result.stats['routing']['flooding'])
+    """
+
+    def __init__(self,
+                 inputfile,
+                 members,
+                 max_workers=None,
+                 workdir=None,
+                 swmm_lib_path=None,
+                 summary_func=None,
+                 keep_files=False):
+        self.inputfile = os.path.abspath(inputfile)
+        self.members = list(members)
+        self.max_workers = max_workers
+        self.workdir = workdir
+        self.swmm_lib_path = swmm_lib_path
+        self.summary_func = summary_func
+        self.keep_files = keep_files
+
+    def __iter__(self):
+        """Iterator over member results (see run())."""
+        return self.run()
+
+    def run(self):
+        """
+        Runs the ensemble, yielding results as members finish.
+
+        Results arrive in completion order; use MemberResult.member to
+        match them to the input list.
+
+        :return: Generator of MemberResult
+        """
+        # Created once the executor exists, so a rejected max_workers
+        # leaves no directory behind
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        rootdir = tempfile.mkdtemp(prefix='pyswmm_ensemble_',
+                                   dir=self.workdir)
+        futures = {}
+        try:
+            for member, overrides in enumerate(self.members):
+                future = executor.submit(
+                    _run_member, self.inputfile, member, overrides, rootdir,
+                    self.swmm_lib_path, self.summary_func, self.keep_files)
+                futures[future] = (member, overrides)
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception:
+                    # The worker itself died (e.g. the engine crashed)
+                    member, overrides = futures[future]
+                    yield MemberResult(member, overrides, None,
+                                       traceback.format_exc())
+        finally:
+            # Drop members not yet started if the caller stops early
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            if not self.keep_files:
+                shutil.rmtree(rootdir, ignore_errors=True)
+
+    def results(self):
+        """
+        Runs the ensemble and returns all results in member order.
+
+        :return: MemberResult per member
+        :rtype: list
+        """
+        return sorted(self.run(), key=lambda result: result.member)
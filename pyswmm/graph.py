@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""
+Node-link topology and subcatchment drainage of an open model as
+compressed sparse rows.
+"""
+
+# Standard library imports
+from itertools import chain
+
+# Third party imports
+import numpy as np
+import six
+
+# Local imports
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.toolkitapi import ObjectType, SubcParams, SubcResults
+
+
+def _csr(rows, count):
+    """
+    Groups items by row.
+
+    :param numpy.ndarray rows: Row of every item
+    :param int count: Number of rows
+    :return: (ptr, items); the items of row r are items[ptr[r]:ptr[r + 1]]
+    """
+    ptr = np.zeros(count + 1, dtype=np.intp)
+    np.cumsum(np.bincount(rows, minlength=count), out=ptr[1:])
+    return ptr, np.argsort(rows, kind='stable').astype(np.intp)
+
+
+def _gather(ptr, items, rows):
+    """Items of several CSR rows, concatenated without a Python loop."""
+    starts = ptr[rows]
+    lengths = ptr[rows + 1] - starts
+    ends = np.cumsum(lengths)
+    offsets = np.repeat(starts - ends + lengths, lengths)
+    return items[offsets + np.arange(offsets.size)]
+
+
+class SparseMatrix(object):
+    """
+    Sparse matrix in compressed sparse row form, for matrix-vector
+    products with NumPy only.
+
+    Row r holds data[indptr[r]:indptr[r + 1]] in the columns
+    indices[indptr[r]:indptr[r + 1]], as in scipy.sparse.csr_matrix.
+
+    :param tuple shape: (rows, columns)
+    :param rows: Row of every entry
+    :param cols: Column of every entry
+    :param data: Value of every entry (default None for ones)
+    """
+
+    def __init__(self, shape, rows, cols, data=None):
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        if data is None:
+            data = np.ones(rows.size)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.indptr, order = _csr(rows, self.shape[0])
+        self.indices = cols[order]
+        self.data = np.asarray(data, dtype=np.float64)[order]
+        self._rows = rows[order]
+
+    @property
+    def nnz(self):
+        """Number of stored entries."""
+        return self.data.size
+
+    def dot(self, x):
+        """
+        Matrix product with a vector, or with a matrix of column vectors.
+
+        :param x: Array of shape (columns,) or (columns, k)
+        :return: Array of shape (rows,) or (rows, k)
+        :rtype: numpy.ndarray
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.shape[0] != self.shape[1]:
+            raise PYSWMMException("Expected {0} values, got {1}".format(
+                self.shape[1], x.shape[0]))
+        if x.ndim == 1:
+            return np.bincount(self._rows,
+                               weights=self.data * x[self.indices],
+                               minlength=self.shape[0])
+        out = np.zeros((self.shape[0], ) + x.shape[1:])
+        np.add.at(out, self._rows,
+                  self.data.reshape((-1, ) + (1, ) * (x.ndim - 1)) *
+                  x[self.indices])
+        return out
+
+    __matmul__ = dot
+
+    def toarray(self):
+        """Dense copy of the matrix."""
+        out = np.zeros(self.shape)
+        np.add.at(out, (self._rows, self.indices), self.data)
+        return out
+
+    def tocsr(self):
+        """
+        The same matrix as a scipy.sparse.csr_matrix (requires scipy).
+        """
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.data, self.indices, self.indptr),
+                          shape=self.shape)
+
+
+class Network(object):
+    """
+    Node-link graph of an open model, read from the engine once.
+
+    Links point in their flow direction (reversed conduits already
+    swapped, as in Link.connections). Adjacency is stored as compressed
+    sparse rows over the engine's element indices: the outgoing links of
+    node n are out_links[out_ptr[n]:out_ptr[n + 1]], its incoming links
+    in_links[in_ptr[n]:in_ptr[n + 1]]. Traversals and accumulation work
+    on whole frontiers with NumPy, so they can run every step.
+
+    Node arguments take a node ID or index; results are index arrays
+    (see node_ids and link_ids for the IDs).
+
+    :param object model: Open Simulation (or PySWMM) instance
+
+    Examples:
+
+    >>> from pyswmm import Nodes, Simulation
+    >>> from pyswmm.graph import Network
+    >>>
+    >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+    ...     network = Network(sim)
+    ...     print([network.node_ids[i] for i in network.upstream('J2')])
+    ...     for step in sim:
+    ...         inflow = [node.lateral_inflow for node in Nodes(sim)]
+    ...         upstream_inflow = network.accumulate(inflow)
+    ['J1', 'J5']
+    """
+
+    def __init__(self, model):
+        model = getattr(model, '_model', model)
+        if not model.fileLoaded:
+            raise PYSWMMException("SWMM Model Not Open")
+        self.node_ids = model.getObjectIDList(ObjectType.NODE.value)
+        self.link_ids = model.getObjectIDList(ObjectType.LINK.value)
+        # IDs match in any letter case, as in PySWMM.getObjectIDIndex
+        self._node_index = dict(
+            (ID.upper(), index) for index, ID in enumerate(self.node_ids))
+        nodes, links = len(self.node_ids), len(self.link_ids)
+
+        ends = np.fromiter(
+            chain.from_iterable(
+                model.getLinkConnectionsByIndex(index)
+                for index in range(links)),
+            dtype=np.intp,
+            count=2 * links).reshape(links, 2)
+        self.link_inlet = ends[:, 0].copy()
+        self.link_outlet = ends[:, 1].copy()
+        self.out_ptr, self.out_links = _csr(self.link_inlet, nodes)
+        self.in_ptr, self.in_links = _csr(self.link_outlet, nodes)
+
+        # Built on first use by topological_order()
+        self._levels = None
+        self._level_links = None
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def node_index(self, node):
+        """
+        Engine index of a node.
+
+        :param node: Node ID or index
+        :rtype: int
+        """
+        if isinstance(node, six.string_types):
+            if node.upper() not in self._node_index:
+                raise PYSWMMException("ID Does not Exist")
+            return self._node_index[node.upper()]
+        if not 0 <= node < len(self.node_ids):
+            raise PYSWMMException("Node index {0} out of range".format(node))
+        return int(node)
+
+    @property
+    def out_degree(self):
+        """Number of outgoing links per node."""
+        return np.diff(self.out_ptr)
+
+    @property
+    def in_degree(self):
+        """Number of incoming links per node."""
+        return np.diff(self.in_ptr)
+
+    def outgoing(self, node):
+        """
+        Links leaving a node.
+
+        :param node: Node ID or index
+        :return: Link indices
+        :rtype: numpy.ndarray
+        """
+        index = self.node_index(node)
+        return self.out_links[self.out_ptr[index]:self.out_ptr[index + 1]]
+
+    def incoming(self, node):
+        """
+        Links entering a node.
+
+        :param node: Node ID or index
+        :return: Link indices
+        :rtype: numpy.ndarray
+        """
+        index = self.node_index(node)
+        return self.in_links[self.in_ptr[index]:self.in_ptr[index + 1]]
+
+    def _reach(self, node, ptr, items, ends):
+        """Nodes reached from node by following ptr/items to ends."""
+        start = self.node_index(node)
+        seen = np.zeros(len(self.node_ids), dtype=bool)
+        seen[start] = True
+        frontier = np.array([start], dtype=np.intp)
+        while frontier.size:
+            nodes = ends[_gather(ptr, items, frontier)]
+            frontier = np.unique(nodes[~seen[nodes]])
+            seen[frontier] = True
+        seen[start] = False
+        return np.flatnonzero(seen)
+
+    def downstream(self, node):
+        """
+        All nodes a node drains to, through any number of links.
+
+        :param node: Node ID or index
+        :return: Sorted node indices, without the node itself
+        :rtype: numpy.ndarray
+        """
+        return self._reach(node, self.out_ptr, self.out_links,
+                           self.link_outlet)
+
+    def upstream(self, node):
+        """
+        All nodes draining to a node, through any number of links.
+
+        :param node: Node ID or index
+        :return: Sorted node indices, without the node itself
+        :rtype: numpy.ndarray
+        """
+        return self._reach(node, self.in_ptr, self.in_links,
+                           self.link_inlet)
+
+    def topological_order(self):
+        """
+        Nodes ordered so that every link runs from an earlier node to a
+        later one.
+
+        Nodes come level by level: first those without incoming links,
+        then those whose upstream nodes are all placed, and so on.
+
+        :return: Node indices
+        :rtype: numpy.ndarray
+        :raises PYSWMMException: if the links form a loop
+        """
+        if self._levels is None:
+            self._build_levels()
+        return np.concatenate(self._levels)
+
+    def _build_levels(self):
+        """Kahn's algorithm, one whole frontier at a time."""
+        pending = self.in_degree.copy()
+        frontier = np.flatnonzero(pending == 0)
+        levels, level_links = [], []
+        placed = 0
+        while frontier.size:
+            levels.append(frontier)
+            placed += frontier.size
+            links = _gather(self.out_ptr, self.out_links, frontier)
+            level_links.append(links)
+            targets = self.link_outlet[links]
+            np.subtract.at(pending, targets, 1)
+            targets = np.unique(targets)
+            frontier = targets[pending[targets] == 0]
+        if placed < len(self.node_ids):
+            raise PYSWMMException(
+                "{0} nodes are on or below a loop".format(
+                    len(self.node_ids) - placed))
+        self._levels = levels or [np.array([], dtype=np.intp)]
+        self._level_links = level_links
+
+    def accumulate(self, values, fractions=None):
+        """
+        Totals of a node quantity over each node and everything upstream.
+
+        Totals are passed down the network in topological order. A node
+        with several outgoing links splits its total between them by
+        fractions, evenly by default, so flow dividers are not counted
+        twice where their branches meet again. On a tree the result is
+        simply the sum over the node and all its upstream nodes.
+
+        :param values: One value per node (e.g. lateral inflows)
+        :param fractions: Share of the inlet node's total passed on by
+                          each link (default None for an even split)
+        :return: One total per node
+        :rtype: numpy.ndarray
+        :raises PYSWMMException: if the links form a loop
+        """
+        totals = np.array(values, dtype=np.float64)
+        if totals.shape != (len(self.node_ids),):
+            raise PYSWMMException("Expected one value per node")
+        if self._levels is None:
+            self._build_levels()
+        if fractions is None:
+            fractions = 1.0 / self.out_degree[self.link_inlet]
+        else:
+            fractions = np.asarray(fractions, dtype=np.float64)
+        inlet, outlet = self.link_inlet, self.link_outlet
+        for links in self._level_links:
+            np.add.at(totals, outlet[links],
+                      totals[inlet[links]] * fractions[links])
+        return totals
+
+
+class Drainage(object):
+    """
+    Where the runoff of every subcatchment goes, read from the engine
+    once.
+
+    A subcatchment drains either to a node or, in a cascade, onto
+    another subcatchment whose runoff then includes it as runon. The
+    node a cascade ends at is its terminal node. A subcatchment that
+    routes nowhere has -1 as its outlets and terminal node.
+
+    Node loads only count runoff that leaves the cascades, so loads is
+    the nodes x subcatchments matrix of the direct node outlets: one
+    multiply turns a step's runoff array into the runoff load of every
+    node. Areas are read when the drainage is built.
+
+    :param object model: Open Simulation (or PySWMM) instance
+
+    Examples:
+
+    >>> from pyswmm import Simulation
+    >>> from pyswmm.graph import Drainage, Network
+    >>>
+    >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+    ...     drainage = Drainage(sim)
+    ...     # Area draining to each node, then through the pipes as well
+    ...     area = drainage.contributing_area()
+    ...     network_area = Network(sim).accumulate(area)
+    ...     for step in sim:
+    ...         loads = drainage.node_loads()
+    """
+
+    def __init__(self, model):
+        model = getattr(model, '_model', model)
+        if not model.fileLoaded:
+            raise PYSWMMException("SWMM Model Not Open")
+        self._model = model
+        self.subcatchment_ids = model.getObjectIDList(
+            ObjectType.SUBCATCH.value)
+        self.node_ids = model.getObjectIDList(ObjectType.NODE.value)
+        count = len(self.subcatchment_ids)
+
+        outlets = np.fromiter(
+            chain.from_iterable(
+                model.getSubcatchOutConnectionByIndex(index)
+                for index in range(count)),
+            dtype=np.intp,
+            count=2 * count).reshape(count, 2)
+        surface, target = outlets[:, 0], outlets[:, 1]
+        valid = target >= 0
+        self.outlet_node = np.where(
+            valid & (surface == ObjectType.NODE.value), target, -1)
+        # The engine reports a subcatchment without an outlet (or one
+        # draining onto itself) as its own outlet; it routes nowhere
+        self.outlet_subcatchment = np.where(
+            valid & (surface == ObjectType.SUBCATCH.value) &
+            (target != np.arange(count)), target, -1)
+        self.terminal_node = self._terminal_nodes()
+        self.area = model.getSubcatchParams(SubcParams.area)
+
+        direct = np.flatnonzero(self.outlet_node >= 0)
+        self.loads = SparseMatrix((len(self.node_ids), count),
+                                  self.outlet_node[direct], direct)
+
+    def __len__(self):
+        return len(self.subcatchment_ids)
+
+    def _terminal_nodes(self):
+        """Follows every cascade to its node by pointer jumping."""
+        terminal = self.outlet_node.copy()
+        successor = self.outlet_subcatchment.copy()
+        # Each round doubles the cascade length resolved
+        resolved = 1
+        pending = np.flatnonzero(successor >= 0)
+        while pending.size:
+            if resolved > len(successor):
+                raise PYSWMMException("Subcatchment outlets form a loop")
+            jump = successor[pending]
+            terminal[pending] = terminal[jump]
+            successor[pending] = successor[jump]
+            resolved *= 2
+            pending = np.flatnonzero(successor >= 0)
+        return terminal
+
+    def cascade_matrix(self):
+        """
+        Nodes x subcatchments matrix from every subcatchment to its
+        terminal node.
+
+        Multiplying a per-subcatchment quantity that is not passed on
+        as runon (e.g. rainfall volume) attributes it to the node its
+        cascade ends at.
+
+        :rtype: SparseMatrix
+        """
+        drained = np.flatnonzero(self.terminal_node >= 0)
+        return SparseMatrix((len(self.node_ids), len(self)),
+                            self.terminal_node[drained], drained)
+
+    def contributing_area(self):
+        """
+        Subcatchment area draining to each node, cascades included.
+
+        :return: One area per node, in the model's area units
+        :rtype: numpy.ndarray
+        """
+        return self.cascade_matrix().dot(self.area)
+
+    def node_loads(self, runoff=None):
+        """
+        Runoff load of every node.
+
+        :param runoff: One runoff value per subcatchment (default None
+                       reads the current runoff from the engine)
+        :return: One load per node, in the model's flow units
+        :rtype: numpy.ndarray
+        """
+        if runoff is None:
+            runoff = self._model.getSubcatchResults(SubcResults.newRunoff)
+        return self.loads.dot(runoff)
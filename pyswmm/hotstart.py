@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Content-addressed cache of spin-up hotstart files."""
+
+# Standard library imports
+import hashlib
+import os
+import tempfile
+
+# Local imports
+from pyswmm.simulation import Simulation
+from pyswmm.swmm5 import PySWMM, PYSWMMException
+from pyswmm.utils.finalizer import Finalizer
+
+HOTSTART_EXTENSION = '.hsf'
+
+
+def _with_hotstart(text, command, path):
+    """
+    Returns .inp text whose [FILES] section saves or uses one hotstart.
+
+    Hotstart lines already in the section are dropped, since the cache
+    manages hotstart files itself.
+
+    :param str text: .inp file content
+    :param str command: 'SAVE' or 'USE'
+    :param str path: Hotstart file path
+    """
+    entry = '{0} HOTSTART "{1}"'.format(command, path)
+    lines = text.splitlines()
+    out = []
+    in_files = False
+    added = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('['):
+            in_files = stripped.upper().startswith('[FILES]')
+            out.append(line)
+            if in_files:
+                out.append(entry)
+                added = True
+            continue
+        words = stripped.upper().split()
+        if in_files and words[1:2] == ['HOTSTART']:
+            continue
+        out.append(line)
+    if not added:
+        out += ['', '[FILES]', entry]
+    return '\n'.join(out) + '\n'
+
+
+def _remove_file(path):
+    """Removes a file unless it is already gone."""
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class HotstartCache(object):
+    """
+    Runs model spin-up once and reuses its hotstart file in later runs.
+
+    Hotstart files are stored in cachedir under a key hashed from the
+    .inp content, the SWMM engine version and the spin-up end time, so an
+    edited model or a new engine gets a fresh spin-up. When the files
+    exceed max_bytes, the least recently used ones are removed.
+
+    Runs use copies of the .inp with a [FILES] hotstart entry. The copies
+    are written next to the original so relative paths in the model
+    still resolve, and are removed when the simulation closes.
+
+    :param str cachedir: Directory of the hotstart files (created if
+                         needed)
+    :param int max_bytes: Size budget of the cache (default None for no
+                          limit)
+    :param str swmm_lib_path: User-specified SWMM library path
+                              (default None)
+
+    Examples:
+
+    >>> from datetime import datetime
+    >>> from pyswmm.hotstart import HotstartCache
+    >>>
+    >>> cache = HotstartCache('hotstarts', max_bytes=2**30)
+    >>> forecast_start = datetime(2015, 11, 4, 0, 0)
+    >>> with cache.simulation('model.inp', forecast_start,
+    ...                       output_mode="none") as sim:
+    ...     for step in sim:
+    ...         pass
+    """
+
+    def __init__(self, cachedir, max_bytes=None, swmm_lib_path=None):
+        self.cachedir = os.path.abspath(cachedir)
+        self.max_bytes = max_bytes
+        self.swmm_lib_path = swmm_lib_path
+        self._engine_version = None
+        # Spin-ups run (misses) and hotstarts reused (hits)
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(self.cachedir):
+            os.makedirs(self.cachedir)
+
+    @property
+    def engine_version(self):
+        """SWMM engine version, part of every key."""
+        if self._engine_version is None:
+            model = PySWMM(swmm_lib_path=self.swmm_lib_path)
+            self._engine_version = str(model.swmm_getVersion())
+        return self._engine_version
+
+    def key(self, inputfile, spinup_end):
+        """
+        Cache key of a model spun up until spinup_end.
+
+        :param str inputfile: Name of SWMM input file
+        :param datetime spinup_end: End of the spin-up period
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        with open(inputfile, 'rb') as f:
+            digest.update(f.read())
+        digest.update(self.engine_version.encode('utf-8'))
+        digest.update(spinup_end.isoformat().encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cachedir, key + HOTSTART_EXTENSION)
+
+    def _derived_input(self, inputfile, command, path):
+        """Writes a copy of the .inp with a hotstart entry next to it."""
+        with open(inputfile) as f:
+            text = _with_hotstart(f.read(), command, path)
+        directory, name = os.path.split(os.path.abspath(inputfile))
+        fd, derived = tempfile.mkstemp(
+            prefix='.' + os.path.splitext(name)[0] + '_',
+            suffix='.inp',
+            dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        return derived
+
+    def hotstart(self, inputfile, spinup_end):
+        """
+        Hotstart file of the model at spinup_end, spun up if not cached.
+
+        :param str inputfile: Name of SWMM input file
+        :param datetime spinup_end: End of the spin-up period
+        :return: Hotstart file path
+        :rtype: str
+        """
+        path = self._path(self.key(inputfile, spinup_end))
+        if os.path.exists(path):
+            self.hits += 1
+            # Mark as recently used for eviction
+            os.utime(path, None)
+            return path
+
+        self.misses += 1
+        # Saved under a private name and moved in place once complete, so
+        # concurrent runs never see a partial file
+        partial = '{0}.{1}.tmp'.format(path, os.getpid())
+        derived = self._derived_input(inputfile, 'SAVE', partial)
+        try:
+            with Simulation(derived, swmm_lib_path=self.swmm_lib_path,
+                            output_mode="none") as sim:
+                if spinup_end <= sim.start_time:
+                    raise PYSWMMException(
+                        "Spin-up end {0} is not after the model start "
+                        "{1}".format(spinup_end, sim.start_time))
+                sim.end_time = spinup_end
+                for _ in sim:
+                    pass
+            if not os.path.exists(partial):
+                raise PYSWMMException("Spin-up saved no hotstart file")
+            os.rename(partial, path)
+        finally:
+            os.remove(derived)
+            if os.path.exists(partial):
+                os.remove(partial)
+        self.evict(keep=path)
+        return path
+
+    def simulation(self, inputfile, spinup_end, **kwargs):
+        """
+        Simulation of the model starting from its spin-up hotstart.
+
+        The simulation (and report) start is moved to spinup_end; the end
+        time stays as in the .inp. Unless given, the report and binary
+        output are written next to inputfile under its name, as for a
+        Simulation of inputfile itself.
+
+        :param str inputfile: Name of SWMM input file
+        :param datetime spinup_end: End of the spin-up period
+        :param kwargs: Passed on to Simulation (except the input file)
+        :rtype: Simulation
+        """
+        if kwargs.get('output_mode', 'keep') == 'keep':
+            # Named after the original model, not the hidden derived copy
+            base = os.path.splitext(os.path.abspath(inputfile))[0]
+            kwargs.setdefault('reportfile', base + '.rpt')
+            kwargs.setdefault('outputfile', base + '.out')
+        hotstart = self.hotstart(inputfile, spinup_end)
+        derived = self._derived_input(inputfile, 'USE', hotstart)
+        try:
+            sim = Simulation(derived, **kwargs)
+        except Exception:
+            os.remove(derived)
+            raise
+        try:
+            sim.start_time = spinup_end
+            if sim.report_start < spinup_end:
+                sim.report_start = spinup_end
+        except Exception:
+            sim.close()
+            os.remove(derived)
+            raise
+        # Removed on close, or once the simulation is collected unclosed
+        sim.add_after_close(Finalizer(sim, _remove_file, derived))
+        return sim
+
+    def entries(self):
+        """
+        Cached hotstart files, least recently used first.
+
+        :return: (path, size in bytes) per file
+        :rtype: list
+        """
+        entries = []
+        for name in os.listdir(self.cachedir):
+            if not name.endswith(HOTSTART_EXTENSION):
+                continue
+            path = os.path.join(self.cachedir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return [(path, size) for _, path, size in sorted(entries)]
+
+    def evict(self, keep=None):
+        """
+        Removes least recently used files until the cache fits max_bytes.
+
+        :param str keep: File never removed (default None)
+        :return: Removed file paths
+        :rtype: list
+        """
+        if self.max_bytes is None:
+            return []
+        entries = self.entries()
+        total = sum(size for _, size in entries)
+        removed = []
+        for path, size in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            removed.append(path)
+            total -= size
+        return removed
+
+    def clear(self):
+        """Removes all cached hotstart files."""
+        for path, _ in self.entries():
+            os.remove(path)
@@ -10,7 +10,9 @@ for selecting the SWMM5 engine. """
 
 # Standard library imports
 import os
+import shutil
 import sys
+import tempfile
 
 # Machine Architechture
 MACHINE_BITS = 8 * tuple.__itemsize__
@@ -42,6 +44,16 @@ elif sys.platform.startswith('linux'):
 else:
     LIB_SWMM = ''
 
+# Binary output reader library (built from src/ with `make`)
+if os.name == 'nt':
+    LIB_OUTPUT = os.path.join(HERE, _platform(),
+                              'outputapi.dll').replace('\\', '/')
+elif sys.platform == 'darwin' or sys.platform.startswith('linux'):
+    LIB_OUTPUT = os.path.join(HERE, _platform(),
+                              'outputapi.so').replace('\\', '/')
+else:
+    LIB_OUTPUT = ''
+
 
 class _DllPath(object):
     """DllPath Object."""
@@ -122,3 +134,29 @@ def use(arg):
             raise (Exception("Library Not Found"))
     else:
         raise (Exception("Operating System not Supported"))
+
+
+def isolated_copy(path=None):
+    """
+    Copy a SWMM5 library to a private temporary file.
+
+    The engine keeps its state in library globals, and loading the same
+    file twice returns the same handle. Loading a private copy gives the
+    caller its own set of engine globals. The caller owns the copy and
+    must remove it once the library is no longer needed.
+
+    :param str path: SWMM5 library path (default DLL_SELECTION())
+    :return: Path of the copy
+    :rtype: str
+    """
+    if path is None:
+        path = DLL_SELECTION()
+    root, ext = os.path.splitext(os.path.basename(path))
+    fd, copy_path = tempfile.mkstemp(prefix=root + '_', suffix=ext)
+    try:
+        with os.fdopen(fd, 'wb') as dst, open(path, 'rb') as src:
+            shutil.copyfileobj(src, dst)
+    except Exception:
+        os.remove(copy_path)
+        raise
+    return copy_path
@@ -16,6 +16,9 @@ class Links(object):
     """
     Link Iterator Methods.
 
+    Link objects are built and typed (Conduit, Pump) on first access, and
+    are shared by all Links of the open model. Iteration can be repeated.
+
     :param object model: Open Model Instance
 
     Examples:
@@ -74,7 +77,7 @@ class Links(object):
         :return: Number of Links
         :rtype: int
         """
-        return self._model.getProjectSize(ObjectType.LINK.value)
+        return self._nLinks
 
     def __contains__(self, linkid):
         """
@@ -86,23 +89,93 @@ class Links(object):
         return self._model.ObjectIDexist(ObjectType.LINK.value, linkid)
 
     def __getitem__(self, linkid):
-        if self.__contains__(linkid):
-            ln = Link(self._model, linkid)
-            _ln = ln
-            if ln.is_conduit():
-                _ln.__class__ = Conduit
-            elif ln.is_pump():
-                _ln.__class__ = Pump
-            return _ln
-        else:
+        if not self.__contains__(linkid):
             raise PYSWMMException("Link ID Does not Exist")
+        return self._link(
+            self._model.getObjectIDIndex(ObjectType.LINK.value, linkid))
+
+    def _handles(self):
+        """Link objects by index, shared by all Links of the open model."""
+        handles = self._model._elements.get(ObjectType.LINK.value)
+        if handles is None:
+            handles = [None] * self._nLinks
+            self._model._elements[ObjectType.LINK.value] = handles
+        return handles
+
+    def _link(self, index):
+        """Link object at index, built on first use."""
+        handles = self._handles()
+        link = handles[index]
+        if link is None:
+            linkid = self._model.getObjectId(ObjectType.LINK.value, index)
+            link = Link(self._model, linkid)
+            # Typed once, instead of type checks on every access
+            link.__class__ = _LINK_CLASSES.get(
+                self._model.getLinkTypeByIndex(index), Link)
+            handles[index] = link
+        return link
+
+    def indices(self, linkids):
+        """
+        Resolve link IDs to link indices once, for use with get_results().
+
+        :param list linkids: Link IDs
+        :return: Link Indices
+        :rtype: list
+        """
+        return self._model.getObjectIDIndices(ObjectType.LINK.value,
+                                              linkids)
+
+    def get_results(self, result_type, indices=None, out=None):
+        """
+        Get one result for many links in a single call.
+
+        :param int result_type: Result (toolkitapi.LinkResults member variable)
+        :param list indices: Link indices (default None for all links)
+        :param out: Preallocated float64 array to fill (default None)
+        :return: Result Values in the order of indices
+        :rtype: numpy.ndarray
+
+        Examples:
+
+        >>> from pyswmm import Simulation, Links
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+        ...     links = Links(sim)
+        ...     for step in sim:
+        ...         values = links.get_results(LinkResults.newFlow)
+        """
+        return self._model.getLinkResults(result_type, indices, out)
+
+    def set_target_settings(self, indices, settings):
+        """
+        Set the target setting of many links (Pumps, Orifices, Weirs).
+
+        :param list indices: Link indices (see indices())
+        :param list settings: New target settings, one per index
+
+        Examples:
+
+        >>> from pyswmm import Simulation, Links
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+        ...     links = Links(sim)
+        ...     gates = links.indices(['C2', 'C3'])
+        ...     for step in sim:
+        ...         links.set_target_settings(gates, [0.5, 0.25])
+        """
+        self._model.setLinkSettings(indices, settings)
 
     def __iter__(self):
-        return self
+        handles = self._handles()
+        if None in handles:
+            for index in range(self._nLinks):
+                self._link(index)
+        return iter(handles)
 
     def __next__(self):
         if self._cuindex < self._nLinks:
-            linkobject = self.__getitem__(self._linkid)
+            linkobject = self._link(self._cuindex)
             self._cuindex += 1  # Next Iteration
             return linkobject
         else:
@@ -110,11 +183,6 @@ class Links(object):
 
     next = __next__  # Python 2
 
-    @property
-    def _linkid(self):
-        """Link ID."""
-        return self._model.getObjectId(ObjectType.LINK.value, self._cuindex)
-
 
 class Link(object):
     """
@@ -135,10 +203,12 @@ class Link(object):
     ... 0.0
     """
 
+    __slots__ = ('_model', '_linkid')
+
     def __init__(self, model, linkid):
         if not model.fileLoaded:
             raise PYSWMMException("SWMM Model Not Open")
-        if linkid not in model.getObjectIDList(ObjectType.LINK.value):
+        if not model.ObjectIDexist(ObjectType.LINK.value, linkid):
             raise PYSWMMException("ID Not valid")
         self._model = model
         self._linkid = linkid
@@ -863,6 +933,8 @@ class Conduit(Link):
     Conduit Object: Subclass of Link Object.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super(Conduit, self).__init__()
 
@@ -923,6 +995,8 @@ class Pump(Link):
     Pump Object: Subclass of Link Object.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super(Pump, self).__init__()
 
@@ -958,3 +1032,10 @@ class Pump(Link):
         :rtype: dict
         """
         return self._model.pump_statistics(self.linkid)
+
+
+# Classes of the element types with their own methods
+_LINK_CLASSES = {
+    LinkType.conduit.value: Conduit,
+    LinkType.pump.value: Pump
+}
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Phase timings and throughput of a simulation run."""
+
+# Standard library imports
+from timeit import default_timer as timer
+import json
+import os
+import tempfile
+
+# Engine phases timed by Simulation, in run order
+PHASES = ("open", "start", "step", "callbacks", "end", "report", "close",
+          "execute")
+
+
+def _replace(source, destination):
+    """Renames source over destination, as os.replace (Python 3.3+)."""
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    elif os.name != 'nt':
+        os.rename(source, destination)
+    else:
+        # Windows refuses to rename over an existing file; readers may
+        # briefly find no file, but never a partial one
+        if os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
+
+
+def _write_atomic(path, text):
+    """Writes text so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, partial = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        _replace(partial, path)
+    except Exception:
+        os.remove(partial)
+        raise
+
+
+def _label_text(labels):
+    """Formats Prometheus labels, e.g. {model="a.inp",phase="open"}."""
+    if not labels:
+        return ''
+    pairs = []
+    for name in sorted(labels):
+        value = str(labels[name]).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n')
+        pairs.append('{0}="{1}"'.format(name, value))
+    return '{' + ','.join(pairs) + '}'
+
+
+class SimulationMetrics(object):
+    """
+    Collects wall time per phase, step counts and throughput of a run.
+
+    Created by Simulation(..., metrics=True) and available as
+    Simulation.metrics; the values can be read at any time during the run.
+
+    :param str model: Model name used as label in exports
+    """
+
+    def __init__(self, model=''):
+        self.model = model
+        self.phases = dict((phase, 0.0) for phase in PHASES)
+        self.steps = 0
+        self.callback_calls = 0
+        self.simulated_seconds = 0.0
+        self.total_simulated_seconds = None
+        self._run_start = None
+        self._run_end = None
+
+    def add(self, phase, seconds):
+        """Adds wall time to a phase."""
+        self.phases[phase] += seconds
+
+    def add_step(self, seconds, elapsed_days):
+        """
+        Counts a step that took seconds of wall time.
+
+        :param float seconds: Wall time of the step
+        :param float elapsed_days: Simulation time after the step (days);
+                                   0 when the step ended the run
+        """
+        self.phases["step"] += seconds
+        self.steps += 1
+        if elapsed_days > 0.0:
+            self.simulated_seconds = elapsed_days * 86400.0
+
+    def add_callbacks(self, seconds, calls):
+        """Adds wall time spent in user callbacks."""
+        self.phases["callbacks"] += seconds
+        self.callback_calls += calls
+
+    def run_started(self, total_simulated_seconds):
+        """Marks the start of stepping; total is the simulated duration."""
+        self.total_simulated_seconds = total_simulated_seconds
+        self._run_start = timer()
+        self._run_end = None
+
+    def run_ended(self):
+        """Marks the end of stepping."""
+        if self._run_start is not None and self._run_end is None:
+            self._run_end = timer()
+            if self.total_simulated_seconds is not None:
+                self.simulated_seconds = self.total_simulated_seconds
+
+    @property
+    def run_seconds(self):
+        """Wall time from the start of stepping (to its end or now)."""
+        if self._run_start is None:
+            return 0.0
+        end = self._run_end if self._run_end is not None else timer()
+        return end - self._run_start
+
+    @property
+    def steps_per_second(self):
+        """Steps per second of wall time spent in the engine steps."""
+        if not self.phases["step"]:
+            return 0.0
+        return self.steps / self.phases["step"]
+
+    @property
+    def speedup(self):
+        """Simulated time over wall time of the run so far."""
+        run_seconds = self.run_seconds
+        if not run_seconds:
+            return 0.0
+        return self.simulated_seconds / run_seconds
+
+    @property
+    def progress(self):
+        """Fraction of the simulated duration completed (0 to 1)."""
+        if not self.total_simulated_seconds:
+            return 0.0
+        return min(1.0, self.simulated_seconds / self.total_simulated_seconds)
+
+    @property
+    def eta(self):
+        """
+        Estimated wall seconds until the run ends, at the speed so far.
+
+        :return: Seconds (None before the first step)
+        :rtype: float
+        """
+        if self.total_simulated_seconds is None or not self.speedup:
+            return None
+        remaining = self.total_simulated_seconds - self.simulated_seconds
+        return max(0.0, remaining) / self.speedup
+
+    def as_dict(self):
+        """
+        Snapshot of all metrics.
+
+        :rtype: dict
+        """
+        return {
+            'model': self.model,
+            'phases': dict(self.phases),
+            'steps': self.steps,
+            'callback_calls': self.callback_calls,
+            'simulated_seconds': self.simulated_seconds,
+            'total_simulated_seconds': self.total_simulated_seconds,
+            'run_seconds': self.run_seconds,
+            'steps_per_second': self.steps_per_second,
+            'speedup': self.speedup,
+            'progress': self.progress,
+            'eta': self.eta,
+        }
+
+    def to_json(self, path=None):
+        """
+        Metrics as JSON.
+
+        :param str path: File to write (default None to only return text)
+        :rtype: str
+        """
+        text = json.dumps(self.as_dict(), indent=2, sort_keys=True)
+        if path is not None:
+            _write_atomic(path, text)
+        return text
+
+    def to_prometheus(self, path=None, labels=None):
+        """
+        Metrics in the Prometheus text exposition format.
+
+        Written files can be picked up by the node exporter textfile
+        collector.
+
+        :param str path: File to write (default None to only return text)
+        :param dict labels: Extra labels for every sample (default None)
+        :rtype: str
+        """
+        base = {'model': self.model}
+        base.update(labels or {})
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append('# HELP pyswmm_{0} {1}'.format(name, help_text))
+            lines.append('# TYPE pyswmm_{0} {1}'.format(name, kind))
+            for extra, value in samples:
+                sample_labels = dict(base)
+                sample_labels.update(extra)
+                lines.append('pyswmm_{0}{1} {2!r}'.format(
+                    name, _label_text(sample_labels), float(value)))
+
+        metric('phase_seconds', 'gauge', 'Wall time spent per phase.',
+               [({'phase': phase}, self.phases[phase]) for phase in PHASES])
+        metric('steps_total', 'counter', 'Simulation steps taken.',
+               [({}, self.steps)])
+        metric('callback_calls_total', 'counter',
+               'User callback invocations.', [({}, self.callback_calls)])
+        metric('simulated_seconds', 'gauge', 'Simulated time reached.',
+               [({}, self.simulated_seconds)])
+        metric('run_seconds', 'gauge', 'Wall time since stepping started.',
+               [({}, self.run_seconds)])
+        metric('steps_per_second', 'gauge',
+               'Steps per second of engine step time.',
+               [({}, self.steps_per_second)])
+        metric('speedup', 'gauge', 'Simulated time over wall time.',
+               [({}, self.speedup)])
+        metric('progress_ratio', 'gauge',
+               'Fraction of the simulated duration completed.',
+               [({}, self.progress)])
+        text = '\n'.join(lines) + '\n'
+        if path is not None:
+            _write_atomic(path, text)
+        return text
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Static network data of an open model as NumPy columns."""
+
+# Third party imports
+import numpy as np
+
+# Local imports
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.toolkitapi import (LinkParams, NodeParams, ObjectType,
+                               SubcParams)
+
+
+class ElementTable(object):
+    """
+    Parameter columns of one element kind (nodes, links or subcatchments).
+
+    Rows follow the engine's element indices. Columns are float64 arrays
+    named after the parameter enum members; edit them in place and call
+    commit() to write the changed cells back to the engine. A parameter
+    that this engine does not support is a column of NaN that cannot be
+    committed.
+
+    :param object model: Open PySWMM instance
+    :param int objecttype: ObjectType member variable
+    :param Enum params: Parameter enum (e.g. toolkitapi.NodeParams)
+    :param str kind: Node, Link or Subcatch, the suffix of the PySWMM
+                     get*Param/set*Params methods
+    :param func get_type: Element type getter by index (default None for
+                          elements without types)
+    """
+
+    def __init__(self, model, objecttype, params, kind, get_type=None):
+        self._model = model
+        self._objecttype = objecttype.value
+        self.params = params
+        self._kind = kind
+        self._get_type = get_type
+        self.ids = model.getObjectIDList(self._objecttype)
+        self.types = None
+        self._columns = {}
+        self._loaded = {}
+        self._supported = {}
+        self.reload()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, param):
+        return getattr(param, 'name', param) in self._columns
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getitem__(self, param):
+        return self._columns[self._name(param)]
+
+    def __setitem__(self, param, values):
+        self._columns[self._name(param)][...] = values
+
+    @property
+    def names(self):
+        """Column names, in parameter code order."""
+        return [param.name for param in self.params]
+
+    def _name(self, param):
+        """Column name of a parameter enum member or name."""
+        name = getattr(param, 'name', param)
+        if name not in self._columns:
+            raise PYSWMMException("Unknown parameter {0!r}".format(param))
+        return name
+
+    def reload(self):
+        """Reads all columns and element types from the engine."""
+        count = len(self.ids)
+        get_params = getattr(self._model, 'get{0}Params'.format(self._kind))
+        for param in self.params:
+            column = np.full(count, np.nan)
+            supported = self._model.paramSupported(self._objecttype, param)
+            if supported:
+                get_params(param, out=column)
+            self._columns[param.name] = column
+            self._loaded[param.name] = column.copy()
+            self._supported[param.name] = supported
+        if self._get_type is not None:
+            self.types = np.fromiter(
+                (self._get_type(index) for index in range(count)),
+                dtype=np.int8,
+                count=count)
+
+    def supported(self, param):
+        """
+        Whether the engine reads and writes a parameter.
+
+        :param param: Parameter enum member or name
+        :rtype: bool
+        """
+        return self._supported[self._name(param)]
+
+    def index(self, ID):
+        """
+        Row of an element.
+
+        :param str ID: Element ID
+        :rtype: int
+        """
+        if not self._model.ObjectIDexist(self._objecttype, ID):
+            raise PYSWMMException("ID Does not Exist")
+        return self._model.getObjectIDIndex(self._objecttype, ID)
+
+    def mask(self, element_type):
+        """
+        Rows of one element type.
+
+        :param element_type: NodeType or LinkType member (or code)
+        :return: Boolean array, one value per row
+        :rtype: numpy.ndarray
+        """
+        if self.types is None:
+            raise PYSWMMException("Elements have no types")
+        return self.types == getattr(element_type, 'value', element_type)
+
+    def changed(self):
+        """
+        Rows edited since the columns were loaded or committed.
+
+        :return: {column name: row indices}, for changed columns only
+        :rtype: dict
+        """
+        changes = {}
+        for name, column in self._columns.items():
+            loaded = self._loaded[name]
+            rows = np.flatnonzero(
+                (column != loaded) & ~(np.isnan(column) & np.isnan(loaded)))
+            if len(rows):
+                changes[name] = rows
+        return changes
+
+    def commit(self):
+        """
+        Writes the changed cells back to the engine.
+
+        :return: Number of cells written
+        :rtype: int
+        """
+        changes = self.changed()
+        for name in changes:
+            if not self._supported[name]:
+                raise PYSWMMException(
+                    "Parameter {0} is not supported by this engine".format(
+                        name))
+        set_params = getattr(self._model, 'set{0}Params'.format(self._kind))
+        written = 0
+        for name, rows in changes.items():
+            column = self._columns[name]
+            set_params(self.params[name], rows, column[rows])
+            self._loaded[name][rows] = column[rows]
+            written += len(rows)
+        return written
+
+
+class NetworkTable(object):
+    """
+    All node, link and subcatchment parameters of an open model, loaded
+    in one pass.
+
+    Element-by-element calibration through the object properties makes
+    one engine call (and one ID lookup) per value. The table reads every
+    NodeParams, LinkParams and SubcParams column once, lets the values be
+    edited as NumPy arrays, and writes back only the cells that changed.
+
+    :param object model: Open Simulation (or PySWMM) instance
+
+    Examples:
+
+    >>> from pyswmm import NetworkTable, Simulation
+    >>> from pyswmm.toolkitapi import NodeType
+    >>>
+    >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+    ...     table = NetworkTable(sim)
+    ...     storage = table.nodes.mask(NodeType.storage)
+    ...     table.nodes['fullDepth'][storage] *= 1.1
+    ...     table.links['offset1'][table.links.index('C3')] = 0.5
+    ...     table.commit()
+    ...     for step in sim:
+    ...         pass
+    """
+
+    def __init__(self, model):
+        model = getattr(model, '_model', model)
+        if not model.fileLoaded:
+            raise PYSWMMException("SWMM Model Not Open")
+        self.nodes = ElementTable(model, ObjectType.NODE, NodeParams, 'Node',
+                                  model.getNodeTypeByIndex)
+        self.links = ElementTable(model, ObjectType.LINK, LinkParams, 'Link',
+                                  model.getLinkTypeByIndex)
+        self.subcatchments = ElementTable(model, ObjectType.SUBCATCH,
+                                          SubcParams, 'Subcatch')
+
+    @property
+    def tables(self):
+        """The node, link and subcatchment tables."""
+        return (self.nodes, self.links, self.subcatchments)
+
+    def changed(self):
+        """
+        Number of edited cells not yet committed.
+
+        :rtype: int
+        """
+        return sum(
+            len(rows) for table in self.tables
+            for rows in table.changed().values())
+
+    def commit(self):
+        """
+        Writes the changed cells of all tables back to the engine.
+
+        :return: Number of cells written
+        :rtype: int
+        """
+        return sum(table.commit() for table in self.tables)
+
+    def reload(self):
+        """Reads all tables from the engine again, dropping edits."""
+        for table in self.tables:
+            table.reload()
@@ -19,6 +19,10 @@ class Nodes(object):
     """
     Node Iterator Methods.
 
+    Node objects are built and typed (Outfall, Storage) on first access,
+    and are shared by all Nodes of the open model. Iteration can be
+    repeated.
+
     :param object model: Open Model Instance
 
     Examples:
@@ -77,7 +81,7 @@ class Nodes(object):
         :rtype: int
 
         """
-        return self._model.getProjectSize(ObjectType.NODE.value)
+        return self._nNodes
 
     def __contains__(self, nodeid):
         """
@@ -89,24 +93,102 @@ class Nodes(object):
         return self._model.ObjectIDexist(ObjectType.NODE.value, nodeid)
 
     def __getitem__(self, nodeid):
-        if self.__contains__(nodeid):
-            nd = Node(self._model, nodeid)
-            _nd = nd
-            if nd.is_outfall():
-                _nd.__class__ = Outfall
-            elif nd.is_storage():
-                _nd.__class__ = Storage
-            return _nd
-
-        else:
+        if not self.__contains__(nodeid):
             raise PYSWMMException("Node ID Does not Exist")
+        return self._node(
+            self._model.getObjectIDIndex(ObjectType.NODE.value, nodeid))
+
+    def _handles(self):
+        """Node objects by index, shared by all Nodes of the open model."""
+        handles = self._model._elements.get(ObjectType.NODE.value)
+        if handles is None:
+            handles = [None] * self._nNodes
+            self._model._elements[ObjectType.NODE.value] = handles
+        return handles
+
+    def _node(self, index):
+        """Node object at index, built on first use."""
+        handles = self._handles()
+        node = handles[index]
+        if node is None:
+            nodeid = self._model.getObjectId(ObjectType.NODE.value, index)
+            node = Node(self._model, nodeid)
+            # Typed once, instead of type checks on every access
+            node.__class__ = _NODE_CLASSES.get(
+                self._model.getNodeTypeByIndex(index), Node)
+            handles[index] = node
+        return node
+
+    def indices(self, nodeids):
+        """
+        Resolve node IDs to node indices once, for use with get_results().
+
+        :param list nodeids: Node IDs
+        :return: Node Indices
+        :rtype: list
+        """
+        return self._model.getObjectIDIndices(ObjectType.NODE.value,
+                                              nodeids)
+
+    def get_results(self, result_type, indices=None, out=None):
+        """
+        Get one result for many nodes in a single call.
+
+        :param int result_type: Result (toolkitapi.NodeResults member variable)
+        :param list indices: Node indices (default None for all nodes)
+        :param out: Preallocated float64 array to fill (default None)
+        :return: Result Values in the order of indices
+        :rtype: numpy.ndarray
+
+        Examples:
+
+        >>> from pyswmm import Simulation, Nodes
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+        ...     nodes = Nodes(sim)
+        ...     for step in sim:
+        ...         values = nodes.get_results(NodeResults.newDepth)
+        """
+        return self._model.getNodeResults(result_type, indices, out)
+
+    def set_generated_inflows(self, indices, inflowrates):
+        """
+        Generate and Set the Inflow Rate of many nodes.
+
+        :param list indices: Node indices (see indices())
+        :param list inflowrates: Inflow rates, one per index
+
+        Examples:
+
+        >>> from pyswmm import Simulation, Nodes
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+        ...     nodes = Nodes(sim)
+        ...     inlets = nodes.indices(['J1', 'J2'])
+        ...     for step in sim:
+        ...         nodes.set_generated_inflows(inlets, [9, 4.5])
+        """
+        self._model.setNodeInflows(indices, inflowrates)
+
+    def set_outfall_stages(self, indices, stages):
+        """
+        Generate and Set the Stage (head) of many outfalls.
+
+        :param list indices: Outfall node indices (see indices())
+        :param list stages: Outfall stages, one per index
+        """
+        self._model.setOutfallStages(indices, stages)
 
     def __iter__(self):
-        return self
+        handles = self._handles()
+        if None in handles:
+            for index in range(self._nNodes):
+                self._node(index)
+        return iter(handles)
 
     def __next__(self):
         if self._cuindex < self._nNodes:
-            nodeobject = self.__getitem__(self._nodeid)
+            nodeobject = self._node(self._cuindex)
             self._cuindex += 1  # Next Iteration
             return nodeobject
         else:
@@ -114,11 +196,6 @@ class Nodes(object):
 
     next = __next__  # Python 2
 
-    @property
-    def _nodeid(self):
-        """Node ID."""
-        return self._model.getObjectId(ObjectType.NODE.value, self._cuindex)
-
 
 class Node(object):
     """
@@ -137,10 +214,12 @@ class Node(object):
     >>> 0.0
     """
 
+    __slots__ = ('_model', '_nodeid')
+
     def __init__(self, model, nodeid):
         if not model.fileLoaded:
             raise PYSWMMException("SWMM Model Not Open")
-        if nodeid not in model.getObjectIDList(ObjectType.NODE.value):
+        if not model.ObjectIDexist(ObjectType.NODE.value, nodeid):
             raise PYSWMMException("ID Not valid")
         self._model = model
         self._nodeid = nodeid
@@ -900,6 +979,8 @@ class Outfall(Node):
     Outfall Object: Subclass of Node Object.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super(Outfall, self).__init__()
 
@@ -968,6 +1049,8 @@ class Storage(Node):
     Storage Object: Subclass of Node Object.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super(Storage, self).__init__()
 
@@ -997,3 +1080,10 @@ class Storage(Node):
         :rtype: list
         """
         return self._model.storage_statistics(self.nodeid)
+
+
+# Classes of the element types with their own methods
+_NODE_CLASSES = {
+    NodeType.outfall.value: Outfall,
+    NodeType.storage.value: Storage
+}
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Memory-mapped reader for SWMM5 binary output files."""
+
+# Standard library imports
+from datetime import datetime, timedelta
+from enum import Enum
+import os
+
+# Third party imports
+import numpy as np
+import six
+
+# Local imports
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.toolkitapi import (SMO_elementType, SMO_linkAttribute,
+                               SMO_nodeAttribute, SMO_subcatchAttribute,
+                               SMO_systemAttribute)
+
+RECORDSIZE = 4
+EPILOGUE_SIZE = 6 * RECORDSIZE
+
+# SWMM DateTime values count days from this date
+SWMM_EPOCH = datetime(1899, 12, 30)
+
+FLOW_UNITS = ['CFS', 'GPM', 'MGD', 'CMS', 'LPS', 'MLD']
+
+# Element type: results field of a period record
+_RESULT_FIELDS = {
+    SMO_elementType.SM_subcatch.value: 'subcatch',
+    SMO_elementType.SM_node.value: 'node',
+    SMO_elementType.SM_link.value: 'link',
+    SMO_elementType.SM_sys.value: 'system',
+}
+
+# Element type: enum naming its reported variables
+_VARIABLE_ENUMS = {
+    SMO_elementType.SM_subcatch.value: SMO_subcatchAttribute,
+    SMO_elementType.SM_node.value: SMO_nodeAttribute,
+    SMO_elementType.SM_link.value: SMO_linkAttribute,
+    SMO_elementType.SM_sys.value: SMO_systemAttribute,
+}
+
+# Element type: variable holding the first pollutant concentration
+_POLLUTANT_OFFSETS = {
+    SMO_elementType.SM_subcatch.value:
+    SMO_subcatchAttribute.pollutant_conc_subcatch.value,
+    SMO_elementType.SM_node.value:
+    SMO_nodeAttribute.pollutant_conc_node.value,
+    SMO_elementType.SM_link.value:
+    SMO_linkAttribute.pollutant_conc_link.value,
+}
+
+
+def swmm_to_datetime64(days):
+    """
+    Converts SWMM DateTime values to numpy datetimes.
+
+    :param days: SWMM DateTime values (days since SWMM_EPOCH)
+    :return: Times rounded to the second
+    :rtype: numpy.ndarray of datetime64[s]
+    """
+    seconds = np.round(np.asarray(days) * 86400.0).astype('timedelta64[s]')
+    return np.datetime64(SWMM_EPOCH, 's') + seconds
+
+
+def _enum_value(value):
+    """Returns the int code of an enum member or int."""
+    if isinstance(value, Enum):
+        return value.value
+    return int(value)
+
+
+class OutputMap(object):
+    """
+    Memory-mapped view of a SWMM5 binary output file.
+
+    The header, ID and variable sections are parsed once. The results
+    block is mapped as a structured array with one record per reporting
+    period, so slicing an element, variable or time range returns a
+    strided view into the file rather than a copy. Files larger than
+    memory are paged in on access.
+
+    Views returned by the map keep the file mapped until they are
+    released.
+
+    :param str binfile: Path to the SWMM5 binary output file
+
+    Examples:
+
+    >>> from pyswmm.output import OutputMap
+    >>> from pyswmm.toolkitapi import SMO_elementType, SMO_nodeAttribute
+    >>>
+    >>> with OutputMap('model.out') as out:
+    ...     depth = out.series(SMO_elementType.SM_node, 'J1',
+    ...                        SMO_nodeAttribute.invert_depth)
+    ...     peak = depth.max()
+    """
+
+    def __init__(self, binfile):
+        self.binfile = binfile
+        with open(binfile, 'rb') as f:
+            self._read_header(f)
+        self.results = np.memmap(
+            binfile,
+            dtype=self._record_dtype(),
+            mode='r',
+            offset=self._results_pos,
+            shape=(self.num_periods, ))
+        self._index = dict(
+            (element_type, dict((ID, ind) for ind, ID in enumerate(IDs)))
+            for element_type, IDs in (
+                (SMO_elementType.SM_subcatch.value, self.subcatchments),
+                (SMO_elementType.SM_node.value, self.nodes),
+                (SMO_elementType.SM_link.value, self.links)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a):
+        self.close()
+
+    def close(self):
+        """Drops the map's reference to the results block."""
+        self.results = None
+
+    def _read_ints(self, f, count):
+        """Reads count 4 byte integers."""
+        return np.fromfile(f, dtype='<i4', count=count).tolist()
+
+    def _read_header(self, f):
+        """Parses the epilogue, opening, ID and variable sections."""
+        f.seek(-EPILOGUE_SIZE, os.SEEK_END)
+        (id_pos, prop_pos, self._results_pos, self.num_periods, errcode,
+         magic2) = self._read_ints(f, 6)
+        f.seek(0)
+        magic1, self.version, flow_units, n_subcatch, n_nodes, n_links, \
+            n_polluts = self._read_ints(f, 7)
+
+        if magic1 != magic2:
+            raise PYSWMMException("Not a SWMM binary output file")
+        if errcode != 0:
+            raise PYSWMMException("Run terminated; no results in binary file")
+        if self.num_periods <= 0:
+            raise PYSWMMException("No results in binary file")
+        self.flow_units = FLOW_UNITS[flow_units]
+
+        f.seek(id_pos)
+        names = []
+        for _ in range(n_subcatch + n_nodes + n_links + n_polluts):
+            length = self._read_ints(f, 1)[0]
+            names.append(f.read(length).decode('utf-8'))
+        self.subcatchments = names[:n_subcatch]
+        self.nodes = names[n_subcatch:n_subcatch + n_nodes]
+        self.links = names[n_subcatch + n_nodes:n_subcatch + n_nodes +
+                           n_links]
+        self.pollutants = names[n_subcatch + n_nodes + n_links:]
+
+        # Saved input properties: count, codes, then values per element
+        f.seek(prop_pos)
+        for n_elements in (n_subcatch, n_nodes, n_links):
+            n_props = self._read_ints(f, 1)[0]
+            f.seek(RECORDSIZE * n_props * (1 + n_elements), os.SEEK_CUR)
+
+        # Reported variables: count then codes, per element type
+        counts = []
+        for _ in range(4):
+            n_vars = self._read_ints(f, 1)[0]
+            f.seek(RECORDSIZE * n_vars, os.SEEK_CUR)
+            counts.append(n_vars)
+        (self.subcatch_vars, self.node_vars, self.link_vars,
+         self.system_vars) = counts
+
+        f.seek(self._results_pos - 3 * RECORDSIZE)
+        start = np.fromfile(f, dtype='<f8', count=1)[0]
+        self.report_step = self._read_ints(f, 1)[0]
+        self.start_time = SWMM_EPOCH + timedelta(
+            seconds=round(float(start) * 86400.0))
+
+    def _record_dtype(self):
+        """Layout of one reporting period in the results block."""
+        return np.dtype([
+            ('time', '<f8'),
+            ('subcatch', '<f4', (len(self.subcatchments),
+                                 self.subcatch_vars)),
+            ('node', '<f4', (len(self.nodes), self.node_vars)),
+            ('link', '<f4', (len(self.links), self.link_vars)),
+            ('system', '<f4', (self.system_vars, )),
+        ])
+
+    @property
+    def times(self):
+        """
+        Reporting times stored in the results block.
+
+        :return: Reporting period times
+        :rtype: numpy.ndarray of datetime64[s]
+        """
+        return swmm_to_datetime64(self.results['time'])
+
+    def element_results(self, element_type):
+        """
+        All results of one element type.
+
+        :param element_type: SMO_elementType member or code
+        :return: View shaped (periods, elements, variables), or
+                 (periods, variables) for the system
+        :rtype: numpy.ndarray
+        """
+        element_type = _enum_value(element_type)
+        try:
+            return self.results[_RESULT_FIELDS[element_type]]
+        except KeyError:
+            raise PYSWMMException(
+                "SMO_elementType: {} Outside Valid Types".format(
+                    element_type))
+
+    def element_ids(self, element_type):
+        """
+        Element IDs in output order.
+
+        :param element_type: SMO_elementType member or code
+        :return: IDs (empty for the system)
+        :rtype: list
+        """
+        element_type = _enum_value(element_type)
+        return list(self._index.get(element_type, ()))
+
+    def variable_names(self, element_type):
+        """
+        Names of the reported variables of an element type.
+
+        Base variables are named after their attribute enum member and
+        pollutant concentrations after the pollutant ID. Variables without
+        an enum member are named variable_<index>.
+
+        :param element_type: SMO_elementType member or code
+        :return: Names in variable order
+        :rtype: list
+        """
+        element_type = _enum_value(element_type)
+        n_vars = self.element_results(element_type).shape[-1]
+        names = [member.name for member in _VARIABLE_ENUMS[element_type]]
+        if element_type in _POLLUTANT_OFFSETS:
+            names = (names[:_POLLUTANT_OFFSETS[element_type]] +
+                     self.pollutants)
+        names += [
+            'variable_{0}'.format(ind) for ind in range(len(names), n_vars)
+        ]
+        return names[:n_vars]
+
+    def element_index(self, element_type, ID):
+        """
+        Position of an element in the results.
+
+        :param element_type: SMO_elementType member or code
+        :param str ID: Element ID
+        :return: Element index
+        :rtype: int
+        """
+        try:
+            return self._index[_enum_value(element_type)][ID]
+        except KeyError:
+            raise PYSWMMException("ID '{0}' not found in output".format(ID))
+
+    def series(self, element_type, ID, attribute, start=0, end=None):
+        """
+        Time series of one variable of one element.
+
+        :param element_type: SMO_elementType member or code
+        :param str ID: Element ID (None for system variables)
+        :param attribute: Attribute enum member or code
+        :param int start: First reporting period (default 0)
+        :param int end: Reporting period after the last one (default None
+                        for the end of the run)
+        :return: Strided view of the series
+        :rtype: numpy.ndarray
+        """
+        values = self.element_results(element_type)[start:end]
+        if _enum_value(element_type) == SMO_elementType.SM_sys.value:
+            return values[:, _enum_value(attribute)]
+        index = self.element_index(element_type, ID)
+        return values[:, index, _enum_value(attribute)]
+
+    def attribute(self, element_type, attribute, period):
+        """
+        One variable of every element at a reporting period.
+
+        :param element_type: SMO_elementType member or code
+        :param attribute: Attribute enum member or code
+        :param int period: Reporting period index
+        :return: View ordered like the element ID list
+        :rtype: numpy.ndarray
+        """
+        values = self.element_results(element_type)[period]
+        if _enum_value(element_type) == SMO_elementType.SM_sys.value:
+            return values[_enum_value(attribute):_enum_value(attribute) + 1]
+        return values[:, _enum_value(attribute)]
+
+    def result(self, element_type, period, ID=None):
+        """
+        Every variable of one element at a reporting period.
+
+        :param element_type: SMO_elementType member or code
+        :param int period: Reporting period index
+        :param str ID: Element ID (None for system variables)
+        :return: View of the element's variables
+        :rtype: numpy.ndarray
+        """
+        values = self.element_results(element_type)[period]
+        if _enum_value(element_type) == SMO_elementType.SM_sys.value:
+            return values
+        return values[self.element_index(element_type, ID)]
+
+    def variable_index(self, element_type, attribute, pollutant=None):
+        """
+        Column of a reported variable in an element's results.
+
+        Pollutant concentrations follow the base variables, one per
+        pollutant. Pass the pollutant ID or index to select one; the
+        attribute is then ignored.
+
+        :param element_type: SMO_elementType member or code
+        :param attribute: Attribute enum member or code
+        :param pollutant: Pollutant ID or index (default None)
+        :return: Variable index
+        :rtype: int
+        """
+        element_type = _enum_value(element_type)
+        if pollutant is None:
+            index = _enum_value(attribute)
+        elif element_type not in _POLLUTANT_OFFSETS:
+            raise PYSWMMException("System results have no pollutants")
+        else:
+            if isinstance(pollutant, six.string_types):
+                found = pollutant in self.pollutants
+                if found:
+                    pollutant = self.pollutants.index(pollutant)
+            else:
+                found = 0 <= pollutant < len(self.pollutants)
+            if not found:
+                raise PYSWMMException(
+                    "Pollutant '{0}' not found in output".format(pollutant))
+            index = _POLLUTANT_OFFSETS[element_type] + pollutant
+
+        n_vars = self.element_results(element_type).shape[-1]
+        if not 0 <= index < n_vars:
+            raise PYSWMMException(
+                "Attribute {0} outside the {1} reported variables".format(
+                    index, n_vars))
+        return index
+
+    def matrix(self, element_type, attribute, time_slice=None, IDs=None,
+               pollutant=None):
+        """
+        One variable for many elements over many periods.
+
+        The periods are read in file order in a single pass, and the
+        values are copied into a new array.
+
+        :param element_type: SMO_elementType member or code
+        :param attribute: Attribute enum member or code
+        :param slice time_slice: Reporting periods (default None for all)
+        :param list IDs: Element IDs (default None for all, in output
+                         order; ignored for system variables)
+        :param pollutant: Pollutant ID or index (default None)
+        :return: Array shaped (periods, elements); one column for system
+                 variables
+        :rtype: numpy.ndarray
+        """
+        if time_slice is None:
+            time_slice = slice(None)
+        column = self.variable_index(element_type, attribute, pollutant)
+        values = self.element_results(element_type)[time_slice]
+        if _enum_value(element_type) == SMO_elementType.SM_sys.value:
+            return np.array(values[:, column:column + 1])
+        if IDs is None:
+            return np.array(values[:, :, column])
+        indices = [self.element_index(element_type, ID) for ID in IDs]
+        return values[:, indices, column]
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""
+Export SWMM5 binary output to Parquet or HDF5.
+
+The results block is streamed a block of reporting periods at a time, so
+memory use depends on the chunk size and not on the size of the file.
+Each element type is written to its own file, which lets element types be
+exported in parallel.
+
+Run from the command line with::
+
+    python -m pyswmm.output.export model.out outdir --format hdf5
+"""
+
+# Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+
+# Third party imports
+import numpy as np
+
+# Local imports
+from pyswmm.output import OutputMap, swmm_to_datetime64, _RESULT_FIELDS
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.toolkitapi import SMO_elementType
+
+FORMATS = {
+    'parquet': ('.parquet', 'snappy'),
+    'hdf5': ('.h5', 'gzip'),
+}
+
+# Element name (as in the output file names): element type code
+ELEMENT_TYPES = dict((name, code) for code, name in _RESULT_FIELDS.items())
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise PYSWMMException("Parquet export requires pyarrow")
+    return pyarrow
+
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError:
+        raise PYSWMMException("HDF5 export requires h5py")
+    return h5py
+
+
+def _blocks(out, element_type, chunk_periods):
+    """Yields (times, values) copies of consecutive period blocks."""
+    results = out.element_results(element_type)
+    for start in range(0, out.num_periods, chunk_periods):
+        stop = min(start + chunk_periods, out.num_periods)
+        times = swmm_to_datetime64(out.results['time'][start:stop])
+        yield times, np.array(results[start:stop])
+
+
+def _write_parquet(out, element_type, path, chunk_periods, compression):
+    """
+    Writes a long table with one row per period and element.
+
+    Columns are time, element (dictionary encoded with the output's
+    element IDs; absent for the system) and one column per variable. Each
+    period block becomes a row group.
+    """
+    pa = _import_pyarrow()
+    ids = out.element_ids(element_type)
+    names = out.variable_names(element_type)
+
+    fields = [pa.field('time', pa.timestamp('s'))]
+    if ids:
+        fields.append(pa.field('element', pa.dictionary(pa.int32(),
+                                                        pa.string())))
+    fields += [pa.field(name, pa.float32()) for name in names]
+    schema = pa.schema(fields)
+    dictionary = pa.array(ids, type=pa.string())
+
+    with pa.parquet.ParquetWriter(
+            path, schema, compression=compression) as writer:
+        for times, values in _blocks(out, element_type, chunk_periods):
+            n_periods = len(times)
+            if ids:
+                columns = [pa.array(np.repeat(times, len(ids)))]
+                indices = np.tile(np.arange(len(ids), dtype=np.int32),
+                                  n_periods)
+                columns.append(
+                    pa.DictionaryArray.from_arrays(indices, dictionary))
+                values = values.reshape(n_periods * len(ids), len(names))
+            else:
+                columns = [pa.array(times)]
+            columns += [pa.array(values[:, ind]) for ind in range(len(names))]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+
+def _write_hdf5(out, element_type, path, chunk_periods, compression):
+    """
+    Writes time, ids, variables and a chunked values dataset.
+
+    values is shaped (periods, elements, variables), or (periods,
+    variables) for the system, and is chunked by period block.
+    """
+    h5py = _import_h5py()
+    ids = out.element_ids(element_type)
+    names = out.variable_names(element_type)
+    results = out.element_results(element_type)
+    chunks = (min(chunk_periods, out.num_periods), ) + results.shape[1:]
+    if not all(chunks):
+        # Empty element type: HDF5 cannot chunk or compress it
+        chunks = compression = None
+
+    with h5py.File(path, 'w') as f:
+        f.attrs['flow_units'] = out.flow_units
+        f.attrs['report_step'] = out.report_step
+        f.create_dataset('ids', data=ids, dtype=h5py.string_dtype())
+        f.create_dataset('variables', data=names, dtype=h5py.string_dtype())
+        time = f.create_dataset('time', shape=(out.num_periods, ),
+                                dtype='<i8')
+        time.attrs['units'] = 'seconds since 1970-01-01'
+        dataset = f.create_dataset(
+            'values',
+            shape=results.shape,
+            dtype='<f4',
+            chunks=chunks,
+            compression=compression)
+        start = 0
+        for times, values in _blocks(out, element_type, chunk_periods):
+            stop = start + len(times)
+            time[start:stop] = times.astype('<i8')
+            dataset[start:stop] = values
+            start = stop
+
+
+_WRITERS = {
+    'parquet': _write_parquet,
+    'hdf5': _write_hdf5,
+}
+
+
+def export(binfile,
+           dest,
+           format='parquet',
+           element_types=None,
+           chunk_periods=1024,
+           compression=None,
+           workers=1):
+    """
+    Exports the results of a SWMM5 binary output file.
+
+    Writes one file per element type to dest, named
+    <output file stem>_<element>.parquet or .h5.
+
+    :param str binfile: SWMM5 binary output file
+    :param str dest: Destination directory (created if needed)
+    :param str format: 'parquet' or 'hdf5' (default 'parquet')
+    :param list element_types: SMO_elementType members, codes or names
+                               ('subcatch', 'node', 'link', 'system')
+                               (default None for all)
+    :param int chunk_periods: Reporting periods per block (default 1024)
+    :param str compression: Codec (default snappy for Parquet, gzip for
+                            HDF5)
+    :param int workers: Element types exported in parallel (default 1)
+    :return: Written file path by element name
+    :rtype: dict
+
+    Examples:
+
+    >>> from pyswmm.output.export import export
+    >>> export('model.out', 'results', format='hdf5', workers=4)
+    {'subcatch': 'results/model_subcatch.h5', ...}
+    """
+    if format not in FORMATS:
+        raise PYSWMMException("Unknown export format '{0}'".format(format))
+    if chunk_periods < 1:
+        raise PYSWMMException("chunk_periods must be positive")
+    extension, default_compression = FORMATS[format]
+    if compression is None:
+        compression = default_compression
+
+    if element_types is None:
+        element_types = sorted(_RESULT_FIELDS)
+    codes = []
+    for element_type in element_types:
+        if element_type in ELEMENT_TYPES:
+            element_type = ELEMENT_TYPES[element_type]
+        elif isinstance(element_type, SMO_elementType):
+            element_type = element_type.value
+        if element_type not in _RESULT_FIELDS:
+            raise PYSWMMException(
+                "SMO_elementType: {} Outside Valid Types".format(
+                    element_type))
+        codes.append(element_type)
+
+    if not os.path.isdir(dest):
+        os.makedirs(dest)
+    stem = os.path.splitext(os.path.basename(binfile))[0]
+    paths = dict((_RESULT_FIELDS[code],
+                  os.path.join(dest, '{0}_{1}{2}'.format(
+                      stem, _RESULT_FIELDS[code], extension)))
+                 for code in codes)
+
+    writer = _WRITERS[format]
+    with OutputMap(binfile) as out:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [
+                executor.submit(writer, out, code,
+                                paths[_RESULT_FIELDS[code]], chunk_periods,
+                                compression) for code in codes
+            ]
+            for future in futures:
+                future.result()
+    return paths
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog='python -m pyswmm.output.export',
+        description='Export SWMM5 binary output to Parquet or HDF5.')
+    parser.add_argument('binfile', help='SWMM5 binary output file')
+    parser.add_argument('dest', help='destination directory')
+    parser.add_argument('--format', choices=sorted(FORMATS),
+                        default='parquet')
+    parser.add_argument('--elements', nargs='+',
+                        choices=sorted(ELEMENT_TYPES),
+                        help='element types to export (default all)')
+    parser.add_argument('--chunk-periods', type=int, default=1024,
+                        help='reporting periods per block (default 1024)')
+    parser.add_argument('--compression',
+                        help='codec (default snappy / gzip)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='element types exported in parallel')
+    args = parser.parse_args(argv)
+
+    paths = export(args.binfile, args.dest, args.format, args.elements,
+                   args.chunk_periods, args.compression, args.workers)
+    for element in sorted(paths):
+        print(paths[element])
+
+
+if __name__ == '__main__':
+    main()
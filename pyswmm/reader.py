@@ -12,9 +12,17 @@ from datetime import datetime, timedelta
 import ctypes
 import os
 
+# Third party imports
+import numpy as np
+import six
+
 # Local imports
+from pyswmm.lib import LIB_OUTPUT
+from pyswmm.output import OutputMap
 import pyswmm.toolkitapi as tka
 
+_c_float_p = ctypes.POINTER(ctypes.c_float)
+
 
 class OutReaderNotImplementedYet(Exception):
     """ """
@@ -26,35 +34,57 @@ class OutReaderNotImplementedYet(Exception):
         return self.error_message
 
 
-class _Opaque(ctypes.Structure):
-    """Used soley for passing the pointer to the smoapu struct to API."""
-    pass
+def _api_error(errcode):
+    """Raises an exception for a nonzero output API error code."""
+    if errcode != 0:
+        error_msg = "API ErrNo {0}:{1}".format(
+            errcode, tka.DLLErrorKeys.get(errcode, 'Unknown error'))
+        raise Exception(error_msg)
+
+
+def _load_output_library(lib_path):
+    """
+    Loads the output API library and declares its function prototypes.
+
+    :param str lib_path: Output API library path
+    :return: Loaded library
+    """
+    libobj = ctypes.CDLL(lib_path)
+    for name, (restype, argtypes) in six.iteritems(tka.SMO_PROTOTYPES):
+        func = getattr(libobj, name)
+        func.restype = restype
+        func.argtypes = argtypes
+    return libobj
 
 
 class SWMMBinReader(object):
-    """Instantiate python Wrapper Object and build Wrapper functions."""
-    raise OutReaderNotImplementedYet("Output Reader has not been implemented")
+    """
+    Instantiate python Wrapper Object and build Wrapper functions.
 
-    def __init__(self):
-        """Instantiate python Wrapper Object and build Wrapper functions."""
+    Series, attribute and result getters fill float32 numpy arrays that the
+    reader allocates, so values are never copied into Python floats. Pass
+    as_list=True to get plain lists instead.
 
-        def get_pkgpath():
-            import toolkitapi as tkp
-            return os.path.dirname(tkp.__file__.replace('\\', '/'))
+    :param bool as_list: Return lists rather than numpy arrays
+                         (default False)
+    :param str output_lib_path: Output API library path (default
+                                pyswmm.lib.LIB_OUTPUT, built from src/)
+    """
+
+    def __init__(self, as_list=False, output_lib_path=None):
+        """Instantiate python Wrapper Object and build Wrapper functions."""
+        self.as_list = as_list
+        if not output_lib_path:
+            output_lib_path = LIB_OUTPUT
 
         try:
-            # Later Check for OS Type
-            dllname = 'outputAPI_winx86.dll'
-            # when platform detection is enabled, dllname can be changed
-            dllLoc = get_pkgpath() + '/lib/windows/' + dllname
-            self.swmmdll = ctypes.CDLL(dllLoc)
+            self.swmmdll = _load_output_library(output_lib_path)
         except Exception:
             raise (Exception('Failed to Open Linked Library'))
 
         # Initializing DLL Function List
         # Initialize Pointer to smoapi
         self._initsmoapi = self.swmmdll.SMO_init
-        self._initsmoapi.restype = ctypes.POINTER(_Opaque)
 
         # Open File Function Handle
         self._openBinFile = self.swmmdll.SMO_open
@@ -88,27 +118,8 @@ class SWMMBinReader(object):
         self._getLinkResult = self.swmmdll.SMO_getLinkResult
         self._getSystemResult = self.swmmdll.SMO_getSystemResult
 
-        # Array Builder
+        # Array Builder (only used to size result arrays)
         self._newOutValueArray = self.swmmdll.SMO_newOutValueArray
-        self._newOutValueArray.argtypes = [
-            ctypes.POINTER(_Opaque),
-            ctypes.c_int,
-            ctypes.c_int,
-            ctypes.POINTER(ctypes.c_int),
-            ctypes.POINTER(ctypes.c_int),
-        ]
-        self._newOutValueArray.restype = ctypes.POINTER(ctypes.c_float)
-
-        # Series Builder
-        self._newOutValueSeries = self.swmmdll.SMO_newOutValueSeries
-        self._newOutValueSeries.argtypes = [
-            ctypes.POINTER(_Opaque),
-            ctypes.c_int,
-            ctypes.c_int,
-            ctypes.POINTER(ctypes.c_int),
-            ctypes.POINTER(ctypes.c_int),
-        ]
-        self._newOutValueSeries.restype = ctypes.POINTER(ctypes.c_float)
 
         # SWMM Date num 2 String
         self.SWMMdateToStr = self.swmmdll.datetime_dateToStr
@@ -116,6 +127,39 @@ class SWMMBinReader(object):
         # SWMM Time num 2 String
         self.SWMMtimeToStr = self.swmmdll.datetime_timeToStr
 
+        # Number of result variables per element type
+        self._result_lengths = {}
+
+    def _new_values(self, length):
+        """
+        Allocates a float32 array and a pointer the output API can fill.
+
+        :param int length: Number of values
+        :return: (array, float pointer into the array)
+        :rtype: tuple
+        """
+        values = np.zeros(length, dtype=np.float32)
+        return values, values.ctypes.data_as(_c_float_p)
+
+    def _values(self, values):
+        """Returns the filled array, or a list if as_list is set."""
+        if self.as_list:
+            return values.tolist()
+        return values
+
+    def _result_length(self, element_type):
+        """Number of result variables written by the get_Result calls."""
+        if element_type not in self._result_lengths:
+            length = ctypes.c_long()
+            ErrNo1 = ctypes.c_int()
+            ValArrayPtr = self._newOutValueArray(
+                self.smoapi, tka.SMO_apiFunction.getResult.value,
+                element_type, ctypes.byref(length), ctypes.byref(ErrNo1))
+            self._free(ValArrayPtr)
+            _api_error(ErrNo1.value)
+            self._result_lengths[element_type] = length.value
+        return self._result_lengths[element_type]
+
     def OpenBinFile(self, OutLoc):
         """
         Opens SWMM5 binary output file.
@@ -130,11 +174,10 @@ class SWMMBinReader(object):
         >>> OutputFile.OpenBinFile("outputfile.out")
         """
         self.smoapi = self._initsmoapi()
-        ErrNo = self._openBinFile(self.smoapi, OutLoc)
-        if ErrNo != 0:
-            error_msg = "API ErrNo {0}:{1}".format(ErrNo,
-                                                   tka.DLLErrorKeys[ErrNo])
-            raise Exception(error_msg)
+        self._result_lengths = {}
+        self._binfile = OutLoc
+        self._output_map = None
+        _api_error(self._openBinFile(self.smoapi, six.b(OutLoc)))
 
     def CloseBinFile(self):
         """
@@ -149,6 +192,9 @@ class SWMMBinReader(object):
         >>> OutputFile.CloseBinFile()
         """
         ErrNo = self._close(self.smoapi)
+        if self._output_map is not None:
+            self._output_map.close()
+            self._output_map = None
 
         if hasattr(self, 'SubcatchmentIDs'):
             delattr(self, 'SubcatchmentIDs')
@@ -159,10 +205,7 @@ class SWMMBinReader(object):
         if hasattr(self, 'PollutantIDs'):
             delattr(self, 'PollutantIDs')
 
-        if ErrNo != 0:
-            error_msg = "API ErrNo {0}:{1}".format(
-                ErrNo.value, tka.DLLErrorKeys[ErrNo.value])
-            raise Exception(error_msg)
+        _api_error(ErrNo)
 
     def _get_SubcatchIDs(self):
         """Generates member Element IDs dictionary for Subcatchments."""
@@ -175,13 +218,10 @@ class SWMMBinReader(object):
                 self.smoapi,
                 tka.SMO_elementType.SM_subcatch.value,
                 i,
-                ctypes.byref(NAME),
+                NAME,
                 ctypes.byref(LEN), )
-            if ErrNo1 != 0:
-                error_msg = "API ErrNo {0}:{1}".format(
-                    ErrNo1.value, tka.DLLErrorKeys[ErrNo1.value])
-                raise Exception(error_msg)
-            self.SubcatchmentIDs[str(NAME.value)] = i
+            _api_error(ErrNo1)
+            self.SubcatchmentIDs[NAME.value.decode("utf-8")] = i
 
     def _get_NodeIDs(self):
         """Generates member Element IDs dictionary for Nodes."""
@@ -194,13 +234,10 @@ class SWMMBinReader(object):
                 self.smoapi,
                 tka.SMO_elementType.SM_node.value,
                 i,
-                ctypes.byref(NAME),
+                NAME,
                 ctypes.byref(LEN), )
-            if ErrNo1 != 0:
-                error_msg = "API ErrNo {0}:{1}".format(
-                    ErrNo1.value, tka.DLLErrorKeys[ErrNo1.value])
-                raise Exception(error_msg)
-            self.NodeIDs[str(NAME.value)] = i
+            _api_error(ErrNo1)
+            self.NodeIDs[NAME.value.decode("utf-8")] = i
 
     def _get_LinkIDs(self):
         """Generates member Element IDs dictionary for Links."""
@@ -213,13 +250,10 @@ class SWMMBinReader(object):
                 self.smoapi,
                 tka.SMO_elementType.SM_link.value,
                 i,
-                ctypes.byref(NAME),
+                NAME,
                 ctypes.byref(LEN), )
-            if ErrNo1 != 0:
-                error_msg = "API ErrNo {0}:{1}".format(
-                    ErrNo1.value, tka.DLLErrorKeys[ErrNo1.value])
-                raise Exception(error_msg)
-            self.LinkIDs[str(NAME.value)] = i
+            _api_error(ErrNo1)
+            self.LinkIDs[NAME.value.decode("utf-8")] = i
 
     def _get_PollutantIDs(self):
         """Generates member Element IDs dictionary for Pollutants."""
@@ -232,13 +266,10 @@ class SWMMBinReader(object):
                 self.smoapi,
                 tka.SMO_elementType.SM_sys.value,
                 i,
-                ctypes.byref(NAME),
+                NAME,
                 ctypes.byref(LEN), )
-            if ErrNo1 != 0:
-                error_msg = "API ErrNo {0}:{1}".format(
-                    ErrNo1.value, tka.DLLErrorKeys[ErrNo1.value])
-                raise Exception(error_msg)
-            self.PollutantIDs[str(NAME.value)] = i
+            _api_error(ErrNo1)
+            self.PollutantIDs[NAME.value.decode("utf-8")] = i
 
     def get_IDs(self, SMO_elementIDType):
         """
@@ -318,10 +349,7 @@ class SWMMBinReader(object):
 
         x = ctypes.c_int()
         ErrNo1 = self._getUnits(self.smoapi, unit, ctypes.byref(x))
-        if ErrNo1 != 0:
-            error_msg = "API ErrNo {0}:{1}".format(ErrNo1,
-                                                   tka.DLLErrorKeys[ErrNo1])
-            raise Exception(error_msg)
+        _api_error(ErrNo1)
         if unit == tka.SMO_unit.flow_rate.value:
             return FlowUnitsType[x.value]
         elif unit == tka.SMO_unit.concentration.value:
@@ -349,20 +377,14 @@ class SWMMBinReader(object):
         timeElement = ctypes.c_int()
         ErrNo1 = self._getTimes(self.smoapi, SMO_timeElementType,
                                 ctypes.byref(timeElement))
-        if ErrNo1 != 0:
-            error_msg = "API ErrNo {0}:{1}".format(ErrNo1,
-                                                   tka.DLLErrorKeys[ErrNo1])
-            raise Exception(error_msg)
+        _api_error(ErrNo1)
         return timeElement.value
 
     def _get_StartTimeSWMM(self):
         """Returns the simulation start datetime as double."""
         StartTime = ctypes.c_double()
         ErrNo1 = self._getStartTime(self.smoapi, ctypes.byref(StartTime))
-        if ErrNo1 != 0:
-            error_msg = "API ErrNo {0}:{1}".format(ErrNo1,
-                                                   tka.DLLErrorKeys[ErrNo1])
-            raise Exception(error_msg)
+        _api_error(ErrNo1)
         return StartTime.value
 
     def get_StartTime(self):
@@ -387,13 +409,13 @@ class SWMMBinReader(object):
 
         # Pull Date String
         DateStr = ctypes.create_string_buffer(50)
-        self.SWMMdateToStr(ctypes.c_double(_date), ctypes.byref(DateStr))
-        DATE = DateStr.value
+        self.SWMMdateToStr(_date, DateStr)
+        DATE = DateStr.value.decode("utf-8")
 
         # Pull Time String
         TimeStr = ctypes.create_string_buffer(50)
-        self.SWMMtimeToStr(ctypes.c_double(_time), ctypes.byref(TimeStr))
-        TIME = TimeStr.value
+        self.SWMMtimeToStr(_time, TimeStr)
+        TIME = TimeStr.value.decode("utf-8")
         DTime = datetime.strptime(DATE + ' ' + TIME, '%Y-%b-%d %H:%M:%S')
         return DTime
 
@@ -438,10 +460,7 @@ class SWMMBinReader(object):
         numel = ctypes.c_int()
         ErrNo1 = self._getProjectSize(self.smoapi, SMO_elementCount,
                                       ctypes.byref(numel))
-        if ErrNo1 != 0:
-            error_msg = "API ErrNo {0}:{1}".format(ErrNo1,
-                                                   tka.DLLErrorKeys[ErrNo1])
-            raise Exception(error_msg)
+        _api_error(ErrNo1)
         return numel.value
 
     def get_Series(self,
@@ -466,7 +485,7 @@ class SWMMBinReader(object):
                                (defualt is -1 for end).
 
         :return: data series
-        :rtype: list
+        :rtype: numpy.ndarray (list if as_list is set)
 
         Examples:
 
@@ -488,60 +507,46 @@ class SWMMBinReader(object):
         >>> [0.017500000074505806, 0.017500000074505806, 0.017500000074505806,
              0.017500000074505806, ..., 0.017500000074505806]
         """
-        if TimeEndInd > self.get_Times(tka.SMO_time.numPeriods.value):
+        num_periods = self.get_Times(tka.SMO_time.numPeriods.value)
+        if TimeEndInd > num_periods:
             raise Exception("Outside Number of TimeSteps")
         elif TimeEndInd == -1:
-            TimeEndInd = 1
-            TimeEndInd += self.get_Times(tka.SMO_time.numPeriods.value)
-            -TimeEndInd
-
-        sLength = ctypes.c_int()
-        ErrNo1 = ctypes.c_int()
-        SeriesPtr = self._newOutValueSeries(self.smoapi, TimeStartInd,
-                                            TimeEndInd,
-                                            ctypes.byref(sLength),
-                                            ctypes.byref(ErrNo1))
-        if ErrNo1.value != 0:
-            error_msg = "API ErrNo {0}:{1}".format(
-                ErrNo1.value, tka.DLLErrorKeys[ErrNo1.value])
-            raise Exception(error_msg)
+            TimeEndInd = num_periods
+        if TimeStartInd < 0 or TimeStartInd > TimeEndInd:
+            raise Exception("Outside Number of TimeSteps")
+
+        sLength = TimeEndInd - TimeStartInd
+        values, SeriesPtr = self._new_values(sLength)
 
         if element_type == tka.SMO_elementType.SM_subcatch.value:
             if not hasattr(self, 'SubcatchmentIDs'):
                 self._get_SubcatchIDs()
             ErrNo2 = self._getSubcatchSeries(
                 self.smoapi, self.SubcatchmentIDs[IDName], SMO_Attribute,
-                TimeStartInd, sLength.value, SeriesPtr)
+                TimeStartInd, sLength, SeriesPtr)
         elif element_type == tka.SMO_elementType.SM_node.value:
             if not hasattr(self, 'NodeIDs'):
                 self._get_NodeIDs()
             ErrNo2 = self._getNodeSeries(self.smoapi, self.NodeIDs[IDName],
-                                         SMO_Attribute, TimeStartInd,
-                                         sLength.value, SeriesPtr)
+                                         SMO_Attribute, TimeStartInd, sLength,
+                                         SeriesPtr)
         elif element_type == tka.SMO_elementType.SM_link.value:
             if not hasattr(self, 'LinkIDs'):
                 self._get_LinkIDs()
             ErrNo2 = self._getLinkSeries(self.smoapi, self.LinkIDs[IDName],
-                                         SMO_Attribute, TimeStartInd,
-                                         sLength.value, SeriesPtr)
+                                         SMO_Attribute, TimeStartInd, sLength,
+                                         SeriesPtr)
         # Add Pollutants Later
         elif element_type == tka.SMO_elementType.SM_sys.value:
             ErrNo2 = self._getSystemSeries(self.smoapi, SMO_Attribute,
-                                           TimeStartInd, sLength.value,
-                                           SeriesPtr)
+                                           TimeStartInd, sLength, SeriesPtr)
         else:
             error_msg = "SMO_elementType: {} Outside Valid Types".format(
                 element_type)
             raise Exception(error_msg)
 
-        if ErrNo2 != 0:
-            error_msg = "API ErrNo {0}:{1}".format(ErrNo2,
-                                                   tka.DLLErrorKeys[ErrNo2])
-            raise Exception(error_msg)
-
-        BldArray = [SeriesPtr[i] for i in range(sLength.value)]
-        self._free(SeriesPtr)
-        return BldArray
+        _api_error(ErrNo2)
+        return self._values(values)
 
     def get_Attribute(self, element_type, SMO_Attribute, TimeInd):
         """
@@ -551,8 +556,8 @@ class SWMMBinReader(object):
         :param int SMO_Attribute: Attribute Type :doc:`/keyrefs`.
         :param int TimeInd: TimeInd
 
-        :return: data list in order of the IDs of the SMO_elementType
-        :rtype: list
+        :return: data in order of the IDs of the SMO_elementType
+        :rtype: numpy.ndarray (list if as_list is set)
 
         Examples:
 
@@ -571,15 +576,20 @@ class SWMMBinReader(object):
         if TimeInd > self.get_Times(tka.SMO_time.numPeriods.value) - 1:
             raise Exception("Outside Number of TimeSteps")
 
-        aLength = ctypes.c_int()
-        ErrNo1 = ctypes.c_int()
-        ValArrayPtr = self._newOutValueArray(
-            self.smoapi, tka.SMO_apiFunction.getAttribute.value, element_type,
-            ctypes.byref(aLength), ctypes.byref(ErrNo1))
-        if ErrNo1.value != 0:
-            error_msg = "API ErrNo {0}:{1}".format(
-                ErrNo1.value, tka.DLLErrorKeys[ErrNo1.value])
+        element_counts = {
+            tka.SMO_elementType.SM_subcatch.value:
+            tka.SMO_elementCount.subcatchCount.value,
+            tka.SMO_elementType.SM_node.value:
+            tka.SMO_elementCount.nodeCount.value,
+            tka.SMO_elementType.SM_link.value:
+            tka.SMO_elementCount.linkCount.value,
+        }
+        if element_type not in element_counts:
+            error_msg = "SMO_elementType: {} Outside Valid Types".format(
+                element_type)
             raise Exception(error_msg)
+        values, ValArrayPtr = self._new_values(
+            self.get_ProjectSize(element_counts[element_type]))
 
         if element_type == tka.SMO_elementType.SM_subcatch.value:
             ErrNo2 = self._getSubcatchAttribute(self.smoapi, TimeInd,
@@ -587,23 +597,52 @@ class SWMMBinReader(object):
         elif element_type == tka.SMO_elementType.SM_link.value:
             ErrNo2 = self._getLinkAttribute(self.smoapi, TimeInd,
                                             SMO_Attribute, ValArrayPtr)
-        elif element_type == tka.SMO_elementType.SM_node.value:
+        else:
             ErrNo2 = self._getNodeAttribute(self.smoapi, TimeInd,
                                             SMO_Attribute, ValArrayPtr)
         # Add Pollutants Later
-        else:
-            error_msg = "SMO_elementType: {} Outside Valid Types".format(
-                element_type)
-            raise Exception(error_msg)
 
-        if ErrNo2 != 0:
-            error_msg = "API ErrNo {0}:{1}".format(ErrNo2,
-                                                   tka.DLLErrorKeys[ErrNo2])
-            raise Exception(error_msg)
+        _api_error(ErrNo2)
+        return self._values(values)
 
-        BldArray = [ValArrayPtr[i] for i in range(aLength.value)]
-        self._free(ValArrayPtr)
-        return BldArray
+    def get_matrix(self,
+                   element_type,
+                   attribute,
+                   time_slice=None,
+                   IDs=None,
+                   pollutant=None):
+        """
+        Get an attribute for many elements over many periods.
+
+        The results section is read in a single sequential pass through a
+        memory map of the file (see pyswmm.output.OutputMap) instead of
+        one get_Series call per element.
+
+        :param int element_type: Element type :doc:`/keyrefs`.
+        :param int attribute: Attribute Type :doc:`/keyrefs`.
+        :param slice time_slice: Reporting periods (default None for all)
+        :param list IDs: Element IDs (default None for all elements in
+                         output order)
+        :param pollutant: Pollutant ID or index for concentrations
+                          (default None)
+
+        :return: data matrix shaped (periods, elements)
+        :rtype: numpy.ndarray (list of lists if as_list is set)
+
+        Examples:
+
+        >>> OutputFile = SWMMBinReader()
+        >>> OutputFile.OpenBinFile("outputfile.out")
+        >>> depth = OutputFile.get_matrix(SM_node, invert_depth)
+        >>> depth.shape
+        (3479, 5)
+        >>> OutputFile.get_matrix(SM_link, 0, IDs=['C2'], pollutant='TSS')
+        """
+        if self._output_map is None:
+            self._output_map = OutputMap(self._binfile)
+        values = self._output_map.matrix(element_type, attribute, time_slice,
+                                         IDs, pollutant)
+        return self._values(values)
 
     def get_Result(self, element_type, TimeInd, IDName=None):
         """
@@ -613,6 +652,9 @@ class SWMMBinReader(object):
         :param int TimeInd: Time Index
         :param int IDName: IDName (default None for System Variables)
 
+        :return: all attributes of the element
+        :rtype: numpy.ndarray (list if as_list is set)
+
         Examples:
 
         >>> OutputFile = SWMMBinReader()
@@ -635,11 +677,15 @@ class SWMMBinReader(object):
         if TimeInd > self.get_Times(tka.SMO_time.numPeriods.value) - 1:
             raise Exception("Outside Number of TimeSteps")
 
-        alength = ctypes.c_int()
-        ErrNo1 = ctypes.c_int()
-        ValArrayPtr = self._newOutValueArray(
-            self.smoapi, tka.SMO_apiFunction.getResult, element_type,
-            ctypes.byref(alength), ctypes.byref(ErrNo1))
+        if element_type not in (tka.SMO_elementType.SM_subcatch.value,
+                                tka.SMO_elementType.SM_node.value,
+                                tka.SMO_elementType.SM_link.value,
+                                tka.SMO_elementType.SM_sys.value):
+            error_msg = "SMO_elementType: {} Outside Valid Types".format(
+                element_type)
+            raise Exception(error_msg)
+        values, ValArrayPtr = self._new_values(
+            self._result_length(element_type))
 
         if element_type == tka.SMO_elementType.SM_subcatch.value:
             if not hasattr(self, 'SubcatchmentIDs'):
@@ -658,17 +704,11 @@ class SWMMBinReader(object):
             ErrNo2 = self._getLinkResult(self.smoapi, TimeInd,
                                          self.LinkIDs[IDName], ValArrayPtr)
         # Add Pollutants Later
-        elif element_type == tka.SMO_elementType.SM_sys.value:
-            ErrNo2 = self._getSystemResult(self.smoapi, TimeInd, ValArrayPtr)
         else:
-            error_msg = "SMO_elementType: {} Outside Valid Types".format(
-                element_type)
-            raise Exception(error_msg)
+            ErrNo2 = self._getSystemResult(self.smoapi, TimeInd, ValArrayPtr)
 
-        ErrNo2  # FIXME: is this not used?
-        BldArray = [ValArrayPtr[i] for i in range(alength.value)]
-        self._free(ValArrayPtr)
-        return BldArray
+        _api_error(ErrNo2)
+        return self._values(values)
 
 
 if __name__ in "__main__":
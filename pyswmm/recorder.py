@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""In-memory recorder of simulation results."""
+
+# Third party imports
+import numpy as np
+import six
+
+# Local imports
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.toolkitapi import (LinkResults, NodeResults, ObjectType,
+                               SimulationTime, SubcResults)
+
+# Section: (object type, result enum, PySWMM bulk getter name,
+#           default variables)
+_SECTIONS = {
+    'nodes': (ObjectType.NODE, NodeResults, 'getNodeResults',
+              ('newDepth', 'totalinflow')),
+    'links': (ObjectType.LINK, LinkResults, 'getLinkResults', ('newFlow', )),
+    'subcatchments': (ObjectType.SUBCATCH, SubcResults, 'getSubcatchResults',
+                      ('newRunoff', )),
+}
+
+# Rows allocated when the number of records cannot be estimated
+_INITIAL_ROWS = 256
+
+
+def _variable_name(result_enum, variable):
+    """Resolves a result given as enum member or name to its name."""
+    if isinstance(variable, result_enum):
+        return variable.name
+    if isinstance(variable, six.string_types) and variable in \
+            result_enum.__members__:
+        return variable
+    return None
+
+
+class Recorder(object):
+    """
+    Records simulation results into preallocated numpy arrays.
+
+    Created by Simulation.record(); one row is written per recorded step.
+    When the recording interval is known, the arrays are sized from the
+    remaining simulation duration on the first record; otherwise they
+    start small and double in size when full. Results are views of the
+    recorded rows and can be read during or after the run.
+
+    :param object sim: Simulation to record
+    :param dict elements: {'nodes'|'links'|'subcatchments': IDs or True
+                           for all elements}
+    :param variables: Results to record. Either a list of result enum
+                      members or names, applied to every section they
+                      exist in, or a dict of such lists by section
+                      (default None for depth and total inflow of nodes,
+                      flow of links and runoff of subcatchments)
+    :param float every: Record once per this many simulated seconds, on
+                        the grid from the start (default None for every
+                        step)
+    """
+
+    def __init__(self, sim, elements, variables=None, every=None):
+        self._sim = sim
+        model = sim._model
+        self.every = every
+        self.ids = {}
+        self.variables = {}
+        self._indices = {}
+        self._getters = {}
+        for section, IDs in six.iteritems(elements):
+            object_type, result_enum, getter, defaults = _SECTIONS[section]
+            if IDs is True:
+                count = model.getProjectSize(object_type.value)
+                IDs = [model.getObjectId(object_type.value, ind)
+                       for ind in range(count)]
+            else:
+                IDs = list(IDs)
+            self.ids[section] = IDs
+            self._indices[section] = model.getObjectIDIndices(
+                object_type.value, IDs)
+            self._getters[section] = getattr(model, getter)
+            self.variables[section] = self._section_variables(
+                section, result_enum, defaults, variables)
+
+        if isinstance(variables, (list, tuple)):
+            recorded = set()
+            for names in self.variables.values():
+                recorded.update(names)
+            for variable in variables:
+                name = getattr(variable, 'name', variable)
+                if name not in recorded:
+                    raise PYSWMMException(
+                        "Result '{0}' does not apply to {1}".format(
+                            name, ', '.join(sorted(self.ids))))
+
+        # (section, variable, result code, buffer) per recorded series
+        self._series = []
+        for section in sorted(self.variables):
+            result_enum = _SECTIONS[section][1]
+            for name in self.variables[section]:
+                self._series.append(
+                    (section, name, result_enum[name].value, None))
+        self._elapsed = None
+        self._start = None
+        self.rows = 0
+
+    @staticmethod
+    def _section_variables(section, result_enum, defaults, variables):
+        """Resolves the variable names recorded for a section."""
+        if variables is None:
+            return list(defaults)
+        if isinstance(variables, dict):
+            names = []
+            for variable in variables.get(section, defaults):
+                name = _variable_name(result_enum, variable)
+                if name is None:
+                    raise PYSWMMException("Unknown {0} '{1}'".format(
+                        result_enum.__name__, variable))
+                names.append(name)
+            return names
+        names = [_variable_name(result_enum, variable)
+                 for variable in variables]
+        return [name for name in names if name is not None]
+
+    def _allocate(self, rows):
+        """Allocates (or grows to) rows records, keeping recorded data."""
+        elapsed = np.empty(rows, dtype=np.float64)
+        if self._elapsed is not None:
+            elapsed[:self.rows] = self._elapsed[:self.rows]
+        self._elapsed = elapsed
+        for pos, (section, name, code, buf) in enumerate(self._series):
+            new = np.empty((rows, len(self._indices[section])),
+                           dtype=np.float64)
+            if buf is not None:
+                new[:self.rows] = buf[:self.rows]
+            self._series[pos] = (section, name, code, new)
+
+    def _expected_rows(self):
+        """Estimates the records left in the run (None if unknown)."""
+        interval = self.every or self._sim._advance_seconds
+        if not interval:
+            return None
+        model = self._sim._model
+        end = model.getSimulationDateTime(SimulationTime.EndDateTime.value)
+        remaining = (end - self._start).total_seconds() - \
+            model.curSimTime * 86400.0
+        return int(max(remaining, 0.0) // interval) + 2
+
+    def __call__(self):
+        """Records the current step (subscribed to after_step)."""
+        model = self._sim._model
+        elapsed = model.curSimTime * 86400.0
+        if elapsed <= 0.0:
+            # The step that ends the run resets the elapsed time
+            return
+        if self._start is None:
+            self._start = model.getSimulationDateTime(
+                SimulationTime.StartDateTime.value)
+            self._allocate(self._expected_rows() or _INITIAL_ROWS)
+        elif self.rows == len(self._elapsed):
+            self._allocate(2 * self.rows)
+        row = self.rows
+        self._elapsed[row] = elapsed
+        getters = self._getters
+        indices = self._indices
+        for section, _, code, buf in self._series:
+            getters[section](code, indices[section], out=buf[row])
+        self.rows = row + 1
+
+    @property
+    def elapsed(self):
+        """
+        Elapsed simulation seconds of the recorded rows.
+
+        :rtype: numpy.ndarray
+        """
+        if self._elapsed is None:
+            return np.empty(0, dtype=np.float64)
+        return self._elapsed[:self.rows]
+
+    @property
+    def times(self):
+        """
+        Simulation times of the recorded rows, rounded to the second.
+
+        :rtype: numpy.ndarray of datetime64[s]
+        """
+        if self._start is None:
+            return np.empty(0, dtype='datetime64[s]')
+        seconds = np.round(self.elapsed).astype('timedelta64[s]')
+        return np.datetime64(self._start, 's') + seconds
+
+    def get(self, section, variable):
+        """
+        Recorded values of one result for all recorded elements.
+
+        :param str section: 'nodes', 'links' or 'subcatchments'
+        :param variable: Result enum member or name
+        :return: Values shaped (rows, elements), columns in the order of
+                 self.ids[section]
+        :rtype: numpy.ndarray
+        """
+        if section not in self.ids:
+            raise PYSWMMException("Section '{0}' is not recorded".format(
+                section))
+        name = getattr(variable, 'name', variable)
+        for series_section, series_name, _, buf in self._series:
+            if series_section == section and series_name == name:
+                if buf is None:
+                    return np.empty((0, len(self.ids[section])))
+                return buf[:self.rows]
+        raise PYSWMMException("Result '{0}' of {1} is not recorded".format(
+            name, section))
+
+    def series(self, section, ID, variable):
+        """
+        Recorded values of one result for one element.
+
+        :param str section: 'nodes', 'links' or 'subcatchments'
+        :param str ID: Element ID
+        :param variable: Result enum member or name
+        :rtype: numpy.ndarray
+        """
+        values = self.get(section, variable)
+        try:
+            column = self.ids[section].index(ID)
+        except ValueError:
+            raise PYSWMMException("ID '{0}' of {1} is not recorded".format(
+                ID, section))
+        return values[:, column]
+
+    @property
+    def data(self):
+        """
+        All recorded values by section and variable name.
+
+        :return: {section: {variable: values shaped (rows, elements)}}
+        :rtype: dict
+        """
+        return dict((section, dict((name, self.get(section, name))
+                                   for name in names))
+                    for section, names in six.iteritems(self.variables))
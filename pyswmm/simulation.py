@@ -7,9 +7,84 @@
 # -----------------------------------------------------------------------------
 """Base class for a SWMM Simulation."""
 
+# Standard library imports
+from timeit import default_timer as _timer
+import math
+import os
+import shutil
+import tempfile
+
 # Local imports
+from pyswmm.branch import branch as _branch
+from pyswmm.metrics import SimulationMetrics
+from pyswmm.recorder import Recorder
 from pyswmm.swmm5 import PySWMM, PYSWMMException
+from pyswmm.trace import Tracer
 from pyswmm.toolkitapi import SimulationTime, SimulationUnits
+from pyswmm.utils.finalizer import Finalizer
+
+# Events that fire once per simulation step and can be throttled
+STEP_EVENTS = ("before_step", "after_step")
+EVENTS = ("before_start", ) + STEP_EVENTS + ("before_end", "after_end",
+                                              "after_close")
+
+# Where report and binary output files go (see Simulation output_mode)
+OUTPUT_MODES = ("keep", "tmpfs", "none")
+
+# Seconds of engine clock noise ignored when matching the every_seconds
+# grid (elapsed days * 86400 is not exact)
+GRID_TOLERANCE = 1e-3
+# Memory-backed directory for scratch files, if the system has one
+SCRATCH_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') and os.access(
+    '/dev/shm', os.W_OK) else None
+
+
+def _scratch_files(inputfile, output_mode):
+    """
+    Creates a private scratch directory for the report and output files.
+
+    :return: (scratch directory, report file, binary output file)
+    """
+    scratch = tempfile.mkdtemp(prefix='pyswmm_', dir=SCRATCH_ROOT)
+    stem = os.path.splitext(os.path.basename(inputfile))[0]
+    if output_mode == "none":
+        reportfile = os.devnull
+    else:
+        reportfile = os.path.join(scratch, stem + '.rpt')
+    # The engine needs a seekable binary output file even when it is
+    # never read back, so it cannot be sent to the null device
+    outputfile = os.path.join(scratch, stem + '.out')
+    return scratch, reportfile, outputfile
+
+
+class _Hook(object):
+    """A callback subscribed to a simulation event, with its throttle."""
+
+    __slots__ = ('callback', 'every_steps', 'every_seconds', 'steps',
+                 'next_due')
+
+    def __init__(self, callback, every_steps=None, every_seconds=None):
+        self.callback = callback
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        self.steps = 0
+        self.next_due = 0.0
+
+    def due(self, model):
+        """Counts a step; True if the callback should run on it."""
+        if self.every_steps is not None:
+            self.steps += 1
+            if (self.steps - 1) % self.every_steps:
+                return False
+        if self.every_seconds is not None:
+            elapsed = model.curSimTime * 86400.0 + GRID_TOLERANCE
+            if elapsed < self.next_due:
+                return False
+            # Due again at the next multiple of every_seconds from the
+            # simulation start, so hooks with one interval share steps
+            periods = math.floor(elapsed / self.every_seconds)
+            self.next_due = (periods + 1) * self.every_seconds
+        return True
 
 
 class Simulation(object):
@@ -25,6 +100,23 @@ class Simulation(object):
     :param str rptfile: Report file to generate (default None)
     :param str binfile: Optional binary output file (default None)
     :param str swmm_lib_path: User-specified SWMM library path (default None).
+    :param bool isolated: Run on a private copy of the SWMM library so
+                          several simulations can be open in one process
+                          (default False).
+    :param str output_mode: "keep" writes the report and binary output
+                            files to the given paths, or next to the input
+                            file; "tmpfs" writes both to a private scratch
+                            directory (in /dev/shm where available) that is
+                            removed when the simulation closes; "none"
+                            discards the report and keeps only a scratch
+                            binary output file. report() is skipped in the
+                            scratch modes (default "keep").
+    :param bool metrics: Collect phase timings and throughput in
+                         self.metrics (default False).
+    :param bool result_cache: Read each element result from the engine
+                              once per step (see
+                              PySWMM.enable_result_cache()) (default
+                              False).
 
     Examples:
 
@@ -58,26 +150,67 @@ class Simulation(object):
     >>>
     >>> sim = Simulation('tests/data/TestModel1_weirSetting.inp')
     >>> sim.execute()
+
+    Step two models side by side in one process. Each isolated simulation
+    runs on its own copy of the SWMM library.
+
+    >>> from pyswmm import Simulation
+    >>>
+    >>> with Simulation('a.inp', isolated=True) as sim_a, \\
+    ...         Simulation('b.inp', isolated=True) as sim_b:
+    ...     for step_a, step_b in zip(sim_a, sim_b):
+    ...         pass
+
+    Run without writing anything next to the input file, e.g. for
+    ensemble members on a shared file system.
+
+    >>> from pyswmm import Simulation
+    >>>
+    >>> with Simulation('a.inp', output_mode="none") as sim:
+    ...     for step in sim:
+    ...         pass
     """
 
     def __init__(self,
                  inputfile,
                  reportfile=None,
                  outputfile=None,
-                 swmm_lib_path=None):
-        self._model = PySWMM(inputfile, reportfile, outputfile, swmm_lib_path)
+                 swmm_lib_path=None,
+                 isolated=False,
+                 output_mode="keep",
+                 metrics=False,
+                 result_cache=False):
+        if output_mode not in OUTPUT_MODES:
+            raise PYSWMMException("Unknown output mode '{}'".format(
+                output_mode))
+        self.output_mode = output_mode
+        self._scratch_finalizer = None
+        if output_mode != "keep":
+            if reportfile or outputfile:
+                raise PYSWMMException(
+                    "Report and output files are not kept with output "
+                    "mode '{}'".format(output_mode))
+            scratch, reportfile, outputfile = _scratch_files(
+                inputfile, output_mode)
+            self._scratch_finalizer = Finalizer(
+                self, shutil.rmtree, scratch, True)
+        self._model = PySWMM(inputfile, reportfile, outputfile, swmm_lib_path,
+                             isolated)
+        self._metrics = None
+        if metrics:
+            self._metrics = SimulationMetrics(os.path.basename(inputfile))
+            tic = _timer()
         self._model.swmm_open()
+        if metrics:
+            self._metrics.add("open", _timer() - tic)
+        if result_cache:
+            self._model.enable_result_cache()
         self._isOpen = True
         self._advance_seconds = None
         self._isStarted = False
-        self._callbacks = {
-            "before_start": None,
-            "before_step": None,
-            "after_step": None,
-            "before_end": None,
-            "after_end": None,
-            "after_close": None
-        }
+        # Subscribed hooks by event; the step events are checked by
+        # truthiness only, so an empty list costs nothing per step
+        self._callbacks = dict((event, []) for event in EVENTS)
 
     def __enter__(self):
         """
@@ -109,8 +242,15 @@ class Simulation(object):
             if hasattr(self, "_initial_conditions"):
                 self._initial_conditions()
             # Execute Callback Hooks Before Simulation
-            self._execute_callback(self.before_start())
+            self._execute_callbacks("before_start")
+            metrics = self._metrics
+            if metrics is not None:
+                duration = self.end_time - self.start_time
+                tic = _timer()
             self._model.swmm_start(True)
+            if metrics is not None:
+                metrics.add("start", _timer() - tic)
+                metrics.run_started(duration.total_seconds())
             self._isStarted = True
 
     def __next__(self):
@@ -118,16 +258,25 @@ class Simulation(object):
         # Start Simulation
         self.start()
         # Execute Callback Hooks Before Simulation Step
-        self._execute_callback(self.before_step())
+        if self._callbacks["before_step"]:
+            self._execute_step_callbacks("before_step")
+        metrics = self._metrics
+        if metrics is not None:
+            tic = _timer()
         # Simulation Step Amount
         if self._advance_seconds is None:
             time = self._model.swmm_step()
         else:
             time = self._model.swmm_stride(self._advance_seconds)
+        if metrics is not None:
+            metrics.add_step(_timer() - tic, time)
         # Execute Callback Hooks After Simulation Step
-        self._execute_callback(self.after_step())
+        if self._callbacks["after_step"]:
+            self._execute_step_callbacks("after_step")
         if time <= 0.0:
-            self._execute_callback(self.before_end())
+            if metrics is not None:
+                metrics.run_ended()
+            self._execute_callbacks("before_end")
             raise StopIteration
         return self._model
 
@@ -135,16 +284,29 @@ class Simulation(object):
 
     def __exit__(self, *a):
         """close"""
+        metrics = self._metrics
         if self._isStarted:
+            if metrics is not None:
+                metrics.run_ended()
+                tic = _timer()
             self._model.swmm_end()
+            if metrics is not None:
+                metrics.add("end", _timer() - tic)
             self._isStarted = False
             # Execute Callback Hooks After Simulation End
-            self._execute_callback(self.after_end())
+            self._execute_callbacks("after_end")
         if self._isOpen:
+            if metrics is not None:
+                tic = _timer()
             self._model.swmm_close()
+            self._model.release_library()
+            if metrics is not None:
+                metrics.add("close", _timer() - tic)
+            if self._scratch_finalizer is not None:
+                self._scratch_finalizer()
             self._isOpen = False
             # Execute Callback Hooks After Simulation Closes
-            self._execute_callback(self.after_close())
+            self._execute_callbacks("after_close")
 
     @staticmethod
     def _is_callback(callable_object):
@@ -165,6 +327,279 @@ class Simulation(object):
                 error_msg = "Callback Failed"
                 raise PYSWMMException((error_msg))
 
+    def _subscribed(self, event):
+        """Callbacks of an event, shaped as before several were allowed."""
+        callbacks = [hook.callback for hook in self._callbacks[event]]
+        if not callbacks:
+            return None
+        if len(callbacks) == 1:
+            return callbacks[0]
+        return callbacks
+
+    def _execute_callbacks(self, event):
+        """Runs every callback subscribed to an event."""
+        hooks = self._callbacks[event]
+        if self._metrics is not None and hooks:
+            tic = _timer()
+        for hook in hooks:
+            self._execute_callback(hook.callback)
+        if self._metrics is not None and hooks:
+            self._metrics.add_callbacks(_timer() - tic, len(hooks))
+
+    def _execute_step_callbacks(self, event):
+        """Runs the callbacks of a step event that are due."""
+        metrics = self._metrics
+        if metrics is not None:
+            tic = _timer()
+            calls = 0
+        for hook in self._callbacks[event]:
+            if hook.due(self._model):
+                self._execute_callback(hook.callback)
+                if metrics is not None:
+                    calls += 1
+        if metrics is not None:
+            metrics.add_callbacks(_timer() - tic, calls)
+
+    def add_callback(self, event, callback, every_steps=None,
+                     every_seconds=None):
+        """
+        Subscribe a callback to a simulation event.
+
+        Any number of callbacks can subscribe to an event; they run in
+        the order they were added. Callbacks on the step events
+        (before_step, after_step) can be throttled to run on every Nth
+        step, or on the first step at or after each multiple of T
+        simulated seconds from the simulation start, so callbacks with
+        the same T run on the same steps. Both run on the first step.
+        When no callback is subscribed to a step event, the event costs
+        nothing per step.
+
+        :param str event: before_start, before_step, after_step,
+                          before_end, after_end or after_close
+        :param func callback: Callable Object
+        :param int every_steps: Run on every Nth step (default None)
+        :param float every_seconds: Run once per this many simulated
+                                    seconds, on the grid from the start
+                                    (default None)
+
+        Examples:
+
+        >>> from pyswmm import Simulation
+        >>>
+        >>> with Simulation('./TestModel1_weirSetting.inp') as sim:
+        ...     sim.add_callback("after_step", controller, every_seconds=300)
+        ...     sim.add_callback("after_step", logger, every_steps=100)
+        ...     for step in sim:
+        ...         pass
+        """
+        if event not in self._callbacks:
+            raise PYSWMMException("Unknown simulation event '{}'".format(
+                event))
+        self._is_callback(callback)
+        throttled = every_steps is not None or every_seconds is not None
+        if throttled and event not in STEP_EVENTS:
+            raise PYSWMMException(
+                "Only step events can be throttled, not '{}'".format(event))
+        if every_steps is not None and every_steps < 1:
+            raise PYSWMMException("every_steps must be at least 1")
+        if every_seconds is not None and every_seconds <= 0:
+            raise PYSWMMException("every_seconds must be positive")
+        self._callbacks[event].append(
+            _Hook(callback, every_steps, every_seconds))
+
+    def remove_callback(self, event, callback):
+        """
+        Unsubscribe a callback from a simulation event.
+
+        :param str event: Event name (see add_callback())
+        :param func callback: Callable Object previously added
+        """
+        hooks = self._callbacks.get(event, [])
+        for hook in hooks:
+            if hook.callback == callback:
+                hooks.remove(hook)
+                return
+        raise PYSWMMException("Callback is not subscribed to '{}'".format(
+            event))
+
+    def record(self,
+               nodes=None,
+               links=None,
+               subcatchments=None,
+               variables=None,
+               every=None):
+        """
+        Record results of the selected elements in memory during the run.
+
+        Results are written after each step into numpy arrays that are
+        preallocated from the simulation duration when the recording
+        interval is known (every or step_advance()), so no binary output
+        file has to be written and read back for a few series.
+
+        :param nodes: Node IDs, or True for all nodes (default None)
+        :param links: Link IDs, or True for all links (default None)
+        :param subcatchments: Subcatchment IDs, or True for all
+                              subcatchments (default None)
+        :param variables: NodeResults/LinkResults/SubcResults members or
+                          names, or a dict of them by section ('nodes',
+                          'links', 'subcatchments') (default None for node
+                          depth and total inflow, link flow and
+                          subcatchment runoff)
+        :param float every: Record once per this many simulated seconds,
+                            on the grid from the start (default None for
+                            every step)
+        :return: Recorder holding the recorded values and time axis
+        :rtype: pyswmm.recorder.Recorder
+
+        Examples:
+
+        >>> from pyswmm import Simulation
+        >>>
+        >>> with Simulation('tests/data/TestModel1_weirSetting.inp') as sim:
+        ...     rec = sim.record(nodes=['J1'], links=['C1:C2'], every=300)
+        ...     for step in sim:
+        ...         pass
+        >>>
+        >>> rec.times
+        array(['2015-11-01T14:05:00', ...], dtype='datetime64[s]')
+        >>> rec.series('nodes', 'J1', 'newDepth')
+        array([0.0, ...])
+        """
+        elements = {}
+        for section, IDs in (("nodes", nodes), ("links", links),
+                             ("subcatchments", subcatchments)):
+            if IDs is not None and IDs is not False:
+                elements[section] = IDs
+        if not elements:
+            raise PYSWMMException("No elements selected to record")
+        if every is not None and every <= 0:
+            raise PYSWMMException("every must be positive")
+        recorder = Recorder(self, elements, variables, every)
+        self.add_callback("after_step", recorder, every_seconds=every)
+        return recorder
+
+    def branch(self, policies, horizon=None, summary=None):
+        """
+        Evaluate policies from the current engine state in forked copies.
+
+        Pauses the simulation and forks one copy-on-write child per
+        policy; each child continues from the exact in-memory engine
+        state, applies its policy, runs the horizon and sends
+        summary(sim) back over a pipe. The parent then resumes where it
+        paused, unaffected by the children. Only available on Linux.
+
+        Children start without the callbacks of this simulation (a policy
+        may add its own, e.g. with record()), write no report or binary
+        output, and run the horizon with the routing step or the
+        step_advance() of this simulation.
+
+        :param list policies: One entry per child; a callable run with the
+                              child Simulation, a {link ID: setting} dict
+                              applied with setLinkSetting, or None
+        :param float horizon: Simulated seconds each child runs (default
+                              None to run no further than the policy)
+        :param func summary: Called with the child Simulation at the end of
+                             the horizon; its return value must be
+                             picklable (default None)
+        :return: Summary per policy, in the order of policies
+        :rtype: list
+
+        Examples:
+
+        >>> from pyswmm import Simulation
+        >>>
+        >>> def depth_j3(sim):
+        ...     return Nodes(sim)['J3'].depth
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+        ...     sim.step_advance(900)
+        ...     for step in sim:
+        ...         candidates = [{'C3': setting} for setting in (0, 0.5, 1)]
+        ...         depths = sim.branch(candidates, horizon=3600,
+        ...                             summary=depth_j3)
+        ...         best = depths.index(min(depths))
+        ...         step.setLinkSetting('C3', candidates[best]['C3'])
+        """
+        self.start()
+        return _branch(self, policies, horizon, summary)
+
+    @property
+    def metrics(self):
+        """
+        Phase timings, step counts and throughput of the run.
+
+        Only collected with Simulation(..., metrics=True).
+
+        :return: Metrics (None when not collected)
+        :rtype: pyswmm.metrics.SimulationMetrics
+
+        Examples:
+
+        >>> from pyswmm import Simulation
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp',
+        ...                 metrics=True) as sim:
+        ...     for ind, step in enumerate(sim):
+        ...         if ind % 1000 == 0:
+        ...             print(sim.metrics.progress, sim.metrics.eta)
+        ...     sim.report()
+        >>> sim.metrics.to_prometheus('/var/lib/node_exporter/swmm.prom')
+        """
+        return self._metrics
+
+    @property
+    def result_cache_stats(self):
+        """
+        Hits and misses of the per-step result cache.
+
+        Only counted with Simulation(..., result_cache=True).
+
+        :return: {'hits': int, 'misses': int, 'size': cached values}
+        :rtype: dict
+
+        Examples:
+
+        >>> from pyswmm import Nodes, Simulation
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp',
+        ...                 result_cache=True) as sim:
+        ...     j1 = Nodes(sim)['J1']
+        ...     for step in sim:
+        ...         if j1.depth > 1.0 and j1.depth > j1.head - 10.0:
+        ...             pass
+        ...     print(sim.result_cache_stats)
+        """
+        return self._model.result_cache_stats()
+
+    def trace(self, events=False, max_events=1000000):
+        """
+        Count and time every toolkit call until the tracer is detached.
+
+        Wraps the PySWMM methods, the engine functions and the callbacks
+        of this simulation only; call detach() on the returned tracer to
+        restore them. Nothing is wrapped (or paid) until trace() is
+        called.
+
+        :param bool events: Keep a timeline of the calls for
+                            Tracer.write_chrome_trace() (default False)
+        :param int max_events: Timeline events kept (default 1000000)
+        :return: Attached tracer
+        :rtype: pyswmm.trace.Tracer
+
+        Examples:
+
+        >>> from pyswmm import Simulation
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+        ...     tracer = sim.trace(events=True)
+        ...     for step in sim:
+        ...         pass
+        ...     tracer.detach()
+        >>> print(tracer.report())
+        >>> tracer.write_chrome_trace('trace.json')
+        """
+        return Tracer(events, max_events).attach(self)
+
     def initial_conditions(self, init_conditions):
         """
         Intial Conditions for Hydraulics and Hydrology can be set
@@ -192,9 +627,9 @@ class Simulation(object):
     def before_start(self):
         """Get Before Start Callback.
 
-        :return: Callbacks
+        :return: Subscribed callback, a list if several, else None
         """
-        return self._callbacks["before_start"]
+        return self._subscribed("before_start")
 
     def add_before_start(self, callback):
         """
@@ -225,53 +660,60 @@ class Simulation(object):
         >>> "Complete!"
         >>> "Closed"
         """
-        if self._is_callback(callback):
-            self._callbacks["before_start"] = callback
+        self.add_callback("before_start", callback)
 
     def before_step(self):
         """Get Before Step Callback.
 
-        :return: Callbacks
+        :return: Subscribed callback, a list if several, else None
         """
-        return self._callbacks["before_step"]
+        return self._subscribed("before_step")
 
-    def add_before_step(self, callback):
+    def add_before_step(self, callback, every_steps=None, every_seconds=None):
         """
         Add callback function/method/object to execute before
         a simlation step. Needs to be callable.
 
         :param func callback: Callable Object
+        :param int every_steps: Run on every Nth step (default None)
+        :param float every_seconds: Run once per this many simulated
+                                    seconds, on the grid from the start
+                                    (default None)
 
-        (See self.add_before_start() for more details)
+        (See self.add_before_start() and self.add_callback() for more
+        details)
         """
-        if self._is_callback(callback):
-            self._callbacks["before_step"] = callback
+        self.add_callback("before_step", callback, every_steps, every_seconds)
 
     def after_step(self):
         """Get After Step Callback.
 
-        :return: Callbacks
+        :return: Subscribed callback, a list if several, else None
         """
-        return self._callbacks["after_step"]
+        return self._subscribed("after_step")
 
-    def add_after_step(self, callback):
+    def add_after_step(self, callback, every_steps=None, every_seconds=None):
         """
         Add callback function/method/object to execute after
         a simlation step. Needs to be callable.
 
         :param func callback: Callable Object
+        :param int every_steps: Run on every Nth step (default None)
+        :param float every_seconds: Run once per this many simulated
+                                    seconds, on the grid from the start
+                                    (default None)
 
-        (See self.add_before_start() for more details)
+        (See self.add_before_start() and self.add_callback() for more
+        details)
         """
-        if self._is_callback(callback):
-            self._callbacks["after_step"] = callback
+        self.add_callback("after_step", callback, every_steps, every_seconds)
 
     def before_end(self):
         """Get Before End Callback.
 
-        :return: Callbacks
+        :return: Subscribed callback, a list if several, else None
         """
-        return self._callbacks["before_end"]
+        return self._subscribed("before_end")
 
     def add_before_end(self, callback):
         """
@@ -282,15 +724,14 @@ class Simulation(object):
 
         (See self.add_before_start() for more details)
         """
-        if self._is_callback(callback):
-            self._callbacks["before_end"] = callback
+        self.add_callback("before_end", callback)
 
     def after_end(self):
         """Get After End Callback.
 
-        :return: Callbacks
+        :return: Subscribed callback, a list if several, else None
         """
-        return self._callbacks["after_end"]
+        return self._subscribed("after_end")
 
     def add_after_end(self, callback):
         """
@@ -301,15 +742,14 @@ class Simulation(object):
 
         (See self.add_before_start() for more details)
         """
-        if self._is_callback(callback):
-            self._callbacks["after_end"] = callback
+        self.add_callback("after_end", callback)
 
     def after_close(self):
         """Get After Close Callback.
 
-        :return: Callbacks
+        :return: Subscribed callback, a list if several, else None
         """
-        return self._callbacks["after_close"]
+        return self._subscribed("after_close")
 
     def add_after_close(self, callback):
         """
@@ -320,8 +760,7 @@ class Simulation(object):
 
         (See self.add_before_start() for more details)
         """
-        if self._is_callback(callback):
-            self._callbacks["after_close"] = callback
+        self.add_callback("after_close", callback)
 
     def step_advance(self, advance_seconds):
         """
@@ -362,8 +801,15 @@ class Simulation(object):
         ...     for step in sim:
         ...         pass
         ...     sim.report()
+
+        The report is not written when output_mode is "tmpfs" or "none".
         """
-        self._model.swmm_report()
+        if self.output_mode == "keep":
+            if self._metrics is not None:
+                tic = _timer()
+            self._model.swmm_report()
+            if self._metrics is not None:
+                self._metrics.add("report", _timer() - tic)
 
     def close(self):
         """
@@ -392,7 +838,11 @@ class Simulation(object):
         >>> sim = PYSWMM(r'\\test.inp')
         >>> sim.execute()
         """
+        if self._metrics is not None:
+            tic = _timer()
         self._model.swmmExec()
+        if self._metrics is not None:
+            self._metrics.add("execute", _timer() - tic)
 
     @property
     def engine_version(self):
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Asyncio front end of a SWMM Simulation (Python 3.5+)."""
+
+# Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+
+# Local imports
+from pyswmm.simulation import Simulation
+from pyswmm.swmm5 import PYSWMMException
+
+
+class AsyncSimulation(object):
+    """
+    Steps a Simulation without blocking the asyncio event loop.
+
+    The engine is not thread safe, so every engine call runs on one
+    dedicated thread: the steps, and any getter or setter passed to
+    call(). Calls are queued in the order they are made, so other
+    coroutines keep running during a long stride and their requests are
+    served between steps.
+
+    Element getters and setters (Nodes, Links, ... and their properties)
+    must go through call() as well. Reading ``node.depth`` directly from
+    a coroutine touches the engine from the event loop thread while a
+    step may be running on the engine thread.
+
+    Takes the arguments of Simulation. The simulation is opened on the
+    engine thread by open() or ``async with``. Each open starts a new
+    engine thread, so the object can be opened again after close().
+
+    Examples:
+
+    >>> import asyncio
+    >>> from pyswmm import Links, Nodes
+    >>> from pyswmm.simulation_async import AsyncSimulation
+    >>>
+    >>> async def run():
+    ...     async with AsyncSimulation('tests/data/model_weir_setting.inp',
+    ...                                output_mode="none") as sim:
+    ...         j1 = await sim.call(lambda: Nodes(sim.simulation)['J1'])
+    ...         c3 = await sim.call(lambda: Links(sim.simulation)['C3'])
+    ...         sim.simulation.step_advance(900)
+    ...         async for step in sim:
+    ...             depth = await sim.call(lambda: j1.depth)
+    ...             await sim.call(setattr, c3, 'target_setting', depth / 10)
+    >>>
+    >>> asyncio.get_event_loop().run_until_complete(run())
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._args = args
+        self._kwargs = kwargs
+        self._executor = None
+        self._sim = None
+
+    @property
+    def simulation(self):
+        """
+        The wrapped Simulation.
+
+        Only touch the engine through it from functions passed to call(),
+        including the getters and setters of its elements.
+        """
+        return self._sim
+
+    def call(self, func, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) on the engine thread.
+
+        :param func func: Callable Object
+        :return: Awaitable of the return value
+        :rtype: asyncio.Future
+        """
+        if self._executor is None:
+            raise PYSWMMException("AsyncSimulation is not open")
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self._executor,
+                                    functools.partial(func, *args, **kwargs))
+
+    async def open(self):
+        """Opens the simulation on the engine thread."""
+        if self._sim is None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._sim = await self.call(Simulation, *self._args,
+                                        **self._kwargs)
+        return self
+
+    async def close(self):
+        """Closes the simulation and stops the engine thread."""
+        if self._sim is not None:
+            await self.call(self._sim.close)
+            self._sim = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    def _step(self):
+        """Steps on the engine thread; False once the simulation ends."""
+        # StopIteration cannot be set on an asyncio future
+        try:
+            next(self._sim)
+        except StopIteration:
+            return False
+        return True
+
+    async def __anext__(self):
+        await self.open()
+        if not await self.call(self._step):
+            raise StopAsyncIteration
+        return self
@@ -16,6 +16,9 @@ class Subcatchments(object):
     """
     Subcatchment Iterator Methods.
 
+    Subcatchment objects are built on first access and are shared by all
+    Subcatchments of the open model. Iteration can be repeated.
+
     :param object model: Open Model Instance
 
     Examples:
@@ -82,7 +85,7 @@ class Subcatchments(object):
         :rtype: int
 
         """
-        return self._model.getProjectSize(ObjectType.SUBCATCH.value)
+        return self._nSubcatchments
 
     def __contains__(self, subcatchmentid):
         """
@@ -95,17 +98,74 @@ class Subcatchments(object):
                                          subcatchmentid)
 
     def __getitem__(self, subcatchmentid):
-        if self.__contains__(subcatchmentid):
-            return Subcatchment(self._model, subcatchmentid)
-        else:
+        if not self.__contains__(subcatchmentid):
             raise PYSWMMException("Subcatchment ID Does not Exist")
+        return self._subcatchment(self._model.getObjectIDIndex(
+            ObjectType.SUBCATCH.value, subcatchmentid))
+
+    def _handles(self):
+        """Subcatchment objects by index, shared while the model is open."""
+        handles = self._model._elements.get(ObjectType.SUBCATCH.value)
+        if handles is None:
+            handles = [None] * self._nSubcatchments
+            self._model._elements[ObjectType.SUBCATCH.value] = handles
+        return handles
+
+    def _subcatchment(self, index):
+        """Subcatchment object at index, built on first use."""
+        handles = self._handles()
+        subcatchment = handles[index]
+        if subcatchment is None:
+            subcatchmentid = self._model.getObjectId(
+                ObjectType.SUBCATCH.value, index)
+            subcatchment = Subcatchment(self._model, subcatchmentid)
+            handles[index] = subcatchment
+        return subcatchment
+
+    def indices(self, subcatchmentids):
+        """
+        Resolve subcatchment IDs to subcatchment indices once, for use
+        with get_results().
+
+        :param list subcatchmentids: Subcatchment IDs
+        :return: Subcatchment Indices
+        :rtype: list
+        """
+        return self._model.getObjectIDIndices(ObjectType.SUBCATCH.value,
+                                              subcatchmentids)
+
+    def get_results(self, result_type, indices=None, out=None):
+        """
+        Get one result for many subcatchments in a single call.
+
+        :param int result_type: Result (toolkitapi.SubcResults member variable)
+        :param list indices: Subcatchment indices (default None for all
+                             subcatchments)
+        :param out: Preallocated float64 array to fill (default None)
+        :return: Result Values in the order of indices
+        :rtype: numpy.ndarray
+
+        Examples:
+
+        >>> from pyswmm import Simulation, Subcatchments
+        >>>
+        >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+        ...     subcatchments = Subcatchments(sim)
+        ...     for step in sim:
+        ...         values = subcatchments.get_results(SubcResults.newRunoff)
+        """
+        return self._model.getSubcatchResults(result_type, indices, out)
 
     def __iter__(self):
-        return self
+        handles = self._handles()
+        if None in handles:
+            for index in range(self._nSubcatchments):
+                self._subcatchment(index)
+        return iter(handles)
 
     def __next__(self):
         if self._cuindex < self._nSubcatchments:
-            subcatchmentobject = self.__getitem__(self._subcatchmentid)
+            subcatchmentobject = self._subcatchment(self._cuindex)
             self._cuindex += 1  # Next Iteration
             return subcatchmentobject
         else:
@@ -113,12 +173,6 @@ class Subcatchments(object):
 
     next = __next__  # Python 2
 
-    @property
-    def _subcatchmentid(self):
-        """Subcatchment ID."""
-        return self._model.getObjectId(ObjectType.SUBCATCH.value,
-                                       self._cuindex)
-
 
 class Subcatchment(object):
     """
@@ -139,11 +193,13 @@ class Subcatchment(object):
     ... 0.04
     """
 
+    __slots__ = ('_model', '_subcatchmentid')
+
     def __init__(self, model, subcatchmentid):
         if not model.fileLoaded:
             raise PYSWMMException("SWMM Model Not Open")
-        if subcatchmentid not in model.getObjectIDList(
-                ObjectType.SUBCATCH.value):
+        if not model.ObjectIDexist(ObjectType.SUBCATCH.value,
+                                   subcatchmentid):
             raise PYSWMMException("ID Not valid")
         self._model = model
         self._subcatchmentid = subcatchmentid
@@ -20,15 +20,20 @@ import sys
 import warnings
 
 # Third party imports
+import numpy as np
 import six
 
 # Local imports
-from pyswmm.lib import DLL_SELECTION
+from pyswmm.lib import DLL_SELECTION, isolated_copy
+from pyswmm.utils.finalizer import Finalizer
 import pyswmm.toolkitapi as tka
 
 # Local variables
 SWMM_VER_51011 = '5.1.11'
 
+# Loaded SWMM libraries (by absolute path) with their prototypes declared
+_SWMM_LIBRARIES = {}
+
 
 class SWMMException(Exception):
     """Custom exception class for SWMM errors."""
@@ -53,6 +58,195 @@ class PYSWMMException(Exception):
         return self.message
 
 
+# Object type codes in the result cache keys
+_NODE = tka.ObjectType.NODE.value
+_LINK = tka.ObjectType.LINK.value
+_SUBCATCH = tka.ObjectType.SUBCATCH.value
+
+
+# Engine functions bound once per model as _<name> for the per-step calls
+_BOUND_HANDLES = ('swmm_step', 'swmm_getNodeResult', 'swmm_getLinkResult',
+                  'swmm_getSubcatchResult', 'swmm_setLinkSetting',
+                  'swmm_setNodeInflow', 'swmm_setOutfallStage')
+
+
+# Double getters also bound as _<name>_into, taking the output as an
+# address so the bulk getters fill a buffer in place
+_BULK_GETTERS = ('swmm_getNodeResult', 'swmm_getLinkResult',
+                 'swmm_getSubcatchResult', 'swmm_getNodeParam',
+                 'swmm_getLinkParam', 'swmm_getSubcatchParam')
+
+
+def _address_getter(libobj, name):
+    """
+    Separate handle of a double getter whose output is an address.
+
+    libobj[name] is a new function object, so the prototype shared with
+    the single-value getters is left as declared.
+    """
+    func = libobj[name]
+    func.restype = ctypes.c_int
+    func.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_void_p)
+    return func
+
+
+def _library_released(*args):
+    """Stands in for the bound handles of a released library."""
+    raise PYSWMMException("library released")
+
+
+def _double_buffer(out, count):
+    """
+    Wraps a writable, contiguous buffer of doubles as a ctypes array.
+
+    :param out: numpy float64 array or other buffer-protocol object
+    :param int count: Number of values the buffer must hold
+    :return: ctypes array sharing memory with out
+    """
+    try:
+        view = memoryview(out)
+    except TypeError:
+        raise PYSWMMException("Output must support the buffer protocol")
+    if view.readonly or not view.contiguous:
+        raise PYSWMMException("Output buffer must be writable and contiguous")
+    if view.format not in ('d', '<d', '=d', '@d'):
+        raise PYSWMMException("Output buffer must hold float64 values")
+    if view.nbytes < count * ctypes.sizeof(ctypes.c_double):
+        raise PYSWMMException("Output buffer is too small: {0} < {1}".format(
+            view.nbytes // ctypes.sizeof(ctypes.c_double), count))
+    return (ctypes.c_double * count).from_buffer(out)
+
+
+def _param_setter(swmm_set_func, parameter):
+    """
+    Binds the parameter of a swmm_set*Param function, for _setValues().
+
+    :param swmm_set_func: Engine setter taking (index, parameter, value)
+    :param int parameter: Parameter enum member or code
+    :return: Setter taking (index, value)
+    """
+    if not isinstance(parameter, int):
+        parameter = parameter.value
+
+    def set_param(index, value):
+        return swmm_set_func(index, parameter, value)
+
+    return set_param
+
+
+def _datetime_arg(value):
+    """
+    Formats a datetime for swmm_setSimulationDateTime.
+
+    The engine copies the date (the first 10 characters) into a 10
+    character buffer without a terminator and reads the time from
+    character 11, so a full "mm/dd/yyyy" date is parsed together with
+    whatever follows the buffer on the stack. The date is written
+    unpadded and terminated within 10 characters instead. Dates that
+    still need 10 characters (October to December, day 10 or later) are
+    written as the 9th of the month plus a time past 24 hours, which the
+    engine adds to the date.
+
+    :param datetime value: Date and time to set
+    :return: Engine argument
+    :rtype: bytes
+    """
+    date = '{0}/{1}/{2}'.format(value.month, value.day, value.year)
+    seconds = value.hour * 3600 + value.minute * 60 + value.second
+    if len(date) > 9:
+        seconds += (value.day - 9) * 86400
+        date = '{0}/9/{1}'.format(value.month, value.year)
+    hours, rest = divmod(seconds, 3600)
+    time = '{0}:{1}:{2}'.format(hours, rest // 60, rest % 60)
+    if len(time) > 8:
+        # The time buffer holds 8 characters; decimal hours are within
+        # 0.2 s, which the engine rounds away when decoding
+        decimals = 7 - len(str(hours))
+        time = '{0:.{1}f}'.format(seconds / 3600.0, decimals)
+    return six.b(date.ljust(11, '\0') + time)
+
+
+def _load_swmm_library(swmm_lib_path):
+    """
+    Loads a SWMM library and declares the toolkit function prototypes.
+
+    The prototypes in toolkitapi.SWMM_PROTOTYPES are applied once per
+    library path so ctypes converts arguments natively on every call
+    instead of each wrapper building ctypes objects by hand. Functions not
+    exported by an older engine are skipped.
+
+    :param str swmm_lib_path: SWMM library path
+    :return: Loaded library
+    """
+    swmm_lib_path = os.path.abspath(swmm_lib_path)
+    if swmm_lib_path in _SWMM_LIBRARIES:
+        return _SWMM_LIBRARIES[swmm_lib_path]
+
+    if os.name == 'nt':
+        # Windows Support
+        libobj = ctypes.WinDLL(swmm_lib_path)
+    elif sys.platform == 'darwin':
+        # Mac Osx Support
+        libobj = ctypes.cdll.LoadLibrary(swmm_lib_path)
+    else:
+        # Linux Support
+        libobj = ctypes.CDLL(swmm_lib_path)
+
+    _declare_prototypes(libobj)
+    _SWMM_LIBRARIES[swmm_lib_path] = libobj
+    return libobj
+
+
+def _load_isolated_swmm_library(swmm_lib_path):
+    """
+    Loads a private copy of a SWMM library with its own engine globals.
+
+    On POSIX systems the copy is unlinked as soon as it is mapped; on
+    Windows it is kept until _unload_swmm_library() frees the library.
+
+    :param str swmm_lib_path: SWMM library path
+    :return: (Loaded library, path of the copy still on disk or None)
+    :rtype: tuple
+    """
+    copy_path = isolated_copy(swmm_lib_path)
+    try:
+        if os.name == 'nt':
+            libobj = ctypes.WinDLL(copy_path)
+        else:
+            libobj = ctypes.CDLL(copy_path, mode=ctypes.RTLD_LOCAL)
+    except OSError:
+        os.remove(copy_path)
+        raise
+
+    _declare_prototypes(libobj)
+    if os.name != 'nt':
+        os.remove(copy_path)
+        copy_path = None
+    return libobj, copy_path
+
+
+def _unload_swmm_library(libobj, copy_path):
+    """Frees an isolated SWMM library and removes its copy."""
+    import _ctypes
+    if os.name == 'nt':
+        _ctypes.FreeLibrary(libobj._handle)
+    else:
+        _ctypes.dlclose(libobj._handle)
+    if copy_path is not None and os.path.exists(copy_path):
+        os.remove(copy_path)
+
+
+def _declare_prototypes(libobj):
+    """Applies toolkitapi.SWMM_PROTOTYPES to a loaded library."""
+    for name, (restype, argtypes) in six.iteritems(tka.SWMM_PROTOTYPES):
+        try:
+            func = getattr(libobj, name)
+        except AttributeError:
+            continue
+        func.restype = restype
+        func.argtypes = argtypes
+
+
 class PySWMM(object):
     """
     Wrapper class to lead SWMM DLL object.
@@ -106,38 +300,70 @@ class PySWMM(object):
                  inpfile='',
                  rptfile=None,
                  binfile=None,
-                 swmm_lib_path=None):
+                 swmm_lib_path=None,
+                 isolated=False):
         """
         Initialize the PySWMM object class.
 
         User can specified SWMM library path. Uses default lib if
         not provided.
 
+        With isolated=True the object loads a private copy of the library,
+        so several models can be open side by side in one process. The
+        copy is released by release_library() or when the object is
+        garbage collected.
+
         :param str inpfile: Name of SWMM input file (default '')
         :param str rptfile: Report file to generate (default None)
         :param str binfile: Optional binary output file (default None)
         :param str swmm_lib_path: SWMM library path (default None).
+        :param bool isolated: Load a private library copy (default False)
 
         """
         self.fileLoaded = False
         self.inpfile = inpfile
         self.rptfile = rptfile
         self.binfile = binfile
+        # ID-to-index lookup tables, built per object type after swmm_open
+        self._object_ids = {}
+        self._object_index = {}
+        # Element handles of the Nodes/Links/Subcatchments collections,
+        # a list per object type, dropped with the lookup tables
+        self._elements = {}
+
+        self._swmm_version = None
 
         if not swmm_lib_path:
             swmm_lib_path = DLL_SELECTION()
 
-        if os.name == 'nt':
-            # Windows Support
-            self.SWMMlibobj = ctypes.WinDLL(swmm_lib_path)
-
-        if sys.platform == 'darwin':
-            # Mac Osx Support
-            self.SWMMlibobj = ctypes.cdll.LoadLibrary(swmm_lib_path)
-
-        if sys.platform.startswith('linux'):
-            # Linux Support
-            self.SWMMlibobj = ctypes.CDLL(swmm_lib_path)
+        self.isolated = isolated
+        self._library_finalizer = None
+        if isolated:
+            self.SWMMlibobj, copy_path = _load_isolated_swmm_library(
+                swmm_lib_path)
+            self._library_finalizer = Finalizer(
+                self, _unload_swmm_library, self.SWMMlibobj, copy_path)
+        else:
+            self.SWMMlibobj = _load_swmm_library(swmm_lib_path)
+
+        # Bound handles and reusable output buffers for the per-step calls
+        for name in _BOUND_HANDLES:
+            setattr(self, '_' + name, getattr(self.SWMMlibobj, name))
+        for name in _BULK_GETTERS:
+            setattr(self, '_' + name + '_into',
+                    _address_getter(self.SWMMlibobj, name))
+        self._double = ctypes.c_double()
+        # Output buffers of the other getters; swmm_getSimulationDateTime
+        # needs six integers
+        self._ints = tuple(ctypes.c_int() for _ in range(6))
+        self._byte = ctypes.c_byte()
+        # Per-step result cache, None unless enable_result_cache() is called
+        self._result_cache = None
+        self._result_cache_hits = 0
+        self._result_cache_misses = 0
+        # Elapsed days written by every swmm_step call; reset by swmm_start
+        self._elapsed = ctypes.c_double()
+        self._start_datetime = None
 
     def _error_message(self, errcode):
         """
@@ -147,7 +373,6 @@ class PySWMM(object):
         :return: Error Message from SWMM
         :rtype: str
         """
-        errcode = ctypes.c_int(errcode)
         _errmsg = ctypes.create_string_buffer(257)
         self.SWMMlibobj.swmm_getAPIError(errcode, _errmsg)
         print(_errmsg.value.decode("utf-8"))
@@ -164,7 +389,7 @@ class PySWMM(object):
             raise SWMMException(errcode, self._error_message(errcode))
 
         if errcode != 0 and errcode > 103:
-            print errcode
+            print(errcode)
             warnings.warn(self._error_message(errcode))
 
     def swmmExec(self, inpfile=None, rptfile=None, binfile=None):
@@ -225,8 +450,7 @@ class PySWMM(object):
                 binfile = self.inpfile.replace('.inp', '.out')
 
         self.SWMMlibobj.swmm_run(
-            ctypes.c_char_p(six.b(inpfile)),
-            ctypes.c_char_p(six.b(rptfile)), ctypes.c_char_p(six.b(binfile)))
+            six.b(inpfile), six.b(rptfile), six.b(binfile))
 
     def swmm_open(self, inpfile=None, rptfile=None, binfile=None):
         """
@@ -265,9 +489,9 @@ class PySWMM(object):
                 self.binfile = binfile
 
         errcode = self.SWMMlibobj.swmm_open(
-            ctypes.c_char_p(six.b(inpfile)),
-            ctypes.c_char_p(six.b(rptfile)), ctypes.c_char_p(six.b(binfile)))
+            six.b(inpfile), six.b(rptfile), six.b(binfile))
         self._error_check(errcode)
+        self._clear_object_index()
         self.fileLoaded = True
 
     def swmm_start(self, SaveOut2rpt=False):
@@ -290,8 +514,11 @@ class PySWMM(object):
         >>> swmm_model.swmm_report()
         >>> swmm_model.swmm_close()
         """
-        errcode = self.SWMMlibobj.swmm_start(ctypes.c_bool(SaveOut2rpt))
+        errcode = self.SWMMlibobj.swmm_start(int(SaveOut2rpt))
+        self._invalidate_results()
         self._error_check(errcode)
+        self._elapsed.value = 0.0
+        self._start_datetime = None
 
     def swmm_end(self):
         """
@@ -311,7 +538,10 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         errcode = self.SWMMlibobj.swmm_end()
+        self._invalidate_results()
         self._error_check(errcode)
+        self._elapsed.value = 0.0
+        self._start_datetime = None
 
     def swmm_step(self):
         """
@@ -330,9 +560,10 @@ class PySWMM(object):
         >>> swmm_model.swmm_report()
         >>> swmm_model.swmm_close()
         """
-        elapsed_time = ctypes.c_double()
-        self.SWMMlibobj.swmm_step(ctypes.byref(elapsed_time))
-        return elapsed_time.value
+        self._swmm_step(self._elapsed)
+        if self._result_cache:
+            self._result_cache.clear()
+        return self._elapsed.value
 
     def swmm_stride(self, advanceSeconds):
         """
@@ -361,25 +592,130 @@ class PySWMM(object):
         >>> swmm_model.swmm_report()
         >>> swmm_model.swmm_close()
         """
+        advanceDays = advanceSeconds / 86400.0
+        return self._stride_until(self._elapsed.value + advanceDays,
+                                  advanceDays * 0.00001)
 
-        if not hasattr(self, 'curSimTime'):
-            self.curSimTime = 0.0
+    def swmm_stride_to(self, target):
+        """
+        Advances the simulation to an absolute time.
 
-        ctime = self.curSimTime
+        Steps until the elapsed simulation time reaches the target. The
+        target is a datetime or a number of seconds since the simulation
+        start. When a 0 is returned, the simulation period has reached
+        the end.
 
-        secPday = 3600.0 * 24.0
-        advanceDays = advanceSeconds / secPday
+        :param target: Time to advance to (datetime or elapsed seconds)
+        :return: Current simulation time after the stride in decimal days
+        :rtype: float
 
-        eps = advanceDays * 0.00001
+        Examples:
 
-        while self.curSimTime <= ctime + advanceDays - eps:
-            elapsed_time = ctypes.c_double()
-            self.SWMMlibobj.swmm_step(ctypes.byref(elapsed_time))
-            if elapsed_time.value == 0:
+        >>> swmm_model = PySWMM(r'\\.inp',r'\\.rpt',r'\\.out')
+        >>> swmm_model.swmm_open()
+        >>> swmm_model.swmm_start()
+        >>> swmm_model.swmm_stride_to(datetime(2015, 11, 1, 16, 0))
+        >>> 0.0833...
+        >>> swmm_model.swmm_stride_to(4 * 3600)
+        >>> 0.1666...
+        """
+        if isinstance(target, datetime):
+            if self._start_datetime is None:
+                self._start_datetime = self.getSimulationDateTime(
+                    tka.SimulationTime.StartDateTime.value)
+            target = (target - self._start_datetime).total_seconds()
+        # Stop within a millisecond of the target
+        return self._stride_until(target / 86400.0, 1e-3 / 86400.0)
+
+    def _stride_until(self, targetDays, eps):
+        """
+        Steps until the elapsed time is within eps of targetDays.
+
+        :param float targetDays: Target elapsed time in decimal days
+        :param float eps: Tolerance in decimal days
+        :return: Elapsed time in decimal days (0.0 at the end of the run)
+        :rtype: float
+        """
+        swmm_step = self._swmm_step
+        elapsed_time = self._elapsed
+        limit = targetDays - eps
+        if self._result_cache:
+            self._result_cache.clear()
+        while elapsed_time.value <= limit:
+            swmm_step(elapsed_time)
+            if elapsed_time.value == 0.0:
                 return 0.0
-            self.curSimTime = elapsed_time.value
         return elapsed_time.value
 
+    @property
+    def curSimTime(self):
+        """Elapsed simulation time in decimal days after the last step."""
+        return self._elapsed.value
+
+    def enable_result_cache(self):
+        """
+        Caches the single-element result getters until the next step.
+
+        getNodeResult(), getLinkResult(), getSubcatchResult() and their
+        ByIndex variants then read each (element, result) from the engine
+        once per step. The cache is cleared by swmm_step(), swmm_stride(),
+        swmm_stride_to(), swmm_start(), swmm_end(), swmm_close() and every
+        setter of this class. Setting values through the library directly
+        is not tracked.
+
+        Examples:
+
+        >>> swmm_model = PySWMM(r'\\.inp',r'\\.rpt',r'\\.out')
+        >>> swmm_model.swmm_open()
+        >>> swmm_model.enable_result_cache()
+        >>> swmm_model.swmm_start()
+        >>> DEPTH = NodeResults.newDepth.value
+        >>> while(True):
+        ...     time = swmm_model.swmm_step()
+        ...     depth = swmm_model.getNodeResult('J1', DEPTH)
+        ...     depth = swmm_model.getNodeResult('J1', DEPTH)
+        ...     if (time <= 0.0): break
+        >>> swmm_model.result_cache_stats()
+        >>> {'hits': 2000, 'misses': 2000, 'size': 1}
+        """
+        if self._result_cache is None:
+            self._result_cache = {}
+            self._result_cache_hits = 0
+            self._result_cache_misses = 0
+
+    def disable_result_cache(self):
+        """Stops caching results (see enable_result_cache())."""
+        self._result_cache = None
+
+    def result_cache_stats(self):
+        """
+        Result cache counters since enable_result_cache().
+
+        :return: {'hits': int, 'misses': int, 'size': cached values}
+        :rtype: dict
+        """
+        return {
+            'hits': self._result_cache_hits,
+            'misses': self._result_cache_misses,
+            'size': len(self._result_cache or ()),
+        }
+
+    def _invalidate_results(self):
+        """Internal Method: drops the cached results of the current step."""
+        if self._result_cache:
+            self._result_cache.clear()
+
+    def _cacheResult(self, swmm_result_func, key):
+        """Internal Method: reads a result missing from the cache."""
+        self._result_cache_misses += 1
+        errcode = swmm_result_func(key[1], key[2], self._double)
+        if errcode:
+            # Not cached, so the error is reported on every read
+            self._error_check(errcode)
+            return self._double.value
+        value = self._result_cache[key] = self._double.value
+        return value
+
     def swmm_report(self):
         """
         Copies Time Series results from .out to .rpt file.
@@ -419,9 +755,40 @@ class PySWMM(object):
         """
 
         errcode = self.SWMMlibobj.swmm_close()
+        self._clear_object_index()
+        self._invalidate_results()
         self._error_check(errcode)
         self.fileLoaded = False
 
+    def release_library(self):
+        """
+        Frees the private library copy of an isolated model.
+
+        Does nothing for a model that uses the shared library. The model
+        must be closed first and cannot be used afterwards.
+
+        Examples:
+
+        >>> swmm_model = PySWMM(r'\\.inp', isolated=True)
+        >>> swmm_model.swmm_open()
+        >>> swmm_model.swmmExec()
+        >>> swmm_model.swmm_close()
+        >>> swmm_model.release_library()
+        """
+        if self._library_finalizer is None:
+            return
+        if self.fileLoaded:
+            raise PYSWMMException("Close the model before releasing "
+                                  "its library")
+        self._library_finalizer()
+        self._library_finalizer = None
+        self.SWMMlibobj = None
+        # The bound handles point into the unmapped library
+        for name in _BOUND_HANDLES:
+            setattr(self, '_' + name, _library_released)
+        for name in _BULK_GETTERS:
+            setattr(self, '_' + name + '_into', _library_released)
+
     def swmm_getVersion(self):
         """
         Retrieves version number of current SWMM engine.
@@ -432,16 +799,18 @@ class PySWMM(object):
         :return: version number of the DLL source code
         :rtype: int
         """
-        major = ctypes.create_string_buffer(100)
-        minor = ctypes.create_string_buffer(100)
-        patch = ctypes.create_string_buffer(100)
-        self.SWMMlibobj.swmm_getVersionInfo(
-            ctypes.byref(major), ctypes.byref(minor), ctypes.byref(patch))
-        ver = [
-            major.value.decode("utf-8"), minor.value.decode("utf-8"),
-            patch.value.decode("utf-8")
-        ]
-        return distutils.version.LooseVersion('.'.join(ver))
+        if self._swmm_version is None:
+            major = ctypes.create_string_buffer(100)
+            minor = ctypes.create_string_buffer(100)
+            patch = ctypes.create_string_buffer(100)
+            self.SWMMlibobj.swmm_getVersionInfo(major, minor, patch)
+            ver = [
+                major.value.decode("utf-8"), minor.value.decode("utf-8"),
+                patch.value.decode("utf-8")
+            ]
+            self._swmm_version = distutils.version.LooseVersion(
+                '.'.join(ver))
+        return self._swmm_version
 
     def swmm_getMassBalErr(self):
         """
@@ -483,15 +852,15 @@ class PySWMM(object):
         >>>
         >>> swmm_model.swmm_close()
         """
-        _year = ctypes.c_int()
-        _month = ctypes.c_int()
-        _day = ctypes.c_int()
-        _hours = ctypes.c_int()
-        _minutes = ctypes.c_int()
-        _seconds = ctypes.c_int()
+        _year = self._ints[0]
+        _month = self._ints[1]
+        _day = self._ints[2]
+        _hours = self._ints[3]
+        _minutes = self._ints[4]
+        _seconds = self._ints[5]
 
         errcode = self.SWMMlibobj.swmm_getSimulationDateTime(
-            ctypes.c_int(timeType),
+            timeType,
             ctypes.byref(_year),
             ctypes.byref(_month),
             ctypes.byref(_day),
@@ -515,10 +884,9 @@ class PySWMM(object):
                                              datetime(2009, 10, 1, 12,30))
         >>>
         """
-        dtme = ctypes.create_string_buffer(
-            six.b(newDateTime.strftime("%m/%d/%Y %H:%M:%S")))
+        dtme = ctypes.create_string_buffer(_datetime_arg(newDateTime))
         errcode = self.SWMMlibobj.swmm_setSimulationDateTime(
-            ctypes.c_int(timeType), dtme)
+            timeType, dtme)
         self._error_check(errcode)
 
     def getSimUnit(self, unittype):
@@ -537,7 +905,7 @@ class PySWMM(object):
         >>> CFS
         >>> swmm_model.swmm_close()
         """
-        value = ctypes.c_int()
+        value = self._ints[0]
         errcode = self.SWMMlibobj.swmm_getSimulationUnit(unittype,
                                                          ctypes.byref(value))
         self._error_check(errcode)
@@ -566,7 +934,7 @@ class PySWMM(object):
         >>> False
         >>> swmm_model.swmm_close()
         """
-        value = ctypes.c_int()
+        value = self._ints[0]
         errcode = self.SWMMlibobj.swmm_getSimulationAnalysisSetting(
             settingtype, ctypes.byref(value))
         self._error_check(errcode)
@@ -588,7 +956,7 @@ class PySWMM(object):
         >>> 300
         >>> swmm_model.swmm_close()
         """
-        value = ctypes.c_double()
+        value = self._double
         errcode = self.SWMMlibobj.swmm_getSimulationParam(paramtype,
                                                           ctypes.byref(value))
         self._error_check(errcode)
@@ -610,7 +978,7 @@ class PySWMM(object):
         >>> 10
         >>> swmm_model.swmm_close()
         """
-        count = ctypes.c_int()
+        count = self._ints[0]
         errcode = self.SWMMlibobj.swmm_countObjects(objecttype,
                                                     ctypes.byref(count))
         self._error_check(errcode)
@@ -634,12 +1002,68 @@ class PySWMM(object):
         >>>
         >>> swmm_model.swmm_close()
         """
+        if objecttype in self._object_ids:
+            ids = self._object_ids[objecttype]
+            # A negative index would count from the end of the list
+            if not 0 <= index < len(ids):
+                raise PYSWMMException(
+                    "Object index {} is out of range".format(index))
+            return ids[index]
+        return self._getObjectIdFromEngine(objecttype, index)
+
+    def _getObjectIdFromEngine(self, objecttype, index):
+        """Internal Method: reads an Object ID name from the engine."""
         ID = ctypes.create_string_buffer(61)
-        errcode = self.SWMMlibobj.swmm_getObjectId(objecttype, index,
-                                                   ctypes.byref(ID))
+        errcode = self.SWMMlibobj.swmm_getObjectId(objecttype, index, ID)
         self._error_check(errcode)
         return ID.value.decode("utf-8")
 
+    def _build_object_index(self, objecttype):
+        """
+        Internal Method: builds the ID lookup tables for an object type.
+
+        The tables are built once per object type while the model is open
+        and are dropped by swmm_close().
+
+        :param int objecttype: (member variable)
+        :return: ID to index dictionary
+        :rtype: dict
+        """
+        ids = [
+            self._getObjectIdFromEngine(objecttype, index)
+            for index in range(self.getProjectSize(objecttype))
+        ]
+        self._object_ids[objecttype] = ids
+        # SWMM IDs are case-insensitive: the upper-case keys catch any
+        # other spelling, the exact ones keep the common case to one get
+        lookup = dict((ID.upper(), index) for index, ID in enumerate(ids))
+        lookup.update((ID, index) for index, ID in enumerate(ids))
+        self._object_index[objecttype] = lookup
+        return lookup
+
+    def _findObjectIndex(self, objecttype, ID):
+        """
+        Internal Method: index of an ID in any letter case, or None.
+
+        :param int objecttype: (member variable)
+        :param str ID: Object ID
+        :rtype: int
+        """
+        index = self._object_index.get(objecttype)
+        if index is None:
+            index = self._build_object_index(objecttype)
+        if ID in index:
+            return index[ID]
+        if isinstance(ID, six.string_types):
+            return index.get(ID.upper())
+        return None
+
+    def _clear_object_index(self):
+        """Internal Method: drops the ID lookup tables."""
+        self._object_ids = {}
+        self._object_index = {}
+        self._elements = {}
+
     def getObjectIDList(self, objecttype):
         """
         Get Object ID list.
@@ -656,28 +1080,57 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         >>>
         """
-        IDS = []
-        for index in range(self.getProjectSize(objecttype)):
-            IDS.append(self.getObjectId(objecttype, index))
-        return IDS
+        if objecttype not in self._object_ids:
+            self._build_object_index(objecttype)
+        return list(self._object_ids[objecttype])
 
     def getObjectIDIndex(self, objecttype, ID):
-        """Get Object ID Index. Mostly used as an internal function."""
-        C_ID = ctypes.c_char_p(six.b(ID))
-        index = self.SWMMlibobj.project_findObject(objecttype, C_ID)
-        if index != -1:
+        """
+        Get Object ID Index. Mostly used as an internal function.
+
+        The lookup is served from an ID index that is built on first use
+        after swmm_open() and dropped by swmm_close(). As in SWMM, IDs
+        match in any letter case.
+
+        :param int objecttype: (member variable)
+        :param str ID: Object ID
+        :return: Object Index
+        :rtype: int
+        """
+        try:
+            return self._object_index[objecttype][ID]
+        except KeyError:
+            index = self._findObjectIndex(objecttype, ID)
+            if index is None:
+                raise Exception("ID Does Not Exist")
             return index
-        else:
-            raise Exception("ID Does Not Exist")
+
+    def getObjectIDIndices(self, objecttype, IDs):
+        """
+        Get Object ID Indices for a sequence of IDs.
+
+        Resolve the IDs once and pass the indices to the index based
+        getters and setters to skip string handling in hot loops.
+
+        :param int objecttype: (member variable)
+        :param list IDs: Object IDs
+        :return: Object Indices
+        :rtype: list
+
+        Examples:
+
+        >>> swmm_model = PySWMM(r'\\.inp',r'\\.rpt',r'\\.out')
+        >>> swmm_model.swmm_open()
+        >>> swmm_model.getObjectIDIndices(ObjectType.NODE, ['J1', 'J2'])
+        >>> [0, 1]
+        >>>
+        >>> swmm_model.swmm_close()
+        """
+        return [self.getObjectIDIndex(objecttype, ID) for ID in IDs]
 
     def ObjectIDexist(self, objecttype, ID):
         """Check if Object ID Exists. Mostly used as an internal function."""
-        C_ID = ctypes.c_char_p(six.b(ID))
-        index = self.SWMMlibobj.project_findObject(objecttype, C_ID)
-        if index != -1:
-            return True
-        else:
-            return False
+        return self._findObjectIndex(objecttype, ID) is not None
 
     def getNodeType(self, ID):
         """
@@ -700,7 +1153,17 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        Ntype = ctypes.c_int()
+        return self.getNodeTypeByIndex(index)
+
+    def getNodeTypeByIndex(self, index):
+        """
+        Get Node Type by node index (see getNodeType()).
+
+        :param int index: Node Index
+        :return: Node Type
+        :rtype: int
+        """
+        Ntype = self._ints[0]
         errcode = self.SWMMlibobj.swmm_getNodeType(index, ctypes.byref(Ntype))
         self._error_check(errcode)
         return Ntype.value
@@ -726,7 +1189,17 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.LINK.value, ID)
-        Ltype = ctypes.c_int()
+        return self.getLinkTypeByIndex(index)
+
+    def getLinkTypeByIndex(self, index):
+        """
+        Get Link Type by link index (see getLinkType()).
+
+        :param int index: Link Index
+        :return: Link Type
+        :rtype: int
+        """
+        Ltype = self._ints[0]
         errcode = self.SWMMlibobj.swmm_getLinkType(index, ctypes.byref(Ltype))
         self._error_check(errcode)
         return Ltype.value
@@ -757,24 +1230,32 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.LINK.value, ID)
+        upstream, downstream = self.getLinkConnectionsByIndex(index)
+        return (self.getObjectId(tka.ObjectType.NODE.value, upstream),
+                self.getObjectId(tka.ObjectType.NODE.value, downstream))
 
-        USNodeIND = ctypes.c_int()
-        DSNodeIND = ctypes.c_int()
+    def getLinkConnectionsByIndex(self, index):
+        """
+        Get Link Connections by link index (see getLinkConnections()).
 
+        :param int index: Link Index
+        :return: (Upstream Node Index, Downstream Node Index)
+        :rtype: tuple
+        """
+        USNodeIND = self._ints[0]
+        DSNodeIND = self._ints[1]
         errcode = self.SWMMlibobj.swmm_getLinkConnections(
             index, ctypes.byref(USNodeIND), ctypes.byref(DSNodeIND))
         self._error_check(errcode)
 
-        USNodeID = self.getObjectId(tka.ObjectType.NODE.value, USNodeIND.value)
-        DSNodeID = self.getObjectId(tka.ObjectType.NODE.value, DSNodeIND.value)
-
-        if self._getLinkDirection(ID) == 1:
-            # Return Tuple of Upstream and Downstream Node IDS
-            return (USNodeID, DSNodeID)
+        direction = self._byte
+        errcode = self.SWMMlibobj.swmm_getLinkDirection(
+            index, ctypes.byref(direction))
+        self._error_check(errcode)
         # link validations reverse the conduit direction if the slope is < 0
-        elif self._getLinkDirection(ID) == -1:
-            # Return Tuple of Upstream and Downstream Node IDS
-            return (DSNodeID, USNodeID)
+        if direction.value == -1:
+            return (DSNodeIND.value, USNodeIND.value)
+        return (USNodeIND.value, DSNodeIND.value)
 
     def _getLinkDirection(self, ID):
         """
@@ -786,7 +1267,7 @@ class PySWMM(object):
         :rtype: int
         """
         index = self.getObjectIDIndex(tka.ObjectType.LINK.value, ID)
-        direction = ctypes.c_byte()
+        direction = self._byte
         errcode = self.SWMMlibobj.swmm_getLinkDirection(
             index, ctypes.byref(direction))
         self._error_check(errcode)
@@ -811,7 +1292,18 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        param = ctypes.c_double()
+        return self.getNodeParamByIndex(index, parameter)
+
+    def getNodeParamByIndex(self, index, parameter):
+        """
+        Get Node Parameter by node index (see getNodeParam()).
+
+        :param int index: Node Index
+        :param int parameter: Paramter (toolkitapi.NodeParams member variable)
+        :return: Paramater Value
+        :rtype: float
+        """
+        param = self._double
         if not isinstance(parameter, int):
             parameter = parameter.value
         errcode = self.SWMMlibobj.swmm_getNodeParam(index, parameter,
@@ -835,9 +1327,20 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
+        self.setNodeParamByIndex(index, parameter, value)
+
+    def setNodeParamByIndex(self, index, parameter, value):
+        """
+        Set Node Parameter by node index (see setNodeParam()).
+
+        :param int index: Node Index
+        :param int parameter: Paramter (toolkitapi.NodeParams member variable)
+        :param float value: New Parameter Value
+        """
         _val = ctypes.c_double(value)
         if not isinstance(parameter, int):
             parameter = parameter.value
+        self._invalidate_results()
         errcode = self.SWMMlibobj.swmm_setNodeParam(index, parameter, _val)
         self._error_check(errcode)
 
@@ -860,7 +1363,18 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.LINK.value, ID)
-        param = ctypes.c_double()
+        return self.getLinkParamByIndex(index, parameter)
+
+    def getLinkParamByIndex(self, index, parameter):
+        """
+        Get Link Parameter by link index (see getLinkParam()).
+
+        :param int index: Link Index
+        :param int parameter: Paramter (toolkitapi.LinkParams member variable)
+        :return: Paramater Value
+        :rtype: float
+        """
+        param = self._double
         if not isinstance(parameter, int):
             parameter = parameter.value
         errcode = self.SWMMlibobj.swmm_getLinkParam(index, parameter,
@@ -884,9 +1398,20 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.LINK.value, ID)
+        self.setLinkParamByIndex(index, parameter, value)
+
+    def setLinkParamByIndex(self, index, parameter, value):
+        """
+        Set Link Parameter by link index (see setLinkParam()).
+
+        :param int index: Link Index
+        :param int parameter: Paramter (toolkitapi.LinkParams member variable)
+        :param float value: New Parameter Value
+        """
         _val = ctypes.c_double(value)
         if not isinstance(parameter, int):
             parameter = parameter.value
+        self._invalidate_results()
         errcode = self.SWMMlibobj.swmm_setLinkParam(index, parameter, _val)
         self._error_check(errcode)
 
@@ -909,7 +1434,19 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.SUBCATCH.value, ID)
-        param = ctypes.c_double()
+        return self.getSubcatchParamByIndex(index, parameter)
+
+    def getSubcatchParamByIndex(self, index, parameter):
+        """
+        Get Subcatchment Parameter by subcatchment index
+        (see getSubcatchParam()).
+
+        :param int index: Subcatchment Index
+        :param int parameter: Paramter (toolkitapi.SubcParams member variable)
+        :return: Paramater Value
+        :rtype: float
+        """
+        param = self._double
         if not isinstance(parameter, int):
             parameter = parameter.value
         errcode = self.SWMMlibobj.swmm_getSubcatchParam(index, parameter,
@@ -933,9 +1470,21 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.SUBCATCH.value, ID)
+        self.setSubcatchParamByIndex(index, parameter, value)
+
+    def setSubcatchParamByIndex(self, index, parameter, value):
+        """
+        Set Subcatchment Parameter by subcatchment index
+        (see setSubcatchParam()).
+
+        :param int index: Subcatchment Index
+        :param int parameter: Paramter (toolkitapi.SubcParams member variable)
+        :param float value: New Parameter Value
+        """
         _val = ctypes.c_double(value)
         if not isinstance(parameter, int):
             parameter = parameter.value
+        self._invalidate_results()
         errcode = self.SWMMlibobj.swmm_setSubcatchParam(index, parameter, _val)
         self._error_check(errcode)
 
@@ -968,21 +1517,32 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.SUBCATCH.value, ID)
-        TYPELoadSurface = ctypes.c_int()
-        outindex = ctypes.c_int()
-        errcode = self.SWMMlibobj.swmm_getSubcatchOutConnection(
-            index, ctypes.byref(TYPELoadSurface), ctypes.byref(outindex))
-        self._error_check(errcode)
+        surface, outindex = self.getSubcatchOutConnectionByIndex(index)
 
-        if TYPELoadSurface.value == tka.ObjectType.NODE.value:
-            LoadID = self.getObjectId(tka.ObjectType.NODE.value,
-                                      outindex.value)
+        if surface == tka.ObjectType.NODE.value:
+            LoadID = self.getObjectId(tka.ObjectType.NODE.value, outindex)
 
-        if TYPELoadSurface.value == tka.ObjectType.SUBCATCH.value:
+        if surface == tka.ObjectType.SUBCATCH.value:
             LoadID = self.getObjectId(tka.ObjectType.SUBCATCH.value,
-                                      outindex.value)
+                                      outindex)
+
+        return (surface, LoadID)
 
-        return (TYPELoadSurface.value, LoadID)
+    def getSubcatchOutConnectionByIndex(self, index):
+        """
+        Get Subcatchment Outlet Connection by subcatchment index (see
+        getSubcatchOutConnection()).
+
+        :param int index: Subcatchment Index
+        :return: (Loading Surface Type, Node or Subcatchment Index)
+        :rtype: tuple
+        """
+        TYPELoadSurface = self._ints[0]
+        outindex = self._ints[1]
+        errcode = self.SWMMlibobj.swmm_getSubcatchOutConnection(
+            index, ctypes.byref(TYPELoadSurface), ctypes.byref(outindex))
+        self._error_check(errcode)
+        return (TYPELoadSurface.value, outindex.value)
 
     # --- Active Simulation Result "Getters"
     # -------------------------------------------------------------------------
@@ -1053,11 +1613,28 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        result = ctypes.c_double()
-        errcode = self.SWMMlibobj.swmm_getNodeResult(index, resultType,
-                                                     ctypes.byref(result))
-        self._error_check(errcode)
-        return result.value
+        return self.getNodeResultByIndex(index, resultType)
+
+    def getNodeResultByIndex(self, index, resultType):
+        """
+        Get Node Result by node index (see getNodeResult()).
+
+        :param int index: Node Index
+        :param int resultType: Result (toolkitapi.NodeResults member variable)
+        :return: Result Value
+        :rtype: float
+        """
+        cache = self._result_cache
+        if cache is not None:
+            key = (_NODE, index, resultType)
+            if key in cache:
+                self._result_cache_hits += 1
+                return cache[key]
+            return self._cacheResult(self._swmm_getNodeResult, key)
+        errcode = self._swmm_getNodeResult(index, resultType, self._double)
+        if errcode:
+            self._error_check(errcode)
+        return self._double.value
 
     def getLinkResult(self, ID, resultType):
         """
@@ -1088,11 +1665,28 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.LINK.value, ID)
-        result = ctypes.c_double()
-        errcode = self.SWMMlibobj.swmm_getLinkResult(index, resultType,
-                                                     ctypes.byref(result))
-        self._error_check(errcode)
-        return result.value
+        return self.getLinkResultByIndex(index, resultType)
+
+    def getLinkResultByIndex(self, index, resultType):
+        """
+        Get Link Result by link index (see getLinkResult()).
+
+        :param int index: Link Index
+        :param int resultType: Result (toolkitapi.LinkResults member variable)
+        :return: Result Value
+        :rtype: float
+        """
+        cache = self._result_cache
+        if cache is not None:
+            key = (_LINK, index, resultType)
+            if key in cache:
+                self._result_cache_hits += 1
+                return cache[key]
+            return self._cacheResult(self._swmm_getLinkResult, key)
+        errcode = self._swmm_getLinkResult(index, resultType, self._double)
+        if errcode:
+            self._error_check(errcode)
+        return self._double.value
 
     def getSubcatchResult(self, ID, resultType):
         """
@@ -1123,12 +1717,204 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.SUBCATCH.value, ID)
-        result = ctypes.c_double()
-        errcode = self.SWMMlibobj.swmm_getSubcatchResult(index, resultType,
-                                                         ctypes.byref(result))
-        self._error_check(errcode)
+        return self.getSubcatchResultByIndex(index, resultType)
 
-        return result.value
+    def getSubcatchResultByIndex(self, index, resultType):
+        """
+        Get Subcatchment Result by subcatchment index
+        (see getSubcatchResult()).
+
+        :param int index: Subcatchment Index
+        :param int resultType: Result (toolkitapi.SubcResults member variable)
+        :return: Result Value
+        :rtype: float
+        """
+        cache = self._result_cache
+        if cache is not None:
+            key = (_SUBCATCH, index, resultType)
+            if key in cache:
+                self._result_cache_hits += 1
+                return cache[key]
+            return self._cacheResult(self._swmm_getSubcatchResult, key)
+        errcode = self._swmm_getSubcatchResult(index, resultType, self._double)
+        if errcode:
+            self._error_check(errcode)
+        return self._double.value
+
+    def getNodeResults(self, resultType, indices=None, out=None):
+        """
+        Get Node Result for many nodes in one call.
+
+        Results are written into a float64 array (or any writable buffer
+        of doubles) instead of being returned one Python float at a time.
+
+        :param int resultType: Result (toolkitapi.NodeResults member variable)
+        :param list indices: Node indices (default None for all nodes)
+        :param out: Preallocated float64 buffer (default None allocates a
+                    new numpy array)
+        :return: Result Values in the order of indices
+        :rtype: numpy.ndarray
+
+        Examples:
+
+        >>> swmm_model = PySWMM(r'\\.inp',r'\\.rpt',r'\\.out')
+        >>> swmm_model.swmm_open()
+        >>> swmm_model.swmm_start()
+        >>> depths = numpy.zeros(swmm_model.getProjectSize(ObjectType.NODE))
+        >>> while(True):
+        ...     time = swmm_model.swmm_step()
+        ...     swmm_model.getNodeResults(NodeResults.newDepth, out=depths)
+        ...     if (time <= 0.0): break
+        ...
+        >>> swmm_model.swmm_end()
+        >>> swmm_model.swmm_close()
+        """
+        return self._getResults(self._swmm_getNodeResult_into,
+                                tka.ObjectType.NODE.value, resultType,
+                                indices, out)
+
+    def getLinkResults(self, resultType, indices=None, out=None):
+        """
+        Get Link Result for many links in one call (see getNodeResults()).
+
+        :param int resultType: Result (toolkitapi.LinkResults member variable)
+        :param list indices: Link indices (default None for all links)
+        :param out: Preallocated float64 buffer (default None allocates a
+                    new numpy array)
+        :return: Result Values in the order of indices
+        :rtype: numpy.ndarray
+        """
+        return self._getResults(self._swmm_getLinkResult_into,
+                                tka.ObjectType.LINK.value, resultType,
+                                indices, out)
+
+    def getSubcatchResults(self, resultType, indices=None, out=None):
+        """
+        Get Subcatchment Result for many subcatchments in one call
+        (see getNodeResults()).
+
+        :param int resultType: Result (toolkitapi.SubcResults member variable)
+        :param list indices: Subcatchment indices (default None for all
+                             subcatchments)
+        :param out: Preallocated float64 buffer (default None allocates a
+                    new numpy array)
+        :return: Result Values in the order of indices
+        :rtype: numpy.ndarray
+        """
+        return self._getResults(self._swmm_getSubcatchResult_into,
+                                tka.ObjectType.SUBCATCH.value, resultType,
+                                indices, out)
+
+    def getNodeParams(self, parameter, indices=None, out=None):
+        """
+        Get Node Parameter for many nodes in one call (see getNodeParam()).
+
+        :param int parameter: Paramter (toolkitapi.NodeParams member variable)
+        :param list indices: Node indices (default None for all nodes)
+        :param out: Preallocated float64 buffer (default None allocates a
+                    new numpy array)
+        :return: Parameter Values in the order of indices
+        :rtype: numpy.ndarray
+
+        Examples:
+
+        >>> swmm_model = PySWMM(r'\\.inp',r'\\.rpt',r'\\.out')
+        >>> swmm_model.swmm_open()
+        >>> swmm_model.getNodeParams(NodeParams.invertElev)
+        >>> array([20.728, 13.392,  6.547, 0.   ])
+        >>>
+        >>> swmm_model.swmm_close()
+        """
+        return self._getResults(self._swmm_getNodeParam_into,
+                                tka.ObjectType.NODE.value, parameter,
+                                indices, out)
+
+    def getLinkParams(self, parameter, indices=None, out=None):
+        """
+        Get Link Parameter for many links in one call (see getLinkParam()).
+
+        :param int parameter: Paramter (toolkitapi.LinkParams member variable)
+        :param list indices: Link indices (default None for all links)
+        :param out: Preallocated float64 buffer (default None allocates a
+                    new numpy array)
+        :return: Parameter Values in the order of indices
+        :rtype: numpy.ndarray
+        """
+        return self._getResults(self._swmm_getLinkParam_into,
+                                tka.ObjectType.LINK.value, parameter,
+                                indices, out)
+
+    def getSubcatchParams(self, parameter, indices=None, out=None):
+        """
+        Get Subcatchment Parameter for many subcatchments in one call
+        (see getSubcatchParam()).
+
+        :param int parameter: Paramter (toolkitapi.SubcParams member variable)
+        :param list indices: Subcatchment indices (default None for all
+                             subcatchments)
+        :param out: Preallocated float64 buffer (default None allocates a
+                    new numpy array)
+        :return: Parameter Values in the order of indices
+        :rtype: numpy.ndarray
+        """
+        return self._getResults(self._swmm_getSubcatchParam_into,
+                                tka.ObjectType.SUBCATCH.value, parameter,
+                                indices, out)
+
+    def paramSupported(self, objecttype, parameter):
+        """
+        Whether the engine reads a node, link or subcatchment parameter.
+
+        Parameters missing from an engine build fail for every element,
+        so the first element is probed, without reporting the error.
+
+        :param int objecttype: ObjectType.NODE, LINK or SUBCATCH (member
+                               variable)
+        :param int parameter: Parameter (toolkitapi.NodeParams, LinkParams
+                              or SubcParams member variable)
+        :return: False as well when there is no element to probe
+        :rtype: bool
+        """
+        objecttype = getattr(objecttype, 'value', objecttype)
+        parameter = getattr(parameter, 'value', parameter)
+        if not self.getProjectSize(objecttype):
+            return False
+        swmm_get_func = {
+            _NODE: self.SWMMlibobj.swmm_getNodeParam,
+            _LINK: self.SWMMlibobj.swmm_getLinkParam,
+            _SUBCATCH: self.SWMMlibobj.swmm_getSubcatchParam,
+        }[objecttype]
+        return swmm_get_func(0, parameter, self._double) == 0
+
+    def _getResults(self, swmm_result_func, objecttype, resultType, indices,
+                    out):
+        """
+        Internal Method: fills a double buffer with one result per index.
+
+        The first engine error is reported once after the loop so a
+        warning (e.g. simulation not running) is not repeated per element.
+        """
+        if not isinstance(resultType, int):
+            resultType = resultType.value
+        if indices is None:
+            indices = range(self.getProjectSize(objecttype))
+        else:
+            indices = [int(index) for index in indices]
+        count = len(indices)
+        if out is None:
+            out = np.zeros(count, dtype=np.float64)
+        values = _double_buffer(out, count)
+
+        first_error = 0
+        # The engine writes straight into the output buffer
+        address = ctypes.addressof(values)
+        addresses = range(address, address + 8 * count, 8)
+        for index, value_address in zip(indices, addresses):
+            errcode = swmm_result_func(index, resultType, value_address)
+            if errcode and not first_error:
+                first_error = errcode
+        self._error_check(first_error)
+        return out
 
     def node_statistics(self, ID):
         """
@@ -1142,16 +1928,9 @@ class PySWMM(object):
 
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getNodeStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.NodeStats)
-        # Define argument.
-        swmm_stats_func.argtypes = (
-            ctypes.c_int,
-            swmm_stats_func_arg, )
 
         object_stats = tka.NodeStats()
-        errcode = swmm_stats_func(
-            ctypes.c_int(index), ctypes.byref(object_stats))
+        errcode = swmm_stats_func(index, ctypes.byref(object_stats))
 
         self._error_check(errcode)
         # Copy Items to Dictionary using Alias Names.
@@ -1171,7 +1950,7 @@ class PySWMM(object):
         :rtype: float
         """
         index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        result = ctypes.c_double()
+        result = self._double
         errcode = self.SWMMlibobj.swmm_getNodeTotalInflow(index,
                                                           ctypes.byref(result))
         self._error_check(errcode)
@@ -1189,16 +1968,9 @@ class PySWMM(object):
 
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getStorageStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.StorageStats)
-        # Define argument.
-        swmm_stats_func.argtypes = (
-            ctypes.c_int,
-            swmm_stats_func_arg, )
 
         object_stats = tka.StorageStats()
-        errcode = swmm_stats_func(
-            ctypes.c_int(index), ctypes.byref(object_stats))
+        errcode = swmm_stats_func(index, ctypes.byref(object_stats))
 
         self._error_check(errcode)
         # Copy Items to Dictionary using Alias Names.
@@ -1221,16 +1993,9 @@ class PySWMM(object):
 
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getOutfallStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.OutfallStats)
-        # Define argument.
-        swmm_stats_func.argtypes = (
-            ctypes.c_int,
-            swmm_stats_func_arg, )
 
         object_stats = tka.OutfallStats()
-        errcode = swmm_stats_func(
-            ctypes.c_int(index), ctypes.byref(object_stats))
+        errcode = swmm_stats_func(index, ctypes.byref(object_stats))
 
         self._error_check(errcode)
         # Copy Items to Dictionary using Alias Names.
@@ -1252,9 +2017,7 @@ class PySWMM(object):
                         object_stats, attr)
 
         # Free Outfall Stats Pollutant Array.
-        freeoutfallstats = self.SWMMlibobj.swmm_freeOutfallStats
-        freeoutfallstats.argtypes = (swmm_stats_func_arg, )
-        freeoutfallstats(object_stats)
+        self.SWMMlibobj.swmm_freeOutfallStats(object_stats)
 
         return out_dict
 
@@ -1270,16 +2033,9 @@ class PySWMM(object):
 
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getLinkStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.LinkStats)
-        # Define argument.
-        swmm_stats_func.argtypes = (
-            ctypes.c_int,
-            swmm_stats_func_arg, )
 
         object_stats = tka.LinkStats()
-        errcode = swmm_stats_func(
-            ctypes.c_int(index), ctypes.byref(object_stats))
+        errcode = swmm_stats_func(index, ctypes.byref(object_stats))
 
         self._error_check(errcode)
         # Copy Items to Dictionary using Alias Names.
@@ -1312,16 +2068,9 @@ class PySWMM(object):
 
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getPumpStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.PumpStats)
-        # Define argument.
-        swmm_stats_func.argtypes = (
-            ctypes.c_int,
-            swmm_stats_func_arg, )
 
         object_stats = tka.PumpStats()
-        errcode = swmm_stats_func(
-            ctypes.c_int(index), ctypes.byref(object_stats))
+        errcode = swmm_stats_func(index, ctypes.byref(object_stats))
 
         self._error_check(errcode)
         # Copy Items to Dictionary using Alias Names.
@@ -1347,16 +2096,9 @@ class PySWMM(object):
 
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getSubcatchStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.SubcStats)
-        # Define argument.
-        swmm_stats_func.argtypes = (
-            ctypes.c_int,
-            swmm_stats_func_arg, )
 
         object_stats = tka.SubcStats()
-        errcode = swmm_stats_func(
-            ctypes.c_int(index), ctypes.byref(object_stats))
+        errcode = swmm_stats_func(index, ctypes.byref(object_stats))
 
         self._error_check(errcode)
         # Copy Items to Dictionary using Alias Names.
@@ -1378,9 +2120,7 @@ class PySWMM(object):
                         object_stats, attr)
 
         # Free Subcatchment Stats Pollutant Array.
-        freesubcatchstats = self.SWMMlibobj.swmm_freeSubcatchStats
-        freesubcatchstats.argtypes = (swmm_stats_func_arg, )
-        freesubcatchstats(object_stats)
+        self.SWMMlibobj.swmm_freeSubcatchStats(object_stats)
 
         return out_dict
 
@@ -1393,10 +2133,6 @@ class PySWMM(object):
         """
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getSystemRoutingStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.RoutingTotals)
-        # Define argument.
-        swmm_stats_func.argtypes = (swmm_stats_func_arg, )
 
         object_stats = tka.RoutingTotals()
         errcode = swmm_stats_func(ctypes.byref(object_stats))
@@ -1420,10 +2156,6 @@ class PySWMM(object):
         """
         # SWMM function handle.
         swmm_stats_func = self.SWMMlibobj.swmm_getSystemRunoffStats
-        # SWMM function handle argument output structure.
-        swmm_stats_func_arg = ctypes.POINTER(tka.RunoffTotals)
-        # Define argument.
-        swmm_stats_func.argtypes = (swmm_stats_func_arg, )
 
         object_stats = tka.RunoffTotals()
         errcode = swmm_stats_func(ctypes.byref(object_stats))
@@ -1468,9 +2200,19 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.LINK.value, ID)
-        targetSetting = ctypes.c_double(targetSetting)
-        errcode = self.SWMMlibobj.swmm_setLinkSetting(index, targetSetting)
-        self._error_check(errcode)
+        self.setLinkSettingByIndex(index, targetSetting)
+
+    def setLinkSettingByIndex(self, index, targetSetting):
+        """
+        Set Link Setting by link index (see setLinkSetting()).
+
+        :param int index: Link Index
+        :param float targetSetting: New target setting
+        """
+        self._invalidate_results()
+        errcode = self._swmm_setLinkSetting(index, targetSetting)
+        if errcode:
+            self._error_check(errcode)
 
     def setNodeInflow(self, ID, flowrate):
         """
@@ -1501,9 +2243,19 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        q = ctypes.c_double(flowrate)
-        errcode = self.SWMMlibobj.swmm_setNodeInflow(index, q)
-        self._error_check(errcode)
+        self.setNodeInflowByIndex(index, flowrate)
+
+    def setNodeInflowByIndex(self, index, flowrate):
+        """
+        Set Node Inflow rate by node index (see setNodeInflow()).
+
+        :param int index: Node Index
+        :param float flowrate: New flow rate in the user-defined flow units
+        """
+        self._invalidate_results()
+        errcode = self._swmm_setNodeInflow(index, flowrate)
+        if errcode:
+            self._error_check(errcode)
 
     def setOutfallStage(self, ID, stage):
         """
@@ -1534,9 +2286,120 @@ class PySWMM(object):
         >>> swmm_model.swmm_close()
         """
         index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        q = ctypes.c_double(stage)
-        errcode = self.SWMMlibobj.swmm_setOutfallStage(index, q)
-        self._error_check(errcode)
+        self.setOutfallStageByIndex(index, stage)
+
+    def setOutfallStageByIndex(self, index, stage):
+        """
+        Set Outfall Stage by node index (see setOutfallStage()).
+
+        :param int index: Node Index
+        :param float stage: New outfall stage in the user-defined units
+        """
+        self._invalidate_results()
+        errcode = self._swmm_setOutfallStage(index, stage)
+        if errcode:
+            self._error_check(errcode)
+
+    def setLinkSettings(self, indices, values):
+        """
+        Set Link Settings (Pumps, Orifices, Weirs) for many links.
+
+        :param list indices: Link indices
+        :param list values: New target settings, one per index
+
+        Examples:
+
+        >>> swmm_model = PySWMM(r'\\.inp',r'\\.rpt',r'\\.out')
+        >>> swmm_model.swmm_open()
+        >>> gates = swmm_model.getObjectIDIndices(ObjectType.LINK,
+        ...                                       ['C2', 'C3'])
+        >>> swmm_model.swmm_start()
+        >>> while(True):
+        ...     swmm_model.setLinkSettings(gates, [0.5, 0.25])
+        ...     time = swmm_model.swmm_step()
+        ...     if (time <= 0.0): break
+        ...
+        >>> swmm_model.swmm_end()
+        >>> swmm_model.swmm_close()
+        """
+        self._setValues(self._swmm_setLinkSetting, indices, values)
+
+    def setNodeInflows(self, indices, values):
+        """
+        Set Node Inflow rates for many nodes (see setNodeInflow()).
+
+        :param list indices: Node indices
+        :param list values: New flow rates in the user-defined flow units
+        """
+        self._setValues(self._swmm_setNodeInflow, indices, values)
+
+    def setOutfallStages(self, indices, values):
+        """
+        Set Outfall Stages for many outfalls (see setOutfallStage()).
+
+        :param list indices: Outfall node indices
+        :param list values: New stages in the user-defined units
+        """
+        self._setValues(self._swmm_setOutfallStage, indices, values)
+
+    def setNodeParams(self, parameter, indices, values):
+        """
+        Set Node Parameter for many nodes (see setNodeParam()).
+
+        :param int parameter: Paramter (toolkitapi.NodeParams member variable)
+        :param list indices: Node indices
+        :param list values: New parameter values, one per index
+        """
+        self._setValues(
+            _param_setter(self.SWMMlibobj.swmm_setNodeParam, parameter),
+            indices, values)
+
+    def setLinkParams(self, parameter, indices, values):
+        """
+        Set Link Parameter for many links (see setLinkParam()).
+
+        :param int parameter: Paramter (toolkitapi.LinkParams member variable)
+        :param list indices: Link indices
+        :param list values: New parameter values, one per index
+        """
+        self._setValues(
+            _param_setter(self.SWMMlibobj.swmm_setLinkParam, parameter),
+            indices, values)
+
+    def setSubcatchParams(self, parameter, indices, values):
+        """
+        Set Subcatchment Parameter for many subcatchments
+        (see setSubcatchParam()).
+
+        :param int parameter: Paramter (toolkitapi.SubcParams member variable)
+        :param list indices: Subcatchment indices
+        :param list values: New parameter values, one per index
+        """
+        self._setValues(
+            _param_setter(self.SWMMlibobj.swmm_setSubcatchParam, parameter),
+            indices, values)
+
+    def _setValues(self, swmm_set_func, indices, values):
+        """
+        Internal Method: applies one value per index with a setter.
+
+        Indices and values are validated once up front; the first engine
+        error is reported once after the loop.
+        """
+        indices = [int(index) for index in indices]
+        values = np.asarray(values, dtype=np.float64).ravel().tolist()
+        if len(indices) != len(values):
+            raise PYSWMMException(
+                "Number of values ({0}) does not match number of indices "
+                "({1})".format(len(values), len(indices)))
+
+        self._invalidate_results()
+        first_error = 0
+        for index, value in zip(indices, values):
+            errcode = swmm_set_func(index, value)
+            if errcode and not first_error:
+                first_error = errcode
+        self._error_check(first_error)
 
     ######################
     # coupling functions #
@@ -1549,27 +2412,19 @@ class PySWMM(object):
         Set a node opening for coupling with an overland model.
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        idx = ctypes.c_int(opening_index)
-        oType = ctypes.c_int(opening_type)
-        A = ctypes.c_double(opening_area)
-        l = ctypes.c_double(opening_length)
-        Co = ctypes.c_double(coeff_orifice)
-        Cfw = ctypes.c_double(coeff_freeweir)
-        Csw = ctypes.c_double(coeff_subweir)
-
-        errcode = self.SWMMlibobj.swmm_setNodeOpening(node_index, idx, oType,
-                                                      A, l, Co, Cfw, Csw)
+        self._invalidate_results()
+        errcode = self.SWMMlibobj.swmm_setNodeOpening(
+            node_index, opening_index, opening_type, opening_area,
+            opening_length, coeff_orifice, coeff_freeweir, coeff_subweir)
         self._error_check(errcode)
 
     def getNodeOpeningParam(self, ID, opening_index, parameter):
         """get a parameter from a given opening from a given node
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        idx = ctypes.c_int(opening_index)
-        param = ctypes.c_int(parameter)
-        value = ctypes.c_double()
-        errcode = self.SWMMlibobj.swmm_getNodeOpeningParam(node_index, idx, param,
-                                                           ctypes.byref(value))
+        value = self._double
+        errcode = self.SWMMlibobj.swmm_getNodeOpeningParam(
+            node_index, opening_index, parameter, ctypes.byref(value))
         self._error_check(errcode)
         return value.value
 
@@ -1577,10 +2432,9 @@ class PySWMM(object):
         """get the inflow from a given opening from a given node
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        idx = ctypes.c_int(opening_index)
-        value = ctypes.c_double()
-        errcode = self.SWMMlibobj.swmm_getNodeOpeningFlow(node_index, idx,
-                                                          ctypes.byref(value))
+        value = self._double
+        errcode = self.SWMMlibobj.swmm_getNodeOpeningFlow(
+            node_index, opening_index, ctypes.byref(value))
         self._error_check(errcode)
         return value.value
 
@@ -1588,10 +2442,9 @@ class PySWMM(object):
         """get the inflow from a given opening from a given node
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        idx = ctypes.c_int(opening_index)
-        value = ctypes.c_int()
-        errcode = self.SWMMlibobj.swmm_getNodeOpeningType(node_index, idx,
-                                                          ctypes.byref(value))
+        value = self._ints[0]
+        errcode = self.SWMMlibobj.swmm_getNodeOpeningType(
+            node_index, opening_index, ctypes.byref(value))
         self._error_check(errcode)
         return value.value
 
@@ -1599,10 +2452,9 @@ class PySWMM(object):
         """get the inflow from a given opening from a given node
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        idx = ctypes.c_int(opening_index)
-        value = ctypes.c_int()
-        errcode = self.SWMMlibobj.swmm_getOpeningCouplingType(node_index, idx,
-                                                          ctypes.byref(value))
+        value = self._ints[0]
+        errcode = self.SWMMlibobj.swmm_getOpeningCouplingType(
+            node_index, opening_index, ctypes.byref(value))
         self._error_check(errcode)
         return value.value
 
@@ -1610,7 +2462,7 @@ class PySWMM(object):
         """get a node's coupling status
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        iscoupled = ctypes.c_int()
+        iscoupled = self._ints[0]
         errcode = self.SWMMlibobj.swmm_getNodeIsCoupled(node_index, ctypes.byref(iscoupled))
         self._error_check(errcode)
         return bool(iscoupled.value)
@@ -1619,7 +2471,7 @@ class PySWMM(object):
         """get a node's number of openings
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        num = ctypes.c_int()
+        num = self._ints[0]
         errcode = self.SWMMlibobj.swmm_getOpeningsNum(node_index, ctypes.byref(num))
         self._error_check(errcode)
         return num.value
@@ -1632,19 +2484,19 @@ class PySWMM(object):
         num = self.getOpeningsNum(ID)
         # create a pointer to an array of the same size
         arr = (ctypes.c_int * num)()
-        arr_ptr = ctypes.cast(arr, ctypes.POINTER(ctypes.c_int))
         # call function
-        errcode = self.SWMMlibobj.swmm_getOpeningsIndices(node_index, num, arr_ptr)
+        errcode = self.SWMMlibobj.swmm_getOpeningsIndices(node_index, num, arr)
         self._error_check(errcode)
         # convert arr to a list
-        return [arr_ptr[i] for i in range(num)]
+        return list(arr)
 
     def deleteNodeOpening(self, ID, opening_index):
         """get a node's number of openings
         """
         node_index = self.getObjectIDIndex(tka.ObjectType.NODE.value, ID)
-        idx = ctypes.c_int(opening_index)
-        errcode = self.SWMMlibobj.swmm_deleteNodeOpening(node_index, idx)
+        self._invalidate_results()
+        errcode = self.SWMMlibobj.swmm_deleteNodeOpening(node_index,
+                                                         opening_index)
         self._error_check(errcode)
 
 
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Pytest configuration of the test suite."""
+
+# Standard library imports
+import sys
+
+collect_ignore = []
+# Uses async def, which older interpreters cannot compile
+if sys.version_info < (3, 5):
+    collect_ignore.append('test_simulation_async.py')
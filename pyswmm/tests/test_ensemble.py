@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+import os
+
+# Third party imports
+import pytest
+
+# Local imports
+from pyswmm.ensemble import EnsembleRunner
+from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
+from pyswmm.toolkitapi import SubcParams
+
+
+def test_ensemble_1():
+    members = [
+        {},
+        {'subcatchments': {'S1': {'area': 10.0}}},
+        {'subcatchments': {'S1': {SubcParams.area: 20.0}}},
+        {'nodes': {'NOT_A_NODE': {'invertElev': 1.0}}},
+    ]
+    runner = EnsembleRunner(MODEL_WEIR_SETTING_PATH, members, max_workers=2)
+    results = runner.results()
+
+    assert [result.member for result in results] == [0, 1, 2, 3]
+    for result in results[:3]:
+        assert result.error is None
+        assert 'flooding' in result.stats['routing']
+        assert 'runoff' in result.stats['runoff']
+    # A larger subcatchment sends more runoff into the network
+    inflow = [
+        result.stats['routing']['wet_weather_inflow']
+        for result in results[:3]
+    ]
+    assert inflow[0] < inflow[1] < inflow[2]
+    # A failing member is reported, not raised
+    assert results[3].stats is None
+    assert 'ID Does Not Exist' in results[3].error
+
+
+def test_ensemble_2(tmpdir):
+    members = [{'subcatchments': {'S1': {'area': area}}} for area in (1, 2)]
+    runner = EnsembleRunner(MODEL_WEIR_SETTING_PATH, members, max_workers=1,
+                            workdir=str(tmpdir), summary_func=_total_area)
+    seen = []
+    for result in runner:
+        seen.append(result.member)
+        assert result.stats['summary'] > 0
+    assert sorted(seen) == [0, 1]
+    # Scratch directories are removed once the ensemble finishes
+    assert os.listdir(str(tmpdir)) == []
+
+    runner.max_workers = 0
+    with pytest.raises(ValueError):
+        runner.results()
+    assert os.listdir(str(tmpdir)) == []
+
+
+def _total_area(sim):
+    model = sim._model
+    return sum(
+        model.getSubcatchParam(ID, SubcParams.area.value)
+        for ID in model.getObjectIDList(1))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from pyswmm import Simulation
+from pyswmm.output import OutputMap
+from pyswmm.output.export import export, main
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.tests.data import MODEL_POLLUTANTS_PATH
+from pyswmm.toolkitapi import SMO_elementType
+
+
+@pytest.fixture(scope='module')
+def outfile(tmpdir_factory):
+    tmpdir = tmpdir_factory.mktemp('export')
+    binfile = str(tmpdir.join('model.out'))
+    with Simulation(MODEL_POLLUTANTS_PATH, str(tmpdir.join('model.rpt')),
+                    binfile) as sim:
+        for step in sim:
+            pass
+    return binfile
+
+
+def test_export_parquet(outfile, tmpdir):
+    pq = pytest.importorskip('pyarrow.parquet')
+    paths = export(outfile, str(tmpdir), chunk_periods=10, workers=4)
+    assert sorted(paths) == ['link', 'node', 'subcatch', 'system']
+
+    with OutputMap(outfile) as out:
+        table = pq.read_table(paths['node'])
+        assert table.num_rows == out.num_periods * len(out.nodes)
+        assert table.column_names == ['time', 'element'] + \
+            out.variable_names(SMO_elementType.SM_node)
+        assert table.column('element').to_pylist()[:5] == out.nodes
+        depth = table.column('invert_depth').to_numpy()
+        np.testing.assert_array_equal(
+            depth.reshape(out.num_periods, len(out.nodes)),
+            out.matrix(SMO_elementType.SM_node, 0))
+
+        system = pq.read_table(paths['system'])
+        assert system.num_rows == out.num_periods
+        assert 'element' not in system.column_names
+
+
+def test_export_hdf5(outfile, tmpdir):
+    h5py = pytest.importorskip('h5py')
+    main([outfile, str(tmpdir), '--format', 'hdf5', '--elements', 'link',
+          '--chunk-periods', '7'])
+
+    with OutputMap(outfile) as out:
+        with h5py.File(str(tmpdir.join('model_link.h5')), 'r') as f:
+            assert f['values'].chunks == (7, len(out.links), out.link_vars)
+            np.testing.assert_array_equal(
+                f['values'][:],
+                out.element_results(SMO_elementType.SM_link))
+            np.testing.assert_array_equal(
+                f['time'][:].astype('datetime64[s]'), out.times)
+            assert [ID.decode('utf-8') for ID in f['ids'][:]] == out.links
+    assert not tmpdir.join('model_node.h5').check()
+
+
+def test_export_errors(outfile, tmpdir):
+    with pytest.raises(PYSWMMException):
+        export(outfile, str(tmpdir), format='csv')
+    with pytest.raises(PYSWMMException):
+        export(outfile, str(tmpdir), element_types=['pollutant'])
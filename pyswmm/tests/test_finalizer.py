@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+import gc
+
+# Local imports
+from pyswmm.utils.finalizer import Finalizer
+
+
+class Owner(object):
+    pass
+
+
+def test_finalizer():
+    calls = []
+    # Reference cycles are collected as well
+    owner = Owner()
+    owner.cycle = owner
+    finalizer = Finalizer(owner, calls.append, 'collected')
+    assert finalizer.alive
+    del owner
+    gc.collect()
+    assert calls == ['collected']
+    assert not finalizer.alive
+    assert finalizer() is None
+
+    # Called explicitly, it runs once and not again on collection
+    owner = Owner()
+    finalizer = Finalizer(owner, len, 'abc')
+    assert finalizer() == 3
+    assert finalizer() is None
+    del owner
+    gc.collect()
+    assert not finalizer.alive
@@ -7,10 +7,12 @@
 # -----------------------------------------------------------------------------
 
 # Standard library imports
+from datetime import datetime, timedelta
 import sys
 
 # Local imports
-from pyswmm import Simulation
+from pyswmm import Links, Nodes, Simulation
+from pyswmm.swmm5 import PySWMM
 from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
 import pyswmm
 
@@ -48,3 +50,76 @@ def test_quality_error():
     sim.execute()
     print(sim.quality_error)
     assert sim.quality_error >= 0.0
+
+
+def test_stride_to():
+    swmmobject = PySWMM(MODEL_WEIR_SETTING_PATH)
+    swmmobject.swmm_open()
+    for run in range(2):
+        swmmobject.swmm_start()
+        start = swmmobject.getCurrentSimulationTime()
+        assert swmmobject.curSimTime == 0.0
+
+        target = start + timedelta(hours=2)
+        swmmobject.swmm_stride_to(target)
+        assert swmmobject.getCurrentSimulationTime() >= target
+        swmmobject.swmm_stride_to(4 * 3600)
+        assert swmmobject.curSimTime * 86400.0 >= 4 * 3600 - 1e-3
+
+        # Strides continue from steps taken outside swmm_stride
+        swmmobject.swmm_step()
+        elapsed = swmmobject.curSimTime
+        swmmobject.swmm_stride(600)
+        assert swmmobject.curSimTime * 86400.0 >= elapsed * 86400.0 + 599
+
+        while swmmobject.swmm_stride(3600) > 0.0:
+            pass
+        swmmobject.swmm_end()
+    swmmobject.swmm_close()
+
+
+def test_set_simulation_datetime():
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        sim.end_time = datetime(2017, 1, 1)
+        # Ten character dates, times that only fit as decimal hours
+        for value in (datetime(2015, 11, 1, 14), datetime(2015, 1, 5, 0, 0, 1),
+                      datetime(2015, 10, 10, 23, 59, 59),
+                      datetime(2016, 12, 31, 23, 59, 59),
+                      datetime(2016, 2, 29, 12, 30)):
+            sim.start_time = value
+            sim.report_start = value
+            assert sim.start_time == value
+            assert sim.report_start == value
+
+
+def test_result_cache():
+    with Simulation(MODEL_WEIR_SETTING_PATH, result_cache=True) as sim:
+        model = sim._model
+        j1 = Nodes(sim)['J1']
+        c3 = Links(sim)['C3']
+        j1_index = model.getObjectIDIndex(
+            pyswmm.toolkitapi.ObjectType.NODE.value, 'J1')
+        new_depth = pyswmm.toolkitapi.NodeResults.newDepth.value
+        sim.step_advance(300)
+        for ind, step in enumerate(sim):
+            depth = j1.depth
+            assert j1.depth == depth
+            assert model.getNodeResultByIndex(j1_index, new_depth) == depth
+            # Same value as an uncached engine read
+            assert model.getNodeResults(new_depth, [j1_index])[0] == depth
+            # Setters invalidate the cache
+            c3.target_setting = 0.5 if ind % 2 else 0.25
+            assert c3.target_setting == (0.5 if ind % 2 else 0.25)
+            if ind == 10:
+                break
+        stats = sim.result_cache_stats
+        assert stats['misses'] == 2 * 11
+        assert stats['hits'] == 2 * 11
+        assert stats['size'] == 1
+
+        model.swmm_stride(300)
+        assert sim.result_cache_stats['size'] == 0
+        model.disable_result_cache()
+        assert sim.result_cache_stats == {'hits': 2 * 11,
+                                          'misses': 2 * 11,
+                                          'size': 0}
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+import os
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from pyswmm import Links, Simulation, Subcatchments
+from pyswmm.graph import Drainage, Network, SparseMatrix
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.tests.data import MODEL_STORAGE_PUMP, MODEL_WEIR_SETTING_PATH
+
+
+def test_graph_adjacency():
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        network = Network(sim)
+        for link in Links(sim):
+            row = network.link_ids.index(link.linkid)
+            assert (network.node_ids[network.link_inlet[row]],
+                    network.node_ids[network.link_outlet[row]]) == \
+                link.connections
+            assert row in network.outgoing(link.inlet_node)
+            assert row in network.incoming(link.outlet_node)
+        assert network.out_degree.sum() == len(network.link_ids)
+        assert network.in_degree.sum() == len(network.link_ids)
+
+        ids = network.node_ids
+        assert [ids[i] for i in network.upstream('J2')] == ['J1', 'J5']
+        assert [ids[i] for i in network.downstream('J5')] == \
+            ['J1', 'J2', 'J3', 'J4']
+        assert len(network.upstream('J5')) == 0
+        assert network.node_index('j3') == ids.index('J3')
+        with pytest.raises(PYSWMMException):
+            network.upstream('NOPE')
+
+
+def test_graph_order_and_accumulate():
+    with Simulation(MODEL_STORAGE_PUMP) as sim:
+        network = Network(sim)
+        order = network.topological_order()
+        position = np.empty(len(network), dtype=int)
+        position[order] = np.arange(len(order))
+        assert np.all(
+            position[network.link_inlet] < position[network.link_outlet])
+
+        # J2 splits between J3 and SU1, so each gets half of J1 and J2
+        totals = network.accumulate(np.ones(len(network)))
+        expected = {'J1': 1.0, 'J2': 2.0, 'J3': 2.0, 'SU1': 2.0}
+        for nodeid, total in expected.items():
+            assert totals[network.node_index(nodeid)] == total
+        with pytest.raises(PYSWMMException):
+            network.accumulate([1.0])
+
+
+def test_graph_sparse_matrix():
+    matrix = SparseMatrix((3, 4), [2, 0, 2], [3, 1, 0], [3.0, 1.0, 2.0])
+    x = np.arange(4.0)
+    assert matrix.nnz == 3
+    assert np.array_equal(matrix.dot(x), matrix.toarray().dot(x))
+    assert np.array_equal(matrix.dot(np.column_stack([x, 2 * x])),
+                          [[1.0, 2.0], [0.0, 0.0], [9.0, 18.0]])
+    with pytest.raises(PYSWMMException):
+        matrix.dot([1.0])
+
+
+def test_graph_drainage(tmpdir):
+    # S3 cascades onto S1, which cascades onto S2, which drains to J2
+    with open(MODEL_WEIR_SETTING_PATH) as f:
+        lines = f.read().splitlines()
+    for row, line in enumerate(lines):
+        fields = line.split()
+        if fields[:1] == ['S1'] and len(fields) > 7:
+            lines[row] = line.replace(' J1 ', ' S2 ')
+        elif fields[:1] == ['S3'] and len(fields) > 7:
+            lines[row] = line.replace(' j3 ', ' S1 ')
+    inp = os.path.join(str(tmpdir), 'cascade.inp')
+    with open(inp, 'w') as f:
+        f.write('\n'.join(lines))
+
+    with Simulation(inp) as sim:
+        drainage = Drainage(sim)
+        j2 = drainage.node_ids.index('J2')
+        s1, s2, s3 = [drainage.subcatchment_ids.index(ID)
+                      for ID in ('S1', 'S2', 'S3')]
+        assert list(drainage.outlet_subcatchment[[s1, s2, s3]]) == \
+            [s2, -1, s1]
+        assert list(drainage.terminal_node) == [j2] * 3
+        area = drainage.contributing_area()
+        assert area[j2] == 6.0
+        assert area.sum() == 6.0
+
+        subcatchments = Subcatchments(sim)
+        for step_num, step in enumerate(sim):
+            if step_num == 2000:
+                break
+        runoff = [subcatchments[ID].runoff
+                  for ID in drainage.subcatchment_ids]
+        loads = drainage.node_loads()
+        # Cascaded runoff arrives as runon, so only S2 loads J2
+        assert loads[j2] == runoff[s2]
+        assert loads.sum() == runoff[s2]
+
+    # A subcatchment draining onto itself routes nowhere
+    for row, line in enumerate(lines):
+        if line.split()[:1] == ['S1'] and len(line.split()) > 7:
+            lines[row] = line.replace(' S2 ', ' S1 ')
+    with open(inp, 'w') as f:
+        f.write('\n'.join(lines))
+    with Simulation(inp) as sim:
+        drainage = Drainage(sim)
+        assert drainage.outlet_subcatchment[s1] == -1
+        assert drainage.outlet_node[s1] == -1
+        assert drainage.terminal_node[s1] == -1
+        assert drainage.terminal_node[s3] == -1
+        assert drainage.contributing_area()[j2] == 2.0
+        for step in sim:
+            pass
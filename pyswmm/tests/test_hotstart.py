@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+from datetime import timedelta
+import gc
+import os
+
+# Third party imports
+import pytest
+
+# Local imports
+from pyswmm import Nodes, Simulation
+from pyswmm.hotstart import HotstartCache, _with_hotstart
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
+
+
+def test_with_hotstart():
+    text = "[TITLE]\n\n[FILES]\nSAVE HOTSTART old.hsf\nUSE RAINFALL r.dat\n"
+    assert _with_hotstart(text, 'USE', 'a.hsf') == (
+        '[TITLE]\n\n[FILES]\nUSE HOTSTART "a.hsf"\nUSE RAINFALL r.dat\n')
+    assert _with_hotstart("[TITLE]\n", 'SAVE', 'a.hsf') == (
+        '[TITLE]\n\n[FILES]\nSAVE HOTSTART "a.hsf"\n')
+
+
+def test_hotstart_cache(tmpdir, monkeypatch):
+    inputfile = str(tmpdir.join('model.inp'))
+    with open(MODEL_WEIR_SETTING_PATH) as src, open(inputfile, 'w') as dst:
+        dst.write(src.read())
+
+    with Simulation(inputfile, output_mode="none") as sim:
+        start = sim.start_time
+        depths = {}
+        for step in sim:
+            depths[sim.current_time] = Nodes(sim)['J1'].depth
+        end = sim.current_time
+    spinup_end = start + timedelta(hours=6)
+
+    cache = HotstartCache(str(tmpdir.join('cache')))
+    for run in range(2):
+        with cache.simulation(inputfile, spinup_end,
+                              output_mode="none") as sim:
+            assert sim.start_time == spinup_end
+            for step in sim:
+                pass
+            assert sim.current_time == end
+    assert (cache.misses, cache.hits) == (1, 1)
+    key = cache.key(inputfile, spinup_end)
+    assert cache.entries()[0][0].endswith(key + '.hsf')
+    # Derived input files are cleaned up
+    assert sorted(os.listdir(str(tmpdir))) == ['cache', 'model.inp']
+
+    # Kept output is named after the model, with nothing hidden left
+    with cache.simulation(inputfile, spinup_end) as sim:
+        for step in sim:
+            pass
+    assert sorted(os.listdir(str(tmpdir))) == \
+        ['cache', 'model.inp', 'model.out', 'model.rpt']
+
+    # The hotstart carries the spun up state into the first step
+    with cache.simulation(inputfile, spinup_end, output_mode="none") as sim:
+        next(sim)
+        time = sim.current_time
+        assert abs(Nodes(sim)['J1'].depth - depths[time]) < 0.05
+
+    # A different spin-up end is a new entry; the budget keeps only one
+    size = cache.entries()[0][1]
+    cache.max_bytes = size
+    path = cache.hotstart(inputfile, spinup_end + timedelta(hours=1))
+    assert cache.entries() == [(path, size)]
+
+    # A simulation collected without close still removes its copy
+    files = sorted(os.listdir(str(tmpdir)))
+    sim = cache.simulation(inputfile, spinup_end, output_mode="none",
+                           isolated=True)
+    assert len(os.listdir(str(tmpdir))) == len(files) + 1
+    del sim
+    gc.collect()
+    assert sorted(os.listdir(str(tmpdir))) == files
+
+    # A failed start time closes the engine before removing the copy
+    start_time = Simulation.start_time
+    refused = []
+
+    def refuse(sim, value):
+        refused.append(sim)
+        raise PYSWMMException("refused")
+
+    monkeypatch.setattr(Simulation, 'start_time',
+                        property(start_time.fget, refuse))
+    with pytest.raises(PYSWMMException):
+        cache.simulation(inputfile, spinup_end, output_mode="none")
+    monkeypatch.undo()
+    assert not refused[0]._isOpen
+    assert sorted(os.listdir(str(tmpdir))) == files
+
+    with open(inputfile, 'a') as f:
+        f.write('\n')
+    assert cache.key(inputfile, spinup_end) != key
@@ -6,11 +6,16 @@
 # See LICENSE.txt for details
 # -----------------------------------------------------------------------------
 
+# Standard library imports
+import array
+
 # Local imports
 from pyswmm import Links, Nodes, Simulation
+from pyswmm.links import Conduit, Pump
 # from pyswmm.swmm5 import PySWMM
 from pyswmm.tests.data import (MODEL_PUMP_SETTINGS_PATH, MODEL_STORAGE_PUMP,
                                MODEL_WEIR_SETTING_PATH)
+from pyswmm.toolkitapi import LinkResults
 
 
 def test_links_1():
@@ -209,3 +214,42 @@ def test_links_7():
         for ind, step in enumerate(sim):
             if ind % 1000 == 0:
                 print(link.pump_statistics)
+
+
+def test_links_8():
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        links = Links(sim)
+        link_ids = [link.linkid for link in Links(sim)]
+        flows = array.array('d', [0.0] * len(link_ids))
+
+        sim.step_advance(300)
+        for ind, step in enumerate(sim):
+            links.get_results(LinkResults.newFlow, out=flows)
+            for pos, linkid in enumerate(link_ids):
+                assert flows[pos] == links[linkid].flow
+
+
+def test_links_9():
+    with Simulation(MODEL_PUMP_SETTINGS_PATH) as sim:
+        peak_pump_rate = 20  #cfs
+        links = Links(sim)
+        pumps = links.indices(["C3"])
+
+        sim.step_advance(300)
+        for ind, step in enumerate(sim):
+            if ind == 15:
+                links.set_target_settings(pumps, [0.5])
+            if ind == 16:
+                assert (links["C3"].target_setting == 0.5)
+                assert (links["C3"].flow == 0.5 * peak_pump_rate)
+
+
+def test_links_10():
+    with Simulation(MODEL_STORAGE_PUMP) as sim:
+        links = Links(sim)
+        assert len(links) == 3
+        first = [link.linkid for link in links]
+        assert [link.linkid for link in links] == first
+        assert links['P1'] is Links(sim)['P1']
+        assert type(links['C2']) is Conduit
+        assert type(links['P1']) is Pump
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from pyswmm import Links, NetworkTable, Nodes, Simulation, Subcatchments
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.tests.data import MODEL_FULL_FEATURES_PATH, MODEL_STORAGE_PUMP
+from pyswmm.toolkitapi import (LinkParams, LinkType, NodeParams, NodeType,
+                               ObjectType)
+
+
+def test_network_table_load():
+    with Simulation(MODEL_STORAGE_PUMP) as sim:
+        table = NetworkTable(sim)
+        nodes = Nodes(sim)
+        assert len(table.nodes) == len(nodes)
+        assert table.nodes.names == [param.name for param in NodeParams]
+        for row, nodeid in enumerate(table.nodes.ids):
+            assert table.nodes['invertElev'][row] == \
+                nodes[nodeid].invert_elevation
+            assert table.nodes[NodeParams.fullDepth][row] == \
+                nodes[nodeid].full_depth
+        storage = table.nodes.mask(NodeType.storage)
+        assert [table.nodes.ids[row] for row in np.flatnonzero(storage)] == \
+            ['SU1']
+        pumps = table.links.mask(LinkType.pump)
+        assert [table.links.ids[row] for row in np.flatnonzero(pumps)] == \
+            ['P1']
+        s1 = table.subcatchments.index('S1')
+        assert table.subcatchments['area'][s1] == \
+            Subcatchments(sim)['S1'].area
+        with pytest.raises(PYSWMMException):
+            table.subcatchments.mask(NodeType.storage)
+        with pytest.raises(PYSWMMException):
+            table.nodes['invert_elevation']
+        assert 'invertElev' in table.nodes
+        assert NodeParams.fullDepth in table.nodes
+        assert 'invert_elevation' not in table.nodes
+        model = sim._model
+        assert model.paramSupported(ObjectType.NODE, NodeParams.fullDepth)
+        assert table.links.supported('seepRate') == \
+            model.paramSupported(ObjectType.LINK, LinkParams.seepRate)
+
+
+def test_network_table_commit():
+    with Simulation(MODEL_FULL_FEATURES_PATH) as sim:
+        table = NetworkTable(sim)
+        assert table.changed() == 0
+        j2 = table.nodes.index('J2')
+        table.nodes['invertElev'][j2] = 14.0
+        table.links['offset1'][table.links.index('C2')] = 0.5
+        table.subcatchments['width'] *= 2
+        widths = table.subcatchments['width'].copy()
+        assert table.changed() == 2 + len(table.subcatchments)
+        assert table.commit() == 2 + len(table.subcatchments)
+        assert table.changed() == 0
+        assert table.commit() == 0
+
+        assert Nodes(sim)['J2'].invert_elevation == 14.0
+        assert Links(sim)['C2'].inlet_offset == 0.5
+        for row, subcatchment in enumerate(Subcatchments(sim)):
+            assert subcatchment.width == widths[row]
+
+        # Edits made elsewhere show up after a reload
+        Nodes(sim)['J2'].invert_elevation = 15.0
+        table.nodes['invertElev'][j2] = 1.0
+        table.reload()
+        assert table.nodes['invertElev'][j2] == 15.0
+
+        for name in table.links:
+            if not table.links.supported(name):
+                assert np.isnan(table.links[name]).all()
+                table.links[name] = 1.0
+                with pytest.raises(PYSWMMException):
+                    table.commit()
+                break
@@ -6,9 +6,14 @@
 # See LICENSE.txt for details
 # -----------------------------------------------------------------------------
 
+# Third party imports
+import numpy as np
+import pytest
+
 # Local imports
 from pyswmm import Node, Nodes, Simulation
-from pyswmm.swmm5 import PySWMM
+from pyswmm.nodes import Outfall, Storage
+from pyswmm.swmm5 import PySWMM, PYSWMMException
 from pyswmm.tests.data import (MODEL_FULL_FEATURES_PATH,
                                MODEL_NODE_INFLOWS_PATH, MODEL_STORAGE_PUMP,
                                MODEL_STORAGE_PUMP_MGD, MODEL_WEIR_SETTING_PATH)
@@ -161,3 +166,114 @@ def test_nodes_10():
             if ind == 50001:
                 assert outfall.head <= 13.50001
                 assert outfall.head >= 13.49999
+
+
+def test_nodes_11():
+    swmmobject = PySWMM(*get_model_files(MODEL_WEIR_SETTING_PATH))
+    swmmobject.swmm_open()
+
+    node_ids = swmmobject.getObjectIDList(tka.ObjectType.NODE.value)
+    indices = swmmobject.getObjectIDIndices(tka.ObjectType.NODE.value,
+                                            node_ids)
+    assert indices == list(range(len(node_ids)))
+    assert swmmobject.ObjectIDexist(tka.ObjectType.NODE.value, 'J1')
+    assert not swmmobject.ObjectIDexist(tka.ObjectType.NODE.value, 'J99')
+
+    j2 = swmmobject.getObjectIDIndex(tka.ObjectType.NODE.value, 'J2')
+    swmmobject.setNodeParamByIndex(j2, tka.NodeParams.invertElev, 19)
+    assert swmmobject.getNodeParam('J2', tka.NodeParams.invertElev) == 19
+
+    swmmobject.swmm_start()
+    for ind in range(100):
+        swmmobject.swmm_step()
+    assert swmmobject.getNodeResultByIndex(
+        j2, tka.NodeResults.newDepth.value) == swmmobject.getNodeResult(
+            'J2', tka.NodeResults.newDepth.value)
+    swmmobject.swmm_end()
+    swmmobject.swmm_close()
+    assert swmmobject._object_index == {}
+
+
+def test_nodes_12():
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        nodes = Nodes(sim)
+        node_ids = [node.nodeid for node in Nodes(sim)]
+        depths = np.zeros(len(node_ids))
+        subset = nodes.indices(['J2', 'J1'])
+
+        for ind, step in enumerate(sim):
+            nodes.get_results(tka.NodeResults.newDepth, out=depths)
+            if ind % 1000 == 0:
+                for pos, nodeid in enumerate(node_ids):
+                    assert depths[pos] == nodes[nodeid].depth
+                heads = nodes.get_results(tka.NodeResults.newHead, subset)
+                assert heads[0] == nodes['J2'].head
+                assert heads[1] == nodes['J1'].head
+
+        with pytest.raises(PYSWMMException):
+            nodes.get_results(tka.NodeResults.newDepth,
+                              out=np.zeros(len(node_ids), dtype=np.float32))
+
+
+def test_nodes_13():
+    with Simulation(MODEL_NODE_INFLOWS_PATH) as sim:
+        nodes = Nodes(sim)
+        inlets = nodes.indices(['J1', 'J2'])
+        outfalls = nodes.indices(['J3'])
+
+        with pytest.raises(PYSWMMException):
+            nodes.set_generated_inflows(inlets, [4.0])
+
+        for ind, step in enumerate(sim):
+            if ind == 10:
+                nodes.set_generated_inflows(inlets, [4.0, 2.0])
+                nodes.set_outfall_stages(outfalls, [7.0])
+            if ind == 11:
+                assert nodes['J1'].lateral_inflow >= 3.9999
+                assert nodes['J2'].lateral_inflow >= 1.9999
+                assert nodes['J3'].head <= 7.00001
+                assert nodes['J3'].head >= 6.99999
+                break
+
+
+def test_nodes_14():
+    with Simulation(MODEL_STORAGE_PUMP) as sim:
+        nodes = Nodes(sim)
+        assert len(nodes) == 4
+        first = [node.nodeid for node in nodes]
+        assert [node.nodeid for node in nodes] == first
+        assert nodes['J1'] is Nodes(sim)['J1']
+        assert nodes['J1'] is list(nodes)[first.index('J1')]
+        assert type(nodes['J1']) is Node
+        assert type(nodes['J3']) is Outfall
+        assert type(nodes['SU1']) is Storage
+        with pytest.raises(AttributeError):
+            nodes['J1'].extra = 1
+        nodes['J1'].invert_elevation = 21
+        assert Nodes(sim)['J1'].invert_elevation == 21
+        assert next(nodes).nodeid == first[0]
+
+    # Objects of a closed model are dropped
+    assert sim._model._elements == {}
+
+
+def test_nodes_15():
+    # SWMM IDs are case-insensitive; the model itself refers to J3 as j3
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        nodes = Nodes(sim)
+        assert 'j3' in nodes
+        assert nodes['j3'] is nodes['J3']
+        assert nodes['j3'].nodeid == 'J3'
+        model = sim._model
+        assert model.getObjectIDIndex(tka.ObjectType.NODE.value, 'j5') == \
+            model.getObjectIDIndex(tka.ObjectType.NODE.value, 'J5')
+        assert not model.ObjectIDexist(tka.ObjectType.NODE.value, 'J99')
+        with pytest.raises(PYSWMMException):
+            nodes['J99']
+        # Cached IDs are range checked like the engine lookups
+        count = len(nodes)
+        assert model.getObjectId(tka.ObjectType.NODE.value, count - 1) == \
+            model.getObjectIDList(tka.ObjectType.NODE.value)[-1]
+        for index in (-1, count):
+            with pytest.raises(PYSWMMException):
+                model.getObjectId(tka.ObjectType.NODE.value, index)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+from datetime import datetime
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from pyswmm import Simulation
+from pyswmm.output import OutputMap
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.tests.data import (MODEL_POLLUTANTS_PATH,
+                               MODEL_WEIR_SETTING_PATH)
+from pyswmm.toolkitapi import (SMO_elementType, SMO_linkAttribute,
+                               SMO_nodeAttribute, SMO_systemAttribute)
+
+
+def _run(tmpdir_factory, inpfile):
+    tmpdir = tmpdir_factory.mktemp('output')
+    binfile = str(tmpdir.join('model.out'))
+    with Simulation(inpfile, str(tmpdir.join('model.rpt')), binfile) as sim:
+        for step in sim:
+            pass
+    return binfile
+
+
+@pytest.fixture(scope='module')
+def outfile(tmpdir_factory):
+    return _run(tmpdir_factory, MODEL_WEIR_SETTING_PATH)
+
+
+@pytest.fixture(scope='module')
+def pollutant_outfile(tmpdir_factory):
+    return _run(tmpdir_factory, MODEL_POLLUTANTS_PATH)
+
+
+def test_output_map_header(outfile):
+    with OutputMap(outfile) as out:
+        assert out.nodes == ['J1', 'J2', 'J3', 'J5', 'J4']
+        assert out.links == ['C1', 'C1:C2', 'C2', 'C3']
+        assert out.flow_units == 'CFS'
+        assert out.start_time == datetime(2015, 11, 1, 14, 0)
+        assert out.report_step == 60
+        assert out.results.shape == (out.num_periods, )
+        assert out.times[0] == np.datetime64('2015-11-01T14:01:00')
+        assert out.element_results(SMO_elementType.SM_node).shape == (
+            out.num_periods, 5, out.node_vars)
+
+
+def test_output_map_views(outfile):
+    with OutputMap(outfile) as out:
+        depth = out.series(SMO_elementType.SM_node, 'J1',
+                           SMO_nodeAttribute.invert_depth)
+        assert depth.shape == (out.num_periods, )
+        assert np.shares_memory(depth, out.results)
+
+        window = out.series(SMO_elementType.SM_node, 'J1',
+                            SMO_nodeAttribute.invert_depth, 10, 20)
+        np.testing.assert_array_equal(window, depth[10:20])
+
+        flow = SMO_linkAttribute.flow_rate_link.value
+        flows = out.attribute(SMO_elementType.SM_link, flow, 50)
+        assert flows.shape == (4, )
+        assert out.result(SMO_elementType.SM_link, 50, 'C1:C2')[flow] == \
+            flows[1]
+
+        rainfall = out.series(SMO_elementType.SM_sys, None,
+                              SMO_systemAttribute.rainfall_system)
+        np.testing.assert_allclose(rainfall[:10], 0.0175)
+
+        with pytest.raises(PYSWMMException):
+            out.series(SMO_elementType.SM_node, 'NOT_A_NODE', 0)
+
+
+def test_output_map_matrix(outfile):
+    with OutputMap(outfile) as out:
+        depth = SMO_nodeAttribute.invert_depth
+        matrix = out.matrix(SMO_elementType.SM_node, depth)
+        assert matrix.shape == (out.num_periods, len(out.nodes))
+        assert not np.shares_memory(matrix, out.results)
+        for ind, ID in enumerate(out.nodes):
+            np.testing.assert_array_equal(
+                matrix[:, ind], out.series(SMO_elementType.SM_node, ID,
+                                           depth))
+
+        window = out.matrix(SMO_elementType.SM_node, depth,
+                            time_slice=slice(10, 20), IDs=['J4', 'J1'])
+        np.testing.assert_array_equal(window, matrix[10:20, [4, 0]])
+
+        rainfall = out.matrix(SMO_elementType.SM_sys,
+                              SMO_systemAttribute.rainfall_system)
+        assert rainfall.shape == (out.num_periods, 1)
+
+        with pytest.raises(PYSWMMException):
+            out.matrix(SMO_elementType.SM_node, out.node_vars)
+
+
+def test_output_map_pollutant_matrix(pollutant_outfile):
+    with OutputMap(pollutant_outfile) as out:
+        assert out.pollutants == ['test-pollutant']
+        conc = out.matrix(SMO_elementType.SM_node, None,
+                          pollutant='test-pollutant')
+        offset = SMO_nodeAttribute.pollutant_conc_node.value
+        np.testing.assert_array_equal(
+            conc, out.element_results(SMO_elementType.SM_node)[:, :, offset])
+        np.testing.assert_array_equal(
+            conc, out.matrix(SMO_elementType.SM_node, None, pollutant=0))
+
+        with pytest.raises(PYSWMMException):
+            out.matrix(SMO_elementType.SM_node, None, pollutant='TSS')
+        with pytest.raises(PYSWMMException):
+            out.matrix(SMO_elementType.SM_sys, None, pollutant=0)
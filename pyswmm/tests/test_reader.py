@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+from datetime import datetime
+import os
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from pyswmm import Simulation
+from pyswmm.lib import LIB_OUTPUT
+from pyswmm.reader import SWMMBinReader
+from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
+import pyswmm.toolkitapi as tka
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isfile(LIB_OUTPUT),
+    reason="output API library not built (run make in src/)")
+
+SM_NODE = tka.SMO_elementType.SM_node.value
+SM_LINK = tka.SMO_elementType.SM_link.value
+SM_SYS = tka.SMO_elementType.SM_sys.value
+
+
+@pytest.fixture(scope='module')
+def outfile(tmpdir_factory):
+    tmpdir = tmpdir_factory.mktemp('reader')
+    binfile = str(tmpdir.join('model.out'))
+    with Simulation(MODEL_WEIR_SETTING_PATH, str(tmpdir.join('model.rpt')),
+                    binfile) as sim:
+        for step in sim:
+            pass
+    return binfile
+
+
+def test_reader_arrays(outfile):
+    reader = SWMMBinReader()
+    reader.OpenBinFile(outfile)
+
+    assert list(reader.get_IDs(SM_LINK)) == ['C1', 'C1:C2', 'C2', 'C3']
+    assert reader.get_StartTime() == datetime(2015, 11, 1, 14, 0)
+    num_periods = reader.get_Times(tka.SMO_time.numPeriods.value)
+
+    depth = tka.SMO_nodeAttribute.invert_depth.value
+    series = reader.get_Series(SM_NODE, depth, 'J1')
+    assert isinstance(series, np.ndarray)
+    assert series.dtype == np.float32
+    assert series.shape == (num_periods, )
+
+    window = reader.get_Series(SM_NODE, depth, 'J1', 10, 20)
+    np.testing.assert_array_equal(window, series[10:20])
+
+    flow = tka.SMO_linkAttribute.flow_rate_link.value
+    flows = reader.get_Attribute(SM_LINK, flow, 50)
+    assert flows.shape == (4, )
+    link_result = reader.get_Result(SM_LINK, 50, 'C1:C2')
+    assert link_result[flow] == flows[1]
+    assert reader.get_Result(SM_SYS, 50).shape == (15, )
+
+    reader.CloseBinFile()
+
+
+def test_reader_as_list(outfile):
+    arrays = SWMMBinReader()
+    arrays.OpenBinFile(outfile)
+    lists = SWMMBinReader(as_list=True)
+    lists.OpenBinFile(outfile)
+
+    depth = tka.SMO_nodeAttribute.invert_depth.value
+    series = lists.get_Series(SM_NODE, depth, 'J1')
+    assert isinstance(series, list)
+    assert series == arrays.get_Series(SM_NODE, depth, 'J1').tolist()
+
+    arrays.CloseBinFile()
+    lists.CloseBinFile()
+
+
+def test_reader_matrix(outfile):
+    reader = SWMMBinReader()
+    reader.OpenBinFile(outfile)
+
+    depth = tka.SMO_nodeAttribute.invert_depth.value
+    matrix = reader.get_matrix(SM_NODE, depth)
+    assert matrix.shape == (reader.get_Times(
+        tka.SMO_time.numPeriods.value), 5)
+    for ind, ID in enumerate(reader.get_IDs(SM_NODE)):
+        np.testing.assert_array_equal(matrix[:, ind],
+                                      reader.get_Series(SM_NODE, depth, ID))
+    ids = list(reader.get_IDs(SM_NODE))
+    np.testing.assert_array_equal(
+        reader.get_matrix(SM_NODE, depth, IDs=[ids[2], ids[0]]),
+        matrix[:, [2, 0]])
+
+    reader.CloseBinFile()
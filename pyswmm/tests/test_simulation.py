@@ -7,11 +7,19 @@
 # -----------------------------------------------------------------------------
 
 # Standard library imports
+from datetime import timedelta
 from random import randint
+import json
+import os
 import sys
 
+# Third party imports
+import numpy as np
+import pytest
+
 # Local imports
 from pyswmm import Links, Nodes, Simulation
+from pyswmm.swmm5 import PYSWMMException
 from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
 
 
@@ -125,3 +133,236 @@ def test_simulation_callback_1():
         "before_end1", "after_end1", "after_close1"
     ]
     print(LIST)
+
+
+def test_simulation_isolated(tmpdir):
+    def run(sim):
+        c1c2 = Links(sim)["C1:C2"]
+        return [c1c2.flow for step in sim]
+
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        expected = run(sim)
+
+    sim_a = Simulation(MODEL_WEIR_SETTING_PATH,
+                       str(tmpdir.join('a.rpt')),
+                       str(tmpdir.join('a.out')),
+                       isolated=True)
+    sim_b = Simulation(MODEL_WEIR_SETTING_PATH,
+                       str(tmpdir.join('b.rpt')),
+                       str(tmpdir.join('b.out')),
+                       isolated=True)
+    link_a = Links(sim_a)["C1:C2"]
+    link_b = Links(sim_b)["C1:C2"]
+    flows_a = []
+    flows_b = []
+    for step_a, step_b in zip(sim_a, sim_b):
+        flows_a.append(link_a.flow)
+        flows_b.append(link_b.flow)
+    sim_a.close()
+    sim_b.close()
+
+    assert flows_a == expected
+    assert flows_b == expected
+    assert sim_a._model.SWMMlibobj is None
+    with pytest.raises(PYSWMMException):
+        sim_a._model.swmm_step()
+    with pytest.raises(PYSWMMException):
+        sim_a._model.getNodeResultByIndex(0, 5)
+    with pytest.raises(PYSWMMException):
+        sim_a._model.setLinkSettingByIndex(0, 1.0)
+
+
+def test_simulation_callback_subscribers():
+    calls = {'every': 0, 'tenth': 0, 'times': [], 'ends': []}
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        start = sim.start_time
+
+        def every_step():
+            calls['every'] += 1
+
+        def every_tenth_step():
+            calls['tenth'] += 1
+
+        def every_five_minutes():
+            calls['times'].append(sim.current_time)
+
+        sim.add_after_step(every_step)
+        sim.add_after_step(every_tenth_step, every_steps=10)
+        sim.add_callback("after_step", every_five_minutes, every_seconds=300)
+        sim.add_before_end(lambda: calls['ends'].append(1))
+        sim.add_before_end(lambda: calls['ends'].append(2))
+        assert sim.after_step() == [every_step, every_tenth_step,
+                                    every_five_minutes]
+        # A single callback is returned as such, none as None
+        assert sim.before_start() is None
+        sim.add_before_start(every_five_minutes)
+        assert sim.before_start() is every_five_minutes
+        sim.remove_callback("before_start", every_five_minutes)
+
+        with pytest.raises(PYSWMMException):
+            sim.add_callback("before_end", every_step, every_steps=2)
+        with pytest.raises(PYSWMMException):
+            sim.add_callback("not_an_event", every_step)
+
+        steps = 0
+        for step in sim:
+            steps += 1
+            if steps == 100:
+                sim.remove_callback("after_step", every_step)
+
+    assert calls['every'] == 100
+    assert calls['tenth'] == (steps + 9) // 10
+    assert calls['ends'] == [1, 2]
+    # One call in each 300 s period from the start, in order
+    periods = [int((time - start).total_seconds() // 300)
+               for time in calls['times']]
+    assert periods == sorted(set(periods))
+
+
+def test_simulation_record():
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        sim.end_time = sim.start_time + timedelta(hours=6)
+        every = sim.record(nodes=['J1', 'J2'], links=['C1:C2'],
+                           subcatchments=True)
+        sampled = sim.record(links=['C1:C2'],
+                             variables=['newFlow', 'newDepth'], every=300)
+        with pytest.raises(PYSWMMException):
+            sim.record()
+        with pytest.raises(PYSWMMException):
+            sim.record(nodes=['J1'], variables=['newFlow'])
+        flows = []
+        depths = []
+        for step_num, step in enumerate(sim):
+            flows.append(Links(sim)['C1:C2'].flow)
+            depths.append(Nodes(sim)['J2'].depth)
+            if step_num == 6:
+                again = sim.record(links=['C1:C2'], every=300)
+        end = sim.current_time
+
+    assert every.rows == len(flows)
+    assert every.ids['subcatchments'] == ['S1', 'S2', 'S3']
+    assert every.get('nodes', 'newDepth').shape == (every.rows, 2)
+    assert list(every.series('links', 'C1:C2', 'newFlow')) == flows
+    assert list(every.series('nodes', 'J2', 'newDepth')) == depths
+    assert every.times[-1] == end.replace(microsecond=0)
+
+    assert 0 < sampled.rows < every.rows
+    assert sorted(sampled.data['links']) == ['newDepth', 'newFlow']
+    # Samples on the 300 s grid from the start. A recorder added later
+    # records its first step, then the same steps as the first one
+    periods = (sampled.elapsed // 300).astype(int)
+    assert list(periods) == sorted(set(periods))
+    np.testing.assert_array_equal(again.times[1:],
+                                  sampled.times[-(again.rows - 1):])
+    with pytest.raises(PYSWMMException):
+        sampled.get('nodes', 'newDepth')
+
+
+def test_simulation_output_mode(tmpdir):
+    inputfile = str(tmpdir.join('model.inp'))
+    with open(MODEL_WEIR_SETTING_PATH) as src, open(inputfile, 'w') as dst:
+        dst.write(src.read())
+
+    for output_mode in ("none", "tmpfs"):
+        with Simulation(inputfile, output_mode=output_mode) as sim:
+            scratch = os.path.dirname(sim._model.binfile)
+            assert os.path.isdir(scratch)
+            for step in sim:
+                pass
+            sim.report()
+            flow_error = sim.flow_routing_error
+        assert not os.path.exists(scratch)
+        assert abs(flow_error) < 1
+    assert os.listdir(str(tmpdir)) == ['model.inp']
+
+    with pytest.raises(PYSWMMException):
+        Simulation(inputfile, output_mode="nfs")
+    with pytest.raises(PYSWMMException):
+        Simulation(inputfile, 'model.rpt', output_mode="none")
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'),
+                    reason="branching requires os.fork and /proc")
+def test_simulation_branch(tmpdir):
+    inputfile = str(tmpdir.join('model.inp'))
+    with open(MODEL_WEIR_SETTING_PATH) as src, open(inputfile, 'w') as dst:
+        dst.write(src.read())
+
+    def final_state(sim):
+        return (sim.current_time, Nodes(sim)['J3'].depth,
+                Links(sim)['C3'].flow)
+
+    def run(branch_at=None):
+        with Simulation(inputfile) as sim:
+            sim.step_advance(900)
+            branches = None
+            for ind, step in enumerate(sim):
+                if ind == branch_at:
+                    start = sim.current_time
+                    branches = sim.branch(
+                        [{'C3': 0.0}, {'C3': 1.0}, {'C3': 1.0}],
+                        horizon=3600,
+                        summary=final_state)
+            sim.report()
+            errors = (sim.runoff_error, sim.flow_routing_error)
+        with open(inputfile.replace('.inp', '.out'), 'rb') as f:
+            out = f.read()
+        return branches, start if branches else None, errors, out
+
+    _, _, errors, out = run()
+    branches, start, branch_errors, branch_out = run(branch_at=8)
+    # The parent is unaffected by its branches
+    assert branch_errors == errors
+    assert branch_out == out
+
+    assert [time - start for time, _, _ in branches] == \
+        [timedelta(hours=1)] * 3
+    assert branches[1] == branches[2]
+    assert branches[0][2] == 0.0
+    assert branches[1][2] > 0.0
+
+    with Simulation(inputfile) as sim:
+        with pytest.raises(PYSWMMException):
+            sim.branch([lambda sim: 1 / 0])
+
+
+def test_simulation_metrics(tmpdir, monkeypatch):
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        assert sim.metrics is None
+
+    progress = []
+    with Simulation(MODEL_WEIR_SETTING_PATH, metrics=True) as sim:
+        sim.step_advance(3600)
+        sim.add_after_step(lambda: progress.append(
+            (sim.metrics.progress, sim.metrics.eta)))
+        for step in sim:
+            pass
+        sim.report()
+        metrics = sim.metrics
+    phases = metrics.phases
+    for phase in ("open", "start", "step", "callbacks", "end", "report",
+                  "close"):
+        assert phases[phase] > 0, phase
+    assert metrics.steps == len(progress)
+    assert metrics.callback_calls == len(progress)
+    assert metrics.progress == 1.0
+    assert metrics.simulated_seconds == 58 * 3600
+    assert metrics.speedup > 1
+    fractions = [fraction for fraction, _ in progress]
+    assert fractions == sorted(fractions)
+    assert progress[0][1] > 0
+
+    data = json.loads(metrics.to_json(str(tmpdir.join('metrics.json'))))
+    assert data['steps'] == metrics.steps
+    assert os.listdir(str(tmpdir)) == ['metrics.json']
+    # Without os.replace (Python 2) the snapshot still overwrites the file
+    monkeypatch.delattr(os, 'replace', raising=False)
+    metrics.to_prometheus(str(tmpdir.join('metrics.json')))
+    with open(str(tmpdir.join('metrics.json'))) as f:
+        assert f.read().startswith('# ')
+    assert os.listdir(str(tmpdir)) == ['metrics.json']
+    text = metrics.to_prometheus(labels={'job': 'nightly'})
+    sample = ('pyswmm_steps_total{job="nightly",'
+              'model="model_weir_setting.inp"} ' + repr(float(metrics.steps)))
+    assert sample in text.splitlines()
+    assert '# TYPE pyswmm_phase_seconds gauge' in text
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+import asyncio
+import threading
+
+# Third party imports
+import pytest
+
+# Local imports
+from pyswmm import AsyncSimulation, Links, Nodes, Simulation
+from pyswmm.swmm5 import PYSWMMException
+from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
+
+
+def test_async_simulation():
+    with Simulation(MODEL_WEIR_SETTING_PATH, output_mode="none") as sim:
+        sim.step_advance(3600)
+        expected = [Nodes(sim)['J1'].depth for step in sim]
+
+    async def ticker(ticks, done):
+        while not done.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def run():
+        ticks = []
+        done = asyncio.Event()
+        ticking = asyncio.ensure_future(ticker(ticks, done))
+        threads = set()
+        depths = []
+        async with AsyncSimulation(MODEL_WEIR_SETTING_PATH,
+                                   output_mode="none") as sim:
+            j1 = await sim.call(lambda: Nodes(sim.simulation)['J1'])
+            sim.simulation.add_after_step(
+                lambda: threads.add(threading.current_thread()))
+            sim.simulation.step_advance(3600)
+            async for step in sim:
+                assert step is sim
+                depths.append(await sim.call(lambda: j1.depth))
+            flow = await sim.call(lambda: Links(sim.simulation)['C3'].flow)
+        done.set()
+        await ticking
+        return ticks, threads, depths, flow
+
+    loop = asyncio.new_event_loop()
+    try:
+        ticks, threads, depths, flow = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert depths == expected
+    # Every step ran on one engine thread while the loop kept running
+    assert len(threads) == 1
+    assert threading.current_thread() not in threads
+    assert len(ticks) > len(depths)
+    assert flow is not None
+
+
+def test_async_simulation_reopen():
+    async def run(sim):
+        depths = []
+        async with sim:
+            j1 = await sim.call(lambda: Nodes(sim.simulation)['J1'])
+            sim.simulation.step_advance(3600)
+            async for step in sim:
+                depths.append(await sim.call(lambda: j1.depth))
+        return depths
+
+    sim = AsyncSimulation(MODEL_WEIR_SETTING_PATH, output_mode="none")
+    with pytest.raises(PYSWMMException):
+        sim.call(len, [])
+    loop = asyncio.new_event_loop()
+    try:
+        first = loop.run_until_complete(run(sim))
+        # A closed AsyncSimulation opens on a fresh engine thread
+        second = loop.run_until_complete(run(sim))
+    finally:
+        loop.close()
+    assert first and first == second
+    with pytest.raises(PYSWMMException):
+        sim.call(len, [])
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+
+# Standard library imports
+from datetime import timedelta
+import json
+
+# Local imports
+from pyswmm import Links, Nodes, Simulation
+from pyswmm.tests.data import MODEL_WEIR_SETTING_PATH
+
+
+def test_trace(tmpdir):
+    with Simulation(MODEL_WEIR_SETTING_PATH) as sim:
+        sim.end_time = sim.start_time + timedelta(hours=1)
+        model = sim._model
+        library = model.SWMMlibobj
+        step = model.swmm_step
+        tracer = sim.trace(events=True)
+
+        def controller():
+            Links(sim)['C3'].target_setting = 0.5
+
+        sim.add_after_step(controller, every_steps=10)
+        j1 = Nodes(sim)['J1']
+        depths = [j1.depth for _ in sim]
+        tracer.detach()
+        # Detaching restores the untraced objects
+        assert not tracer.attached
+        assert model.SWMMlibobj is library
+        assert 'swmm_step' not in vars(model)
+        assert model.swmm_step == step
+        j1.depth
+
+    stats = tracer.stats()
+    steps = len(depths) + 1
+    assert stats['PySWMM.swmm_step']['calls'] == steps
+    assert stats['engine.swmm_step']['calls'] == steps
+    assert stats['PySWMM.getNodeResult']['calls'] == len(depths)
+    assert stats['engine.swmm_getNodeResult']['calls'] == len(depths)
+    assert stats['callback.controller']['calls'] == (steps + 9) // 10
+    assert stats['PySWMM.setLinkSetting']['calls'] == (steps + 9) // 10
+    wrapper = stats['PySWMM.getNodeResult']
+    assert 0 < wrapper['self'] < wrapper['total']
+    assert 'name' in tracer.report(limit=2)
+
+    path = str(tmpdir.join('trace.json'))
+    tracer.write_chrome_trace(path)
+    with open(path) as f:
+        events = json.load(f)['traceEvents']
+    assert len(events) == sum(stat['calls'] for stat in stats.values())
+    assert set(event['cat'] for event in events) == set(
+        ['pyswmm', 'engine', 'callback'])
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
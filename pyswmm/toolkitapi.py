@@ -358,6 +358,89 @@ class RunoffTotals(ctypes.Structure):
     }
 
 
+# --- SWMM Toolkit Prototypes
+# -----------------------------------------------------------------------------
+_c_char_p = ctypes.c_char_p
+_c_double = ctypes.c_double
+_c_int = ctypes.c_int
+_c_double_p = ctypes.POINTER(ctypes.c_double)
+_c_float_p = ctypes.POINTER(ctypes.c_float)
+_c_int_p = ctypes.POINTER(ctypes.c_int)
+
+# Function name: (restype, argtypes). Applied once per loaded library.
+SWMM_PROTOTYPES = {
+    # Engine
+    "swmm_run": (_c_int, (_c_char_p, _c_char_p, _c_char_p)),
+    "swmm_open": (_c_int, (_c_char_p, _c_char_p, _c_char_p)),
+    "swmm_start": (_c_int, (_c_int, )),
+    "swmm_step": (_c_int, (_c_double_p, )),
+    "swmm_end": (_c_int, ()),
+    "swmm_report": (_c_int, ()),
+    "swmm_close": (_c_int, ()),
+    "swmm_getMassBalErr": (_c_int, (_c_float_p, _c_float_p, _c_float_p)),
+    "swmm_getVersionInfo": (None, (_c_char_p, _c_char_p, _c_char_p)),
+    "swmm_getAPIError": (None, (_c_int, _c_char_p)),
+    # Project
+    "swmm_getSimulationDateTime": (_c_int, (_c_int, _c_int_p, _c_int_p,
+                                            _c_int_p, _c_int_p, _c_int_p,
+                                            _c_int_p)),
+    "swmm_setSimulationDateTime": (_c_int, (_c_int, _c_char_p)),
+    "swmm_getSimulationUnit": (_c_int, (_c_int, _c_int_p)),
+    "swmm_getSimulationAnalysisSetting": (_c_int, (_c_int, _c_int_p)),
+    "swmm_getSimulationParam": (_c_int, (_c_int, _c_double_p)),
+    "swmm_countObjects": (_c_int, (_c_int, _c_int_p)),
+    "swmm_getObjectId": (_c_int, (_c_int, _c_int, _c_char_p)),
+    # Network
+    "swmm_getNodeType": (_c_int, (_c_int, _c_int_p)),
+    "swmm_getLinkType": (_c_int, (_c_int, _c_int_p)),
+    "swmm_getLinkConnections": (_c_int, (_c_int, _c_int_p, _c_int_p)),
+    "swmm_getLinkDirection": (_c_int, (_c_int,
+                                       ctypes.POINTER(ctypes.c_byte))),
+    "swmm_getNodeParam": (_c_int, (_c_int, _c_int, _c_double_p)),
+    "swmm_setNodeParam": (_c_int, (_c_int, _c_int, _c_double)),
+    "swmm_getLinkParam": (_c_int, (_c_int, _c_int, _c_double_p)),
+    "swmm_setLinkParam": (_c_int, (_c_int, _c_int, _c_double)),
+    "swmm_getSubcatchParam": (_c_int, (_c_int, _c_int, _c_double_p)),
+    "swmm_setSubcatchParam": (_c_int, (_c_int, _c_int, _c_double)),
+    "swmm_getSubcatchOutConnection": (_c_int, (_c_int, _c_int_p, _c_int_p)),
+    # Results
+    "swmm_getCurrentDateTimeStr": (_c_int, (_c_char_p, )),
+    "swmm_getNodeResult": (_c_int, (_c_int, _c_int, _c_double_p)),
+    "swmm_getLinkResult": (_c_int, (_c_int, _c_int, _c_double_p)),
+    "swmm_getSubcatchResult": (_c_int, (_c_int, _c_int, _c_double_p)),
+    "swmm_getNodeTotalInflow": (_c_int, (_c_int, _c_double_p)),
+    # Statistics
+    "swmm_getNodeStats": (_c_int, (_c_int, ctypes.POINTER(NodeStats))),
+    "swmm_getStorageStats": (_c_int, (_c_int, ctypes.POINTER(StorageStats))),
+    "swmm_getOutfallStats": (_c_int, (_c_int, ctypes.POINTER(OutfallStats))),
+    "swmm_freeOutfallStats": (None, (ctypes.POINTER(OutfallStats), )),
+    "swmm_getLinkStats": (_c_int, (_c_int, ctypes.POINTER(LinkStats))),
+    "swmm_getPumpStats": (_c_int, (_c_int, ctypes.POINTER(PumpStats))),
+    "swmm_getSubcatchStats": (_c_int, (_c_int, ctypes.POINTER(SubcStats))),
+    "swmm_freeSubcatchStats": (None, (ctypes.POINTER(SubcStats), )),
+    "swmm_getSystemRoutingStats": (_c_int, (ctypes.POINTER(RoutingTotals),
+                                            )),
+    "swmm_getSystemRunoffStats": (_c_int, (ctypes.POINTER(RunoffTotals), )),
+    # Setters
+    "swmm_setLinkSetting": (_c_int, (_c_int, _c_double)),
+    "swmm_setNodeInflow": (_c_int, (_c_int, _c_double)),
+    "swmm_setOutfallStage": (_c_int, (_c_int, _c_double)),
+    # Overland coupling
+    "swmm_setNodeOpening": (_c_int, (_c_int, _c_int, _c_int, _c_double,
+                                     _c_double, _c_double, _c_double,
+                                     _c_double)),
+    "swmm_getNodeOpeningParam": (_c_int, (_c_int, _c_int, _c_int,
+                                          _c_double_p)),
+    "swmm_getNodeOpeningFlow": (_c_int, (_c_int, _c_int, _c_double_p)),
+    "swmm_getNodeOpeningType": (_c_int, (_c_int, _c_int, _c_int_p)),
+    "swmm_getOpeningCouplingType": (_c_int, (_c_int, _c_int, _c_int_p)),
+    "swmm_getNodeIsCoupled": (_c_int, (_c_int, _c_int_p)),
+    "swmm_getOpeningsNum": (_c_int, (_c_int, _c_int_p)),
+    "swmm_getOpeningsIndices": (_c_int, (_c_int, _c_int, _c_int_p)),
+    "swmm_deleteNodeOpening": (_c_int, (_c_int, _c_int)),
+}
+
+
 # --- SWMM Output API
 # -----------------------------------------------------------------------------
 DLLErrorKeys = {
@@ -369,6 +452,50 @@ DLLErrorKeys = {
     441: "Error 441: need to call SMR_open before calling this function"
 }
 
+_c_long = ctypes.c_long
+_c_long_p = ctypes.POINTER(ctypes.c_long)
+_c_void_p = ctypes.c_void_p
+
+# Function name: (restype, argtypes). SMOutputAPI handles are passed as
+# void pointers.
+SMO_PROTOTYPES = {
+    "SMO_init": (_c_void_p, ()),
+    "SMO_open": (_c_int, (_c_void_p, _c_char_p)),
+    "SMO_close": (_c_int, (_c_void_p, )),
+    "SMO_free": (None, (_c_float_p, )),
+    "SMO_getProjectSize": (_c_int, (_c_void_p, _c_int, _c_int_p)),
+    "SMO_getUnits": (_c_int, (_c_void_p, _c_int, _c_int_p)),
+    "SMO_getStartTime": (_c_int, (_c_void_p, _c_double_p)),
+    "SMO_getTimes": (_c_int, (_c_void_p, _c_int, _c_int_p)),
+    "SMO_getElementName": (_c_int, (_c_void_p, _c_int, _c_int, _c_char_p,
+                                    _c_int_p)),
+    "SMO_newOutValueArray": (_c_float_p, (_c_void_p, _c_int, _c_int,
+                                          _c_long_p, _c_int_p)),
+    "SMO_getSubcatchSeries": (_c_int, (_c_void_p, _c_int, _c_int, _c_long,
+                                       _c_long, _c_float_p)),
+    "SMO_getNodeSeries": (_c_int, (_c_void_p, _c_int, _c_int, _c_long,
+                                   _c_long, _c_float_p)),
+    "SMO_getLinkSeries": (_c_int, (_c_void_p, _c_int, _c_int, _c_long,
+                                   _c_long, _c_float_p)),
+    "SMO_getSystemSeries": (_c_int, (_c_void_p, _c_int, _c_long, _c_long,
+                                     _c_float_p)),
+    "SMO_getSubcatchAttribute": (_c_int, (_c_void_p, _c_long, _c_int,
+                                          _c_float_p)),
+    "SMO_getNodeAttribute": (_c_int, (_c_void_p, _c_long, _c_int,
+                                      _c_float_p)),
+    "SMO_getLinkAttribute": (_c_int, (_c_void_p, _c_long, _c_int,
+                                      _c_float_p)),
+    "SMO_getSystemAttribute": (_c_int, (_c_void_p, _c_long, _c_int,
+                                        _c_float_p)),
+    "SMO_getSubcatchResult": (_c_int, (_c_void_p, _c_long, _c_int,
+                                       _c_float_p)),
+    "SMO_getNodeResult": (_c_int, (_c_void_p, _c_long, _c_int, _c_float_p)),
+    "SMO_getLinkResult": (_c_int, (_c_void_p, _c_long, _c_int, _c_float_p)),
+    "SMO_getSystemResult": (_c_int, (_c_void_p, _c_long, _c_float_p)),
+    "datetime_dateToStr": (None, (_c_double, _c_char_p)),
+    "datetime_timeToStr": (None, (_c_double, _c_char_p)),
+}
+
 
 class SMO_elementCount(Enum):
     subcatchCount = 0
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Call counts, timings and Chrome traces of the toolkit wrappers."""
+
+# Standard library imports
+from timeit import default_timer as timer
+import json
+import os
+import threading
+
+# Local imports
+from pyswmm.swmm5 import PySWMM
+
+# Event categories (the "cat" field of the Chrome trace)
+WRAPPER = 'pyswmm'
+ENGINE = 'engine'
+CALLBACK = 'callback'
+
+
+class _LibraryProxy(object):
+    """Stands in for the loaded library, timing every swmm_* call."""
+
+    def __init__(self, library, tracer):
+        self._library = library
+        self._tracer = tracer
+        self._functions = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._library, name)
+        if not name.startswith('swmm_'):
+            return attr
+        if name not in self._functions:
+            self._functions[name] = self._tracer._wrap(
+                'engine.' + name, attr, ENGINE)
+        return self._functions[name]
+
+
+class Tracer(object):
+    """
+    Counts and times every toolkit call of a simulation.
+
+    Attaching wraps, on one model only, every public PySWMM method, every
+    swmm_* engine function and the simulation callbacks; detaching
+    restores them, so nothing is paid while the tracer is not attached.
+
+    Times are inclusive (total) and exclusive (self, without the traced
+    calls made inside), so the self time of a PySWMM wrapper is the
+    Python overhead around the engine calls it makes.
+
+    :param bool events: Keep a timeline for write_chrome_trace()
+                        (default False)
+    :param int max_events: Timeline events kept; later calls are only
+                           counted (default 1000000)
+
+    Examples:
+
+    >>> from pyswmm import Nodes, Simulation
+    >>>
+    >>> with Simulation('tests/data/model_weir_setting.inp') as sim:
+    ...     tracer = sim.trace(events=True)
+    ...     j1 = Nodes(sim)['J1']
+    ...     for step in sim:
+    ...         j1.depth
+    ...     tracer.detach()
+    >>> print(tracer.report(limit=3))
+    name                                    calls    total (s)     self (s)
+    PySWMM.swmm_step                       208800        1.802        0.071
+    engine.swmm_step                       208800        1.731        1.731
+    PySWMM.getNodeResult                   208799        0.501        0.321
+    >>> tracer.write_chrome_trace('trace.json')  # open in chrome://tracing
+    """
+
+    def __init__(self, events=False, max_events=1000000):
+        self.max_events = max_events
+        # name: [calls, total seconds, self seconds]
+        self._stats = {}
+        self._events = [] if events else None
+        self.dropped_events = 0
+        self._stack = []
+        self._origin = timer()
+        self._restore = []
+
+    def _wrap(self, name, func, category):
+        """Returns func timed under name."""
+        stats = self._stats.setdefault(name, [0, 0.0, 0.0])
+        stack = self._stack
+        events = self._events
+        tracer = self
+
+        def traced(*args, **kwargs):
+            stack.append(0.0)
+            start = timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = timer() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += duration
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] += duration - children
+                if events is not None:
+                    if len(events) < tracer.max_events:
+                        events.append((name, category, start, duration,
+                                       threading.current_thread().ident))
+                    else:
+                        tracer.dropped_events += 1
+
+        traced.__name__ = getattr(func, '__name__', name)
+        traced.__doc__ = getattr(func, '__doc__', None)
+        return traced
+
+    def _patch(self, obj, attr, value):
+        """Sets an instance attribute, remembering how to undo it."""
+        had = attr in obj.__dict__
+        self._restore.append((obj, attr, had, obj.__dict__.get(attr), value))
+        setattr(obj, attr, value)
+
+    def attach(self, sim):
+        """
+        Starts tracing a Simulation (or a bare PySWMM model).
+
+        :param object sim: Simulation or PySWMM instance
+        :return: self
+        """
+        if self._restore:
+            return self
+        model = getattr(sim, '_model', sim)
+        for name in dir(PySWMM):
+            if name.startswith('_'):
+                continue
+            method = getattr(model, name)
+            if callable(method):
+                self._patch(model, name,
+                            self._wrap('PySWMM.' + name, method, WRAPPER))
+        # Engine handles bound once in PySWMM.__init__ for the step path
+        for name, value in list(vars(model).items()):
+            if name.startswith('_swmm_') and callable(value):
+                self._patch(model, name,
+                            self._wrap('engine.' + name[1:], value, ENGINE))
+        self._patch(model, 'SWMMlibobj',
+                    _LibraryProxy(model.SWMMlibobj, self))
+        if model is not sim:
+            self._patch(sim, '_execute_callback', self._traced_callback(sim))
+        return self
+
+    def _traced_callback(self, sim):
+        """Times each simulation callback under its own name."""
+        run_callback = sim._execute_callback
+        wrapped = {}
+
+        def execute_callback(callback):
+            key = id(callback)
+            if key not in wrapped:
+                name = getattr(callback, '__name__',
+                               type(callback).__name__)
+                wrapped[key] = (callback, self._wrap(
+                    'callback.' + name, run_callback, CALLBACK))
+            return wrapped[key][1](callback)
+
+        return execute_callback
+
+    def detach(self):
+        """Stops tracing and restores the wrapped attributes."""
+        for obj, attr, had, old, value in reversed(self._restore):
+            if obj.__dict__.get(attr) is not value:
+                # Replaced since (e.g. a released library); leave it
+                continue
+            if had:
+                setattr(obj, attr, old)
+            else:
+                delattr(obj, attr)
+        self._restore = []
+
+    @property
+    def attached(self):
+        """True while tracing."""
+        return bool(self._restore)
+
+    def stats(self):
+        """
+        Calls and times per traced name.
+
+        :return: {name: {'calls': int, 'total': seconds, 'self': seconds}}
+        :rtype: dict
+        """
+        return dict((name, {'calls': calls, 'total': total, 'self': own})
+                    for name, (calls, total, own) in self._stats.items()
+                    if calls)
+
+    def report(self, limit=None):
+        """
+        Table of the traced names, by total time.
+
+        :param int limit: Rows shown (default None for all)
+        :rtype: str
+        """
+        rows = sorted(self.stats().items(),
+                      key=lambda item: item[1]['total'],
+                      reverse=True)[:limit]
+        lines = ['{0:<36} {1:>9} {2:>12} {3:>12}'.format(
+            'name', 'calls', 'total (s)', 'self (s)')]
+        for name, stat in rows:
+            lines.append('{0:<36} {1:>9d} {2:>12.3f} {3:>12.3f}'.format(
+                name, stat['calls'], stat['total'], stat['self']))
+        return '\n'.join(lines)
+
+    def chrome_trace(self):
+        """
+        Timeline in the Chrome trace_event format.
+
+        :rtype: dict
+        """
+        if self._events is None:
+            return {'traceEvents': []}
+        pid = os.getpid()
+        trace_events = [{
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': tid,
+        } for name, category, start, duration, tid in self._events]
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        """
+        Writes the timeline for chrome://tracing or Perfetto.
+
+        :param str path: JSON file to write
+        """
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
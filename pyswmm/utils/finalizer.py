@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014 Bryant E. McDonnell
+#
+# Licensed under the terms of the BSD2 License
+# See LICENSE.txt for details
+# -----------------------------------------------------------------------------
+"""Cleanup callbacks tied to the lifetime of an object."""
+
+# Standard library imports
+import atexit
+import weakref
+
+# Finalizers not yet run; also keeps their weak references alive
+_PENDING = set()
+
+
+class Finalizer(object):
+    """
+    Calls func(*args) once an object is garbage collected.
+
+    A Python 2.7 compatible subset of weakref.finalize. The call runs at
+    most once: when the object is collected, when the finalizer itself
+    is called, or at interpreter exit, whichever comes first. func and
+    args must not reference the object, or it is never collected.
+
+    Examples:
+
+    >>> import shutil, tempfile
+    >>> from pyswmm.utils.finalizer import Finalizer
+    >>>
+    >>> class Scratch(object):
+    ...     def __init__(self):
+    ...         self.path = tempfile.mkdtemp()
+    ...         self.cleanup = Finalizer(self, shutil.rmtree, self.path)
+    >>>
+    >>> scratch = Scratch()
+    >>> del scratch  # the directory is removed
+    """
+
+    def __init__(self, obj, func, *args):
+        self._func = func
+        self._args = args
+        self._ref = weakref.ref(obj, self._collected)
+        _PENDING.add(self)
+
+    def _collected(self, ref):
+        self()
+
+    @property
+    def alive(self):
+        """True until the cleanup has run."""
+        return self in _PENDING
+
+    def __call__(self):
+        """
+        Runs the cleanup unless it already ran.
+
+        :return: Return value of func, None if it already ran
+        """
+        if self not in _PENDING:
+            return None
+        _PENDING.discard(self)
+        return self._func(*self._args)
+
+
+@atexit.register
+def _run_pending():
+    """Runs the cleanups of objects still alive at interpreter exit."""
+    for finalizer in list(_PENDING):
+        finalizer()
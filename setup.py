@@ -39,11 +39,14 @@ def get_description():
     return data
 
 
-REQUIREMENTS = ['six']
+REQUIREMENTS = ['numpy', 'six']
 
 if sys.version_info < (3, 4):
     REQUIREMENTS.append('enum34')
 
+if PY2:
+    REQUIREMENTS.append('futures')
+
 setup(
     name='pyswmm',
     version=get_version(),
@@ -53,11 +56,12 @@ setup(
     author='Bryant E. McDonnell (EmNet LLC)',
     author_email='bemcdonnell@gmail.com',
     install_requires=REQUIREMENTS,
-    packages=find_packages(exclude=['contrib', 'docs']),
+    extras_require={'export': ['pyarrow', 'h5py']},
+    packages=find_packages(exclude=['benchmarks', 'contrib', 'docs']),
     package_data={
         '': [
-            'lib/windows/swmm5.dll', 'lib/linux/swmm5.so', 'LICENSE.txt',
-            'AUTHORS', 'tests/data/*.inp', 'tests/*.py'
+            'lib/windows/swmm5.dll', 'lib/linux/swmm5.so', 'lib/*/outputapi.*',
+            'LICENSE.txt', 'AUTHORS', 'tests/data/*.inp', 'tests/*.py'
         ]
     },
     include_package_data=True,
@@ -21,15 +21,11 @@
 #define WINDOWS
 #endif
 
-/*
 #ifdef WINDOWS
-//#define DLLEXPORT __declspec(dllexport) __cdecl
-#define DLLEXPORT __declspec(dllexport)
+#define DLLEXPORT __declspec(dllexport) __cdecl
 #else
 #define DLLEXPORT
 #endif
-*/
-#define DLLEXPORT __declspec(dllexport) __cdecl
 
 typedef double DateTime;
 
@@ -82,7 +82,9 @@ SMOutputAPI* DLLEXPORT SMO_init(void)
 //    structure.
 //
 {
-	SMOutputAPI *smoapi = malloc(sizeof(struct SMOutputAPI));
+	// calloc: 4 byte records are read into the 8 byte offsets and Nperiods,
+	// so their upper bytes must start out zeroed
+	SMOutputAPI *smoapi = calloc(1, sizeof(struct SMOutputAPI));
 	smoapi->elementNames = NULL;
 
 	return smoapi;
@@ -17,15 +17,11 @@
 #define WINDOWS
 #endif
 
-/*
-//#define DLLEXPORT __declspec(dllexport) __cdecl
 #ifdef WINDOWS
-#define DLLEXPORT __declspec(dllexport)
+#define DLLEXPORT __declspec(dllexport) __cdecl
 #else
 #define DLLEXPORT
 #endif
-*/
-#define DLLEXPORT __declspec(dllexport) __cdecl
 
 #define MAXFILENAME     259   //
 #define MAXELENAME       45   // Max characters in element name